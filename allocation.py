@@ -0,0 +1,110 @@
+import json
+import math
+import os
+import statistics
+
+from pathlib import Path
+
+import opportunity_cache
+
+from configuration import Configuration, Metrics
+
+# Adaptive allocation of benchmark executions across refactoring types and
+# workloads. Each (<type>, <bm>, <workload>) is treated as an arm of a
+# multi-armed bandit. Arms whose measured effects are extreme or uncertain
+# are measured more often, while each type keeps a minimum share of all
+# measurements so that no type is starved.
+#
+# The effect of a measurement is the log speedup relative to the baseline
+# ('baseline.txt'), or the mean paired speedup in paired mode. Measurements
+# taken on a noisy machine have no effect.
+
+DEFAULT_MIN_SHARE = 0.5     # Of the share each type would get with round-robin allocation.
+MIN_ATTEMPTS      = 2       # Attempts before an arm is scored on its effects.
+
+def get_effect(store, baseline):
+    if not (store / 'SUCCESS').exists() or (store / 'NOISY').exists():
+        return None
+    summary = store / 'summary.json'
+    if summary.exists():
+        with open(summary, 'r') as f:
+            return math.log(json.load(f)['speedup_mean'])
+    config = Configuration().load(store / 'configuration.txt')
+    key    = '-'.join([config.bm(), config.bm_workload(), config.id()]) + '-mean'
+    if not key in baseline:
+        return None
+    time   = int(Metrics().load(store / 'metrics.txt').execution_time())
+    return math.log(float(baseline[key]) / time)
+
+def _folders(location):
+    for dir, folders, files in os.walk(location):
+        return [ Path(dir) / folder for folder in folders ]
+    return []
+
+# Returns { (<type>, <bm>, <workload>) : [ <effect> ] } for all measurements in the data location.
+def load_effects(data_location, baseline):
+    effects = dict()
+    for bm in _folders(data_location):
+        for opportunity in _folders(bm):
+            for refactoring in _folders(opportunity):
+                descriptor = refactoring / 'descriptor.txt'
+                if not descriptor.exists():
+                    continue
+                type = opportunity_cache.RefactoringDescriptor.load(descriptor).refactoring_id()
+                for execution in _folders(refactoring):
+                    for folder in [ 'stats', 'paired' ]:
+                        for store in _folders(execution / folder):
+                            effect = get_effect(store, baseline)
+                            if effect is None:
+                                continue
+                            wl = Configuration().load(store / 'configuration.txt').bm_workload()
+                            effects.setdefault((type, bm.name, wl), []).append(effect)
+    return effects
+
+class Allocator:
+    def __init__(self, effects = dict(), min_share = DEFAULT_MIN_SHARE):
+        if min_share < 0 or min_share > 1:
+            raise ValueError("Minimum share must be within [0, 1]", min_share)
+        self.min_share = min_share
+        self.effects   = { arm : list(values) for arm, values in effects.items() }
+        self.attempts  = { arm : len(values) for arm, values in effects.items() }
+
+    # Record an attempt. The effect is None if the attempt did not produce a measurement.
+    def add(self, arm, effect = None):
+        self.attempts[arm] = self.attempts.get(arm, 0) + 1
+        if not effect is None:
+            self.effects.setdefault(arm, []).append(effect)
+
+    def _type_attempts(self, arms):
+        counts = dict()
+        for (type, bm, wl) in arms:
+            counts[type] = counts.get(type, 0) + self.attempts.get((type, bm, wl), 0)
+        return counts
+
+    # Upper confidence bound on the magnitude of the effect. Arms with too
+    # few attempts are explored first, and arms that keep failing to produce
+    # measurements are only selected to satisfy their type's minimum share.
+    def score(self, arm, total):
+        effects  = self.effects.get(arm, [])
+        attempts = self.attempts.get(arm, 0)
+        if attempts < MIN_ATTEMPTS:
+            return float('inf')
+        if len(effects) < 2:
+            return 0.0
+        se = statistics.stdev(effects) / math.sqrt(len(effects))
+        return abs(statistics.mean(effects)) + se * math.sqrt(2 * math.log(max(2, total)))
+
+    # Select one of the available arms.
+    def select(self, arms):
+        arms = sorted(set(arms))
+        if len(arms) == 0:
+            return None
+        counts     = self._type_attempts(arms)
+        total      = sum(counts.values())
+        floor      = self.min_share * total / len(counts)
+        candidates = arms
+        starved    = [ t for t, n in counts.items() if n < floor ]
+        if len(starved) > 0:
+            least      = min(starved, key = lambda t: (counts[t], t))
+            candidates = [ arm for arm in arms if arm[0] == least ]
+        return max(candidates, key = lambda arm: (self.score(arm, total), -self.attempts.get(arm, 0)))
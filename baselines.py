@@ -0,0 +1,68 @@
+import json
+import os
+
+from pathlib import Path
+
+import environment
+
+# Baselines of several machines. Each baseline file ('compute_baseline.py')
+# records the hardware fingerprint of the machine it was computed on in its
+# '_meta_' object (next to 'hardware', which is printed by 'plots.py'), and
+# each measurement records the fingerprint of the machine it was taken on
+# in 'hardware.json' (see 'evaluation.py'). Speedups are computed against
+# the baseline of the same machine, or of a machine with the same hardware,
+# so that measurements from different machines can be pooled.
+#
+# Measurements without fingerprint, or from machines without baseline, use
+# the default (first) baseline.
+
+HARDWARE_FILE = 'hardware.json'
+
+def store_fingerprint(store, fingerprint):
+    with open(Path(store) / HARDWARE_FILE, 'w') as f:
+        f.write(json.dumps(fingerprint, sort_keys = True) + os.linesep)
+
+def load_fingerprint(store):
+    file = Path(store) / HARDWARE_FILE
+    if not file.exists():
+        return None
+    with open(file, 'r') as f:
+        return json.load(f)
+
+class Baselines:
+    def __init__(self, files):
+        self.default  = None
+        self.machines = dict() # { <machine id> : <baseline> }
+        self.hardware = dict() # { <hardware id> : <baseline> }
+        for file in files:
+            with open(file, 'r') as f:
+                baseline = json.load(f)
+            if self.default is None:
+                self.default = baseline
+            fingerprint = baseline.get('_meta_', dict()).get('fingerprint')
+            if fingerprint is None:
+                continue
+            machine = environment.get_fingerprint_id(fingerprint)
+            if machine in self.machines:
+                raise ValueError("Several baseline files of the same machine", fingerprint['machine'], file)
+            self.machines[machine] = baseline
+            self.hardware.setdefault(environment.get_fingerprint_id(fingerprint, environment.HARDWARE_KEYS), baseline)
+        if self.default is None:
+            raise ValueError("Please specify one or more baseline files")
+
+    def get(self, fingerprint = None):
+        if fingerprint is None:
+            return self.default
+        machine = self.machines.get(environment.get_fingerprint_id(fingerprint))
+        if not machine is None:
+            return machine
+        return self.hardware.get(environment.get_fingerprint_id(fingerprint, environment.HARDWARE_KEYS), self.default)
+
+    # Baseline execution time of the configuration on the machine with the specified fingerprint.
+    def execution_time(self, configuration, fingerprint = None):
+        key = '-'.join([configuration.bm(), configuration.bm_workload(), configuration.id()])
+        return self.get(fingerprint)[key]
+
+    # Speedup is defined as > 1 if speedup and < 1 if slowdown.
+    def speedup(self, configuration, time, fingerprint = None):
+        return int(self.execution_time(configuration, fingerprint)) / int(time)
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import re
+
+from pathlib import Path
+
+# Compile failures are recorded per build key so that configurations
+# sharing the same build are marked as failures without spending a
+# build. A build is determined by the benchmark, the applied patches,
+# the JDK, and the target version. (The benchmark is part of the key
+# because empty patches are identical across benchmarks.)
+#
+# Layout:
+#   <execution>/builds/<build id>/build.txt        Build key.
+#   <execution>/builds/<build id>/COMPILE_FAILURE  Compiler diagnostic.
+#
+# Note: We deliberately avoid the name 'FAILURE' here since scripts
+#       count 'FAILURE' files to find refactoring failures.
+
+# Matches javac diagnostics, e.g., 'Foo.java:12: error: cannot find symbol'.
+_compiler_error_pattern = re.compile('\\.java:\\d+: error: ')
+
+def get_patch_hash(data_location):
+    md5 = hashlib.md5()
+    for patch in sorted(Path(data_location).glob('*.patch')):
+        md5.update(bytes(patch.name, encoding = 'utf-8'))
+        with open(patch, 'rb') as f:
+            md5.update(f.read())
+    return md5.hexdigest()
+
+def get_build_key(configuration, patch_hash):
+    return {
+        'bm'             : configuration.bm(),
+        'patch_hash'     : patch_hash,
+        'jdk'            : configuration.jdk(),
+        'target_version' : str(configuration.target_version())
+    }
+
+def get_build_id(configuration, patch_hash):
+    key  = get_build_key(configuration, patch_hash)
+    text = ';'.join([ f"{k}={v}" for k, v in sorted(key.items()) ])
+    return hashlib.md5(bytes(text, encoding = 'utf-8')).hexdigest()
+
+# Return the compiler error lines (with the following context lines
+# that javac prints for each error) or None if the build output does
+# not contain any compiler errors.
+def get_compiler_diagnostic(text, context = 2):
+    lines  = text.split(os.linesep)
+    errors = []
+    for i, line in enumerate(lines):
+        if _compiler_error_pattern.search(line):
+            errors.extend(lines[i:i + 1 + context])
+    if len(errors) == 0:
+        return None
+    return os.linesep.join(errors)
+
+class BuildFailureCache:
+    def __init__(self, data_location):
+        self._data_location = Path(data_location)
+        self._location      = self._data_location / 'builds'
+        self._patch_hash    = None
+
+    def _get_patch_hash(self):
+        if self._patch_hash is None:
+            self._patch_hash = get_patch_hash(self._data_location)
+        return self._patch_hash
+
+    def _build_location(self, configuration):
+        return self._location / get_build_id(configuration, self._get_patch_hash())
+
+    # Return the recorded compiler diagnostic or None if the build
+    # is not known to fail.
+    def get(self, configuration):
+        failure = self._build_location(configuration) / 'COMPILE_FAILURE'
+        if not failure.exists():
+            return None
+        with open(failure, 'r') as f:
+            return f.read()
+
+    def put(self, configuration, diagnostic):
+        location = self._build_location(configuration)
+        location.mkdir(parents = True, exist_ok = True)
+        with open(location / 'build.txt', 'w') as f:
+            for k, v in sorted(get_build_key(configuration, self._get_patch_hash()).items()):
+                f.write(f"{k}={v}" + os.linesep)
+        with open(location / 'COMPILE_FAILURE', 'w') as f:
+            f.write(diagnostic)
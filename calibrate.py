@@ -0,0 +1,144 @@
+#!/bin/env python3
+
+import argparse
+import json
+import os
+import statistics
+
+from pathlib import Path
+
+import evaluation
+
+from configuration import Metrics
+
+# A/A calibration of the measurement pipeline.
+#
+# Identity "refactorings" (without patches) are pushed through the full
+# prime, deploy, and benchmark pipeline used for real refactorings. Since
+# nothing changed, every deviation from the baseline is noise, so the
+# resulting distribution gives the false-positive rate of any detection
+# threshold, per workload and configuration.
+#
+# Usage:
+#   ./calibrate.py [--data <data=experiments>] [--bs <bs>] [--ws <ws>] --n <runs per configuration>
+#   ./calibrate.py --report
+#
+# Results are stored in '<out>/<bm>/<workload>/<params_id>/run-<i>/stats/<params_id>'
+# so that the layout of each run matches an ordinary refactoring execution.
+
+DEFAULT_THRESHOLDS = [0.01, 0.02, 0.05, 0.10]
+
+def get_run_location(args, configuration, i):
+    return Path(os.getcwd()) / args.out / configuration.bm() / configuration.bm_workload() / configuration.params_id() / f"run-{i}"
+
+def run(args):
+    for x, b, w in evaluation.get_arg_xbw_items(args):
+        for configuration in evaluation.get_valid_configurations_of(args, x, b, w):
+            for i in range(args.n):
+                location = get_run_location(args, configuration, i)
+                if (location / 'stats' / configuration.params_id()).exists():
+                    continue
+                location.mkdir(parents = True, exist_ok = True)
+                print()
+                print(f"Calibrate ({i+1}/{args.n}) {b} {w} {configuration.params_id()}")
+                print()
+                evaluation.build_and_benchmark(args, x, configuration, location, False)
+
+def load_execution_times(location):
+    times = dict() # { (bm, workload, params_id) : [ <execution time> ] }
+    for bm in _folders(location):
+        for workload in _folders(bm):
+            for params in _folders(workload):
+                key = (bm.name, workload.name, params.name)
+                for run in _folders(params):
+                    metrics = run / 'stats' / params.name / 'metrics.txt'
+                    if not metrics.exists():
+                        continue
+                    if not key in times:
+                        times[key] = []
+                    times[key].append(int(Metrics().load(metrics).execution_time()))
+    return times
+
+def _folders(path):
+    for dir, folders, files in os.walk(path):
+        return [ Path(dir) / folder for folder in sorted(folders) ]
+    return []
+
+# Summarize the null distribution of execution times. Speedups are
+# computed against 'reference' (the baseline mean, or the mean of the
+# A/A runs themselves if there is no baseline). For each threshold 't',
+# the false-positive rate is the fraction of runs with |speedup - 1| > t.
+def summarize(times, reference = None, thresholds = DEFAULT_THRESHOLDS):
+    mean = statistics.mean(times)
+    if reference is None:
+        reference = mean
+    speedups = [ reference / t for t in times ]
+    summary  = {
+        'n'         : len(times),
+        'mean'      : mean,
+        'min'       : min(times),
+        'max'       : max(times),
+        'reference' : reference,
+        'speedup'   : {
+            'min' : min(speedups),
+            'max' : max(speedups)
+        },
+        'false_positive_rate' : dict([
+            (str(t), len([ s for s in speedups if abs(s - 1) > t ]) / len(speedups)) for t in thresholds
+        ])
+    }
+    if len(times) > 1:
+        summary['std'] = statistics.stdev(times)
+        summary['cv']  = summary['std'] / mean
+    return summary
+
+def load_baseline(file):
+    if not Path(file).exists():
+        return dict()
+    with open(file, 'r') as f:
+        return json.load(f)
+
+def report(args):
+    baseline = load_baseline(args.baseline)
+    results  = []
+    for (bm, workload, params_id), times in sorted(load_execution_times(args.out).items()):
+        # Note: 'params_id' is equal to the configuration ID used in baseline keys.
+        reference = baseline.get('-'.join([bm, workload, params_id, 'mean']))
+        summary   = summarize(times, reference)
+        results.append({ 'bm' : bm, 'workload' : workload, 'params_id' : params_id, **summary })
+        fpr = ', '.join([ f"{t}: {r:.2f}" for t, r in summary['false_positive_rate'].items() ])
+        print(f"{bm:10} {workload:10} {params_id} n={summary['n']:3} mean={summary['mean']:10.1f} cv={summary.get('cv', 0):.4f} fpr=({fpr})")
+    with open(Path(args.out) / 'report.json', 'w') as f:
+        for r in results:
+            f.write(json.dumps(r, sort_keys = True) + os.linesep)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--xs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified experiments")
+    parser.add_argument('--bs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified benchmarks")
+    parser.add_argument('--ws', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified workloads")
+    parser.add_argument('--data', required = False, default = 'experiments',
+        help = "Location where experiments are stored. Defaults to 'experiments'.")
+    parser.add_argument('--out', required = False, default = 'calibration',
+        help = "Location where calibration runs are stored. Defaults to 'calibration'.")
+    parser.add_argument('--baseline', required = False, default = 'baseline.txt',
+        help = "Baseline file used as reference when reporting. Defaults to 'baseline.txt'.")
+    parser.add_argument('--n', required = False, type = int, default = 10,
+        help = "The number of A/A runs per workload and configuration.")
+    parser.add_argument('--report', required = False, action = 'store_true',
+        help = "Report the null distribution of collected runs")
+    evaluation.add_measurement_arguments(parser)
+    args = parser.parse_args()
+
+    # Identity refactorings have no siblings, and their outliers are
+    # what calibration measures, so they are not re-run.
+    args.sibling_failure_threshold = 0
+    args.confirm_forks             = 0
+
+    if args.report:
+        report(args)
+    else:
+        run(args)
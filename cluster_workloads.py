@@ -0,0 +1,51 @@
+#!/bin/env python3
+
+import argparse
+
+import clustering
+import collect_jfr_metrics
+import evaluation
+import steering
+
+# Cluster the workloads of each benchmark by their JFR profiles, and store
+# one representative per cluster for the planner. (See 'clustering.py'.)
+#
+# Usage:
+#   ./cluster_workloads.py [--data <data=experiments>] [--bs <bs>] [--threshold <similarity>]
+#   ./evaluation.py --benchmark --n <n> --representative-workloads
+
+def get_features(args, x, b, w):
+    configuration = evaluation.get_x_workload_configuration(args, x, b, w)
+    cache         = evaluation.x_location(args) / 'steering'
+    samples       = steering.get_sampled_method_fractions(cache, configuration)
+    compiled      = None
+    jfr_file      = steering.get_cache_jfr(cache, configuration)
+    if jfr_file.exists():
+        compiled = set(collect_jfr_metrics.get_compilations(str(jfr_file)).keys())
+    return samples, compiled
+
+def cluster_workloads(args):
+    workloads = dict() # { (x, b) : { w : <features> } }
+    for x, b, w in evaluation.get_arg_xbw_items(args):
+        workloads.setdefault((x, b), dict())[w] = get_features(args, x, b, w)
+    for (x, b), features in workloads.items():
+        clusters = clustering.cluster(features, args.threshold)
+        clustering.store(evaluation.x_location(args) / x / 'workloads' / b, clusters)
+        print(f"Workload clusters {x} {b}: {len(clusters)}/{len(features)}")
+        for representative, members in sorted(clusters.items()):
+            print(f"  {representative}: {' '.join(members)}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--xs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified experiments")
+    parser.add_argument('--bs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified benchmarks")
+    parser.add_argument('--ws', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified workloads")
+    parser.add_argument('--data', required = False, default = 'experiments',
+        help = "Location where experiments are stored. Defaults to 'experiments'.")
+    parser.add_argument('--threshold', required = False, type = float, default = clustering.DEFAULT_SIMILARITY,
+        help = "Minimum average similarity (0 to 1) of workloads in a cluster.")
+    args = parser.parse_args()
+    cluster_workloads(args)
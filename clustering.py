@@ -0,0 +1,75 @@
+import json
+import math
+import os
+
+from pathlib import Path
+
+# Clustering of the workloads of a benchmark by the code they exercise.
+# Each workload is described by the fraction of JFR execution samples per
+# method (see 'steering.py') and, if the steering flight recording is
+# available, by the set of methods compiled by the JIT. Workloads that
+# exercise similar hot code are clustered, and one representative per
+# cluster is proposed for benchmarking.
+#
+# Clusters: '<x>/workloads/<bm>/clusters.json' : { <representative> : [ <workload> ] }
+
+DEFAULT_SIMILARITY = 0.8
+
+FILE = 'clusters.json'
+
+def cosine_similarity(a, b):
+    dot  = sum([ v * b.get(k, 0.0) for k, v in a.items() ])
+    norm = math.sqrt(sum([ v * v for v in a.values() ])) * math.sqrt(sum([ v * v for v in b.values() ]))
+    return dot / norm if norm > 0 else 0.0
+
+def jaccard_similarity(a, b):
+    union = len(a.union(b))
+    return len(a.intersection(b)) / union if union > 0 else 0.0
+
+# Features are (<method samples>, <compiled methods or None>). The
+# similarity is the mean of the similarities available for both workloads.
+def get_similarity(a, b):
+    samples_a, compiled_a = a
+    samples_b, compiled_b = b
+    similarities = [ cosine_similarity(samples_a, samples_b) ]
+    if not compiled_a is None and not compiled_b is None:
+        similarities.append(jaccard_similarity(compiled_a, compiled_b))
+    return sum(similarities) / len(similarities)
+
+# Agglomerative clustering with average linkage. Clusters are merged as
+# long as their average similarity is at least 'threshold'. Returns
+# { <representative> : [ <workload> ] } where the representative is the
+# workload most similar to the rest of its cluster.
+def cluster(features, threshold = DEFAULT_SIMILARITY):
+    workloads    = sorted(features.keys())
+    similarity   = { (a, b) : get_similarity(features[a], features[b]) for a in workloads for b in workloads }
+    clusters     = [ [w] for w in workloads ]
+    linkage      = lambda c1, c2: sum([ similarity[(a, b)] for a in c1 for b in c2 ]) / (len(c1) * len(c2))
+    while len(clusters) > 1:
+        best, i, j = max([ (linkage(clusters[i], clusters[j]), i, j) for i in range(len(clusters)) for j in range(i + 1, len(clusters)) ])
+        if best < threshold:
+            break
+        clusters[i] = sorted(clusters[i] + clusters[j])
+        del clusters[j]
+    result = dict()
+    for c in clusters:
+        representative = min(c, key = lambda a: (-sum([ similarity[(a, b)] for b in c ]), a))
+        result[representative] = c
+    return result
+
+def store(location, clusters):
+    with open(Path(location) / FILE, 'w') as f:
+        f.write(json.dumps(clusters, indent = 4, sort_keys = True) + os.linesep)
+
+def load(location):
+    file = Path(location) / FILE
+    if not file.exists():
+        return None
+    with open(file, 'r') as f:
+        return json.load(f)
+
+# Workloads that have not been clustered are representatives of themselves.
+def is_representative(clusters, workload):
+    if clusters is None or workload in clusters:
+        return True
+    return not any([ workload in members for members in clusters.values() ])
@@ -1,6 +1,8 @@
 #!/bin/env python
 
+import json
 import os
+import re
 import subprocess
 
 # See '<evaluation>/jfr/sample-events.txt' for a subset of
@@ -9,35 +11,108 @@ import subprocess
 # or by filtering using the --events flag.
 
 
-def compilation_metrics(jfr_file):
-    compilations = get_compilations(jfr_file)
+# JFR settings for the events used by 'compilation_metrics()'. (See
+# 'run_benchmark.run_benchmark()'.) Compilations are recorded regardless
+# of duration, and inlining decisions, disabled by default, are enabled.
+SETTINGS = [
+    'jdk.Compilation#threshold=0 ms',
+    'jdk.CompilerInlining#enabled=true',
+    'jdk.Deoptimization#enabled=true'
+]
 
-    # - Probably need to run each benchmark a large number of times to get enough JFR statistics.
-    #   It is perhaps not feasible to do this for all transformation but perhaps for a random subset
-    #   or perhaps only focusing on inline/extract refactorings, or random subset of those.
-    #
-    # - Looks like we may need to map methods as (method, compileLevel)-pairs to get comparable numbers
-    #   in each category. It would only be relevant to compare measurements on the same VM and VM configuration
-    #   so perhaps compileLevel will always be the same(?) and this is not needed after all.
-    #
-    # - Method compilation time
-    # - Method code size
-    #
-    # - Compilation success count (Not sure how relevant but could look for changes just in case.)
+_duration_pattern = re.compile('^PT(?:(\\d+)H)?(?:(\\d+)M)?(?:(\\d+(?:\\.\\d+)?)S)?$')
+
+# Durations are printed in ISO-8601 format, e.g. 'PT0.365715S'.
+def get_duration_ms(text):
+    match = _duration_pattern.match(text)
+    if not match:
+        return 0.0
+    h, m, s = match.groups()
+    return (int(h or 0) * 3600 + int(m or 0) * 60 + float(s or 0)) * 1000
 
-    # Sample Compilation event:
-    #'duration': '365.715 ms',
-    #'method': 'sun.java2d.SunGraphics2D.validateBasicStroke(BasicStroke)',
-    #'compileLevel': '4',
-    #'succeded': 'true',
-    #'isOsr': 'false',
-    #'codeSize': '2.8 kB',
-    #'inlinedBytes': '193 bytes'
+# Method names use the format of '-XX:+PrintCompilation' ('<class>::<method>')
+# so that they can be matched with 'jit_logs.py'. Overloads are not distinguished.
+def get_method_name(method):
+    holder = method['type']
+    if isinstance(holder, dict):
+        holder = holder['name']
+    return holder.replace('/', '.') + '::' + method['name']
 
-    # TODO: Need to think about what analysing these metrics
-    #       require in terms of execution time.
+# Return the values of all events of the specified types.
+def get_events(jfr_file, events):
+    cmd = ' '.join([
+        'jfr',
+        'print',
+        '--json',
+        '--events',
+        ','.join(events),
+        jfr_file
+    ])
+    result = subprocess.run(
+        cmd,
+        shell      = True,
+        executable = '/bin/bash',
+        stdout     = subprocess.PIPE,
+        stderr     = subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise ValueError("Failed to print flight recording", jfr_file, result.stderr.decode('utf-8'))
+    return [ (e['type'], e['values']) for e in json.loads(result.stdout)['recording']['events'] ]
+
+# Compilation metrics json object (times in ms, sizes in bytes):
+# {
+#   'compilations' : int, 'failed_compilations' : int, 'compile_time' : float, 'code_size' : int, 'inlined_bytes' : int,
+#   'inlined' : int, 'not_inlined' : int, 'deoptimizations' : int,
+#   'methods' : { '<class>::<method>' : { 'tiers' : [ int ], 'compile_time' : float, 'code_size' : int, 'deoptimizations' : int } }
+# }
+#
+# The code size of a method is the size of its latest successful compilation.
+def get_compilation_metrics(events):
+    metrics = {
+        'compilations'        : 0,
+        'failed_compilations' : 0,
+        'compile_time'        : 0.0,
+        'code_size'           : 0,
+        'inlined_bytes'       : 0,
+        'inlined'             : 0,
+        'not_inlined'         : 0,
+        'deoptimizations'     : 0,
+        'methods'             : dict()
+    }
+    def get_method(method):
+        return metrics['methods'].setdefault(get_method_name(method), { 'tiers' : [], 'compile_time' : 0.0, 'code_size' : 0, 'deoptimizations' : 0 })
+    for kind, values in sorted(events, key = lambda it: it[1].get('startTime', '')):
+        if kind == 'jdk.Compilation':
+            method   = get_method(values['method'])
+            duration = get_duration_ms(values.get('duration', 'PT0S'))
+            tier     = int(values['compileLevel'])
+            metrics['compile_time'] = metrics['compile_time'] + duration
+            method['compile_time']  = method['compile_time'] + duration
+            if not tier in method['tiers']:
+                method['tiers'] = sorted(method['tiers'] + [ tier ])
+            # Sic. The field is misspelled in JFR.
+            if not values.get('succeded', values.get('succeeded', True)):
+                metrics['failed_compilations'] = metrics['failed_compilations'] + 1
+                continue
+            metrics['compilations']  = metrics['compilations'] + 1
+            metrics['code_size']     = metrics['code_size'] + int(values['codeSize'])
+            metrics['inlined_bytes'] = metrics['inlined_bytes'] + int(values['inlinedBytes'])
+            method['code_size']      = int(values['codeSize'])
+        elif kind == 'jdk.CompilerInlining':
+            key = 'inlined' if values['succeeded'] else 'not_inlined'
+            metrics[key] = metrics[key] + 1
+        elif kind == 'jdk.Deoptimization':
+            method = get_method(values['method'])
+            method['deoptimizations']  = method['deoptimizations'] + 1
+            metrics['deoptimizations'] = metrics['deoptimizations'] + 1
+    return metrics
+
+def compilation_metrics(jfr_file):
+    return get_compilation_metrics(get_events(jfr_file, [ 'jdk.Compilation', 'jdk.CompilerInlining', 'jdk.Deoptimization' ]))
 
-    pass
+def store(metrics, file):
+    with open(file, 'w') as f:
+        f.write(json.dumps(metrics, indent = 4, sort_keys = True) + os.linesep)
 
 def get_compilations(jfr_file):
 
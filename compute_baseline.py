@@ -9,6 +9,7 @@ import tempfile
 from pathlib    import Path
 from subprocess import TimeoutExpired
 
+import environment
 import run_benchmark as bm_script
 
 from configuration import Configuration
@@ -46,6 +47,18 @@ def compute_baseline(args):
                         break
                 break
         break
+    # Speedups of measurements are computed against the baseline of the
+    # machine they were taken on. (See 'baselines.py'.)
+    fingerprint = environment.get_fingerprint()
+    baseline['_meta_'] = {
+        'hardware'    : {
+            'machine' : fingerprint['machine'],
+            'cpufreq' : fingerprint['cpufreq']
+        },
+        'fingerprint' : fingerprint,
+        'bexec'       : str(args.n),
+        'nexec'       : '10'    # See 'run_benchmark.run_benchmark()'.
+    }
     for (x, b, w), combinations in configurations.items():
         for configuration in combinations:
             bm  = configuration.bm()
@@ -53,7 +66,7 @@ def compute_baseline(args):
             id  = configuration.id()
             key = '-'.join([bm, wl, id])
             if not key in baseline:
-                mean, std = benchmark(configuration)
+                mean, std = benchmark(configuration, args.n)
                 baseline[key          ] = int(mean)
                 baseline[key + '-mean'] = mean      # In case we need the precision... not likely.
                 baseline[key + '-std' ] = std
@@ -63,6 +76,7 @@ def compute_baseline(args):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--x-location', required = False, default = "experiments", help = "Experiment location")
+    parser.add_argument('--n', required = False, type = int, default = 10, help = "Number of baseline executions")
     args = parser.parse_args()
     compute_baseline(args)
 
@@ -1,12 +1,15 @@
 import io
+import json
 import os
 import re
 import hashlib
 import sys
 
 from functools import reduce
+from pathlib   import Path
 from random    import randrange
 
+import heap_sizes
 import tools
 
 class ConfigurationBase:
@@ -127,6 +130,9 @@ class Configuration(ConfigurationBase):
     JRE            = 'jre'
     HEAP_SIZE      = 'heap_size'
     STACK_SIZE     = 'stack_size'
+    JVM_OPTIONS    = 'jvm_options'    # Name of a set of JVM options. (See 'jvm_options.config'.)
+    THREADS        = 'threads'        # Harness driver threads ('-t').
+    CPUS           = 'cpus'           # Number of CPUs the benchmark is pinned to.
 
     # These attributes should be considered when computing
     # a unique ID for the experimental configuration. This
@@ -140,9 +146,48 @@ class Configuration(ConfigurationBase):
         JDK,
         JRE,
         HEAP_SIZE,
-        STACK_SIZE
+        STACK_SIZE,
+        JVM_OPTIONS,
+        THREADS,
+        CPUS
     })
 
+    # Named sets of JVM options json object:
+    # { '<name>' : [ '<option>' ] }
+    #
+    # ATTENTION
+    # The configuration ID depends on the name of the set, not on its
+    # options. Never change the options of a set that has been used in
+    # measurements. Add a new set instead.
+    #
+    # Heap and stack sizes have dedicated parameters and must not be set
+    # using option sets.
+    _jvm_option_sets_path = Path('jvm_options.config')
+    _jvm_option_sets      = None
+    _jvm_option_pattern   = re.compile('^-(XX:[+-]?[A-Za-z0-9_]+(=\\S+)?|X[a-z]\\S*)$')
+    _jvm_option_reserved  = re.compile('^-X(mx|ss|ms|X:(MaxHeapSize|InitialHeapSize|ThreadStackSize)=)')
+
+    def get_jvm_option_sets():
+        if Configuration._jvm_option_sets is None:
+            sets = { 'default' : [] }
+            if Configuration._jvm_option_sets_path.exists():
+                with open(Configuration._jvm_option_sets_path, 'r') as f:
+                    sets = { **sets, **json.load(f) }
+            Configuration._jvm_option_sets = sets
+        return Configuration._jvm_option_sets
+
+    def get_jvm_option_errors(name):
+        sets = Configuration.get_jvm_option_sets()
+        if not name in sets:
+            return [ f"Unknown JVM option set '{name}'. Please define it in '{Configuration._jvm_option_sets_path}'." ]
+        errors = []
+        for option in sets[name]:
+            if not Configuration._jvm_option_pattern.match(option):
+                errors.append(f"Invalid option '{option}' in JVM option set '{name}'")
+            elif Configuration._jvm_option_reserved.match(option):
+                errors.append(f"Option '{option}' in JVM option set '{name}' must be set using '{Configuration.HEAP_SIZE}' or '{Configuration.STACK_SIZE}'")
+        return errors
+
     size_option_pattern = re.compile("(\\d+)([KkMmGg])")
 
     # TODO: Configuration constraints should be loaded from file.
@@ -249,7 +294,10 @@ class Configuration(ConfigurationBase):
             Configuration.JDK,
             Configuration.JRE,
             Configuration.HEAP_SIZE,
-            Configuration.STACK_SIZE
+            Configuration.STACK_SIZE,
+            Configuration.JVM_OPTIONS,
+            Configuration.THREADS,
+            Configuration.CPUS
         }
 
     def _raise_errors(self):
@@ -306,6 +354,16 @@ class Configuration(ConfigurationBase):
                 self.jdk(),
                 self.get_option_constraints(Configuration.JDK)
             ))
+        if self.jvm_options() != None:
+            errors.extend(Configuration.get_jvm_option_errors(self.jvm_options()))
+        if self.heap_size() != None and not (Configuration.size_option_pattern.fullmatch(self.heap_size()) or heap_sizes.is_multiple(self.heap_size())):
+            errors.append(f"Option '{Configuration.HEAP_SIZE}'=\"{self.heap_size()}\" must be a size (e.g. 2G) or a multiple of the minimum heap size (e.g. 2x)")
+        is_positive_int = lambda v: v == None or (str(v).isdigit() and int(v) > 0)
+        if not is_positive_int(self.threads()):
+            errors.append(f"Option '{Configuration.THREADS}'=\"{self.threads()}\" must be a positive integer")
+        # The available CPUs are host dependent and checked by 'run_benchmark.get_cpu_affinity()'.
+        if not is_positive_int(self.cpus()):
+            errors.append(f"Option '{Configuration.CPUS}'=\"{self.cpus()}\" must be a positive integer")
         if len(errors) > 0:
             raise ValueError("Bad configuration", errors)
 
@@ -376,11 +434,72 @@ class Configuration(ConfigurationBase):
     def stack_size(self, value = None):
         return self._clobber(Configuration.STACK_SIZE, value)
 
+    def jvm_options(self, value = None):
+        return self._clobber(Configuration.JVM_OPTIONS, value)
+
+    def threads(self, value = None):
+        return self._clobber(Configuration.THREADS, value)
+
+    def cpus(self, value = None):
+        return self._clobber(Configuration.CPUS, value)
+
+    # The JVM options of the named option set, if any.
+    def get_jvm_options(self):
+        if self.jvm_options() == None:
+            return []
+        return list(Configuration.get_jvm_option_sets()[self.jvm_options()])
+
 class Metrics(ConfigurationBase):
-    EXECUTION_TIME = 'EXECUTION_TIME'
+    EXECUTION_TIME               = 'EXECUTION_TIME'
+
+    # Resource usage of the benchmark run (see 'resource_usage.py').
+    USER_TIME                    = 'USER_TIME'                    # ms
+    SYSTEM_TIME                  = 'SYSTEM_TIME'                  # ms
+    MAX_RSS                      = 'MAX_RSS'                      # kB
+    VOLUNTARY_CONTEXT_SWITCHES   = 'VOLUNTARY_CONTEXT_SWITCHES'
+    INVOLUNTARY_CONTEXT_SWITCHES = 'INVOLUNTARY_CONTEXT_SWITCHES'
+    MINOR_PAGE_FAULTS            = 'MINOR_PAGE_FAULTS'
+    MAJOR_PAGE_FAULTS            = 'MAJOR_PAGE_FAULTS'
+    CGROUP_CPU_TIME              = 'CGROUP_CPU_TIME'              # ms
+    CGROUP_USER_TIME             = 'CGROUP_USER_TIME'             # ms
+    CGROUP_SYSTEM_TIME           = 'CGROUP_SYSTEM_TIME'           # ms
+    CGROUP_THROTTLED_TIME        = 'CGROUP_THROTTLED_TIME'        # ms
+
+    # GC behavior of the measured iteration (see 'gc_logs.py').
+    GC_PAUSES                    = 'GC_PAUSES'
+    GC_PAUSE_TIME                = 'GC_PAUSE_TIME'                # ms
+    GC_MAX_PAUSE                 = 'GC_MAX_PAUSE'                 # ms
+    GC_CPU_TIME                  = 'GC_CPU_TIME'                  # ms
+    GC_HEAP_AFTER                = 'GC_HEAP_AFTER'                # kB
+
+    # Energy consumption of the measured iteration (see 'energy.py').
+    ENERGY_PACKAGE               = 'ENERGY_PACKAGE'               # J
+    ENERGY_DRAM                  = 'ENERGY_DRAM'                  # J
+
+    _keys = {
+        EXECUTION_TIME,
+        USER_TIME,
+        SYSTEM_TIME,
+        MAX_RSS,
+        VOLUNTARY_CONTEXT_SWITCHES,
+        INVOLUNTARY_CONTEXT_SWITCHES,
+        MINOR_PAGE_FAULTS,
+        MAJOR_PAGE_FAULTS,
+        CGROUP_CPU_TIME,
+        CGROUP_USER_TIME,
+        CGROUP_SYSTEM_TIME,
+        CGROUP_THROTTLED_TIME,
+        GC_PAUSES,
+        GC_PAUSE_TIME,
+        GC_MAX_PAUSE,
+        GC_CPU_TIME,
+        GC_HEAP_AFTER,
+        ENERGY_PACKAGE,
+        ENERGY_DRAM
+    }
 
     def is_valid_key(self, key):
-        return key in { Metrics.EXECUTION_TIME }
+        return key in Metrics._keys
 
     def __init__(self):
         super().__init__(Metrics)
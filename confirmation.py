@@ -0,0 +1,70 @@
+import json
+import math
+import os
+import statistics
+
+# Confirmation of outliers. A measurement that deviates from the baseline
+# mean by more than a threshold (in baseline standard deviations) is
+# re-run for a number of forks using the same deployment. The outlier is
+# confirmed if the mean of the confirmation forks deviates in the same
+# direction by more than the threshold in standard errors, and refuted
+# otherwise. If a confirmation fork fails, the outlier is 'INCONCLUSIVE'.
+# The outcome is recorded as a hint in the stats folder, next to
+# 'confirmation.json'. The confirmation does not affect whether the
+# measurement itself succeeded.
+
+DEFAULT_THRESHOLD = 3.0     # Standard deviations.
+
+CONFIRMED    = 'CONFIRMED'
+REFUTED      = 'REFUTED'
+INCONCLUSIVE = 'INCONCLUSIVE'
+
+_statuses = [ CONFIRMED, REFUTED, INCONCLUSIVE ]
+
+def get_baseline(baseline, configuration):
+    key  = '-'.join([configuration.bm(), configuration.bm_workload(), configuration.id()])
+    mean = baseline.get(key + '-mean')
+    std  = baseline.get(key + '-std')
+    if mean is None or std is None:
+        return None
+    return float(mean), float(std)
+
+def get_deviation(time, mean, std):
+    if std <= 0:
+        return 0.0 if time == mean else math.copysign(float('inf'), time - mean)
+    return (time - mean) / std
+
+def is_outlier(time, mean, std, threshold = DEFAULT_THRESHOLD):
+    return abs(get_deviation(time, mean, std)) > threshold
+
+def get_status(time, times, mean, std, threshold = DEFAULT_THRESHOLD):
+    deviation = get_deviation(statistics.mean(times), mean, std / math.sqrt(len(times)))
+    if abs(deviation) > threshold and (deviation > 0) == (time > mean):
+        return CONFIRMED
+    return REFUTED
+
+# 'failures' lists the errors of failed confirmation forks.
+def store(store, time, times, mean, std, threshold = DEFAULT_THRESHOLD, failures = None):
+    failures = failures or []
+    status   = INCONCLUSIVE if len(failures) > 0 else get_status(time, times, mean, std, threshold)
+    for hint in _statuses:
+        (store / hint).unlink(missing_ok = True)
+    with open(store / 'confirmation.json', 'w') as f:
+        f.write(json.dumps({
+            'status'         : status,
+            'execution_time' : time,
+            'forks'          : times,
+            'failures'       : failures,
+            'baseline_mean'  : mean,
+            'baseline_std'   : std,
+            'threshold'      : threshold
+        }, sort_keys = True) + os.linesep)
+    with open(store / status, 'w'):
+        pass
+    return status
+
+def load_status(store):
+    for hint in _statuses:
+        if (store / hint).exists():
+            return hint
+    return None
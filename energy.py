@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from configuration import Metrics
+
+# Energy consumption from the RAPL (Running Average Power Limit) counters
+# exposed by the powercap framework in '/sys/class/powercap/intel-rapl*'
+# (also used for AMD processors). Counters are sampled when the measured
+# (last) iteration starts and when it passes (see 'HarnessOutputMonitor' in
+# 'run_benchmark.py'), so that energy is comparable to 'EXECUTION_TIME'.
+#
+# Counters are cumulative micro joules that wrap around at
+# 'max_energy_range_uj'. A single wraparound between samples is handled,
+# which is enough for iterations shorter than several minutes.
+#
+# Machines without RAPL counters, or where 'energy_uj' is not readable by
+# the user (the default since Linux 5.10), do not record energy.
+#
+# All paths are relative to 'root' so that sampling can be tested against
+# a fake file system tree.
+
+_domains = {
+    'package' : Metrics.ENERGY_PACKAGE,
+    'dram'    : Metrics.ENERGY_DRAM
+}
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _get_domain(name):
+    # Packages are named 'package-<n>', one per socket.
+    return 'package' if name.startswith('package-') else name
+
+# 'intel-rapl-mmio' zones report the package domain again and are ignored.
+def get_zones(root = Path('/')):
+    powercap = Path(root) / 'sys/class/powercap'
+    if not powercap.exists():
+        return []
+    return sorted(powercap.glob('intel-rapl:*'))
+
+# Return { <zone> : (<domain>, <energy uj>, <max energy range uj>) }.
+def sample(root = Path('/')):
+    counters = dict()
+    for zone in get_zones(root):
+        name       = _read(zone / 'name')
+        energy     = _read(zone / 'energy_uj')
+        max_energy = _read(zone / 'max_energy_range_uj')
+        if name is None or energy is None or max_energy is None:
+            continue
+        domain = _get_domain(name)
+        if domain in _domains:
+            counters[zone.name] = (domain, int(energy), int(max_energy))
+    return counters
+
+# Energy (J) per domain between samples, summed over sockets.
+def get_energy(before, after):
+    energy = dict()
+    for zone, (domain, end, max_energy) in after.items():
+        if not zone in before:
+            continue
+        delta = end - before[zone][1]
+        if delta < 0:
+            delta = delta + max_energy # Wraparound.
+        energy[domain] = energy.get(domain, 0) + delta / 1000000
+    return energy
+
+def get_metrics(before, after):
+    if before is None or after is None:
+        return dict()
+    return { _domains[domain] : str(round(joules, 3)) for domain, joules in get_energy(before, after).items() }
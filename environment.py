@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import time
+
+from pathlib import Path
+
+import tools
+
+# Sample the state of the machine from '/proc' and '/sys' so that
+# measurements taken while the machine was throttling or busy can be
+# explained, filtered, or re-queued. All paths are relative to 'root'
+# so that sampling can be tested against a fake file system tree.
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _glob(path, pattern):
+    return sorted(Path(path).glob(pattern)) if Path(path).exists() else []
+
+def sample_cpu(root):
+    frequencies = [] # MHz
+    governors   = set()
+    for cpufreq in _glob(root / 'sys/devices/system/cpu', 'cpu[0-9]*/cpufreq'):
+        frequency = _read(cpufreq / 'scaling_cur_freq')
+        governor  = _read(cpufreq / 'scaling_governor')
+        if not frequency is None:
+            frequencies.append(int(frequency) / 1000)
+        if not governor is None:
+            governors.add(governor)
+    if len(frequencies) == 0:
+        return { 'governors' : sorted(governors) }
+    return {
+        'frequency_min'  : min(frequencies),
+        'frequency_max'  : max(frequencies),
+        'frequency_mean' : sum(frequencies) / len(frequencies),
+        'governors'      : sorted(governors)
+    }
+
+def sample_load(root):
+    text = _read(root / 'proc/loadavg')
+    if text is None:
+        return dict()
+    parts = text.split(' ')
+    return { 'load_1' : float(parts[0]), 'load_5' : float(parts[1]), 'load_15' : float(parts[2]) }
+
+def sample_thermal(root):
+    zones = dict() # { <type> : <degrees Celsius> }
+    for zone in _glob(root / 'sys/class/thermal', 'thermal_zone*'):
+        temp = _read(zone / 'temp')
+        if temp is None:
+            continue
+        kind = _read(zone / 'type') or zone.name
+        if kind in zones:
+            kind = kind + '-' + zone.name
+        zones[kind] = int(temp) / 1000
+    return zones
+
+def sample_memory(root):
+    text = _read(root / 'proc/meminfo')
+    if text is None:
+        return dict()
+    memory = dict()
+    for line in text.split(os.linesep):
+        name, _, value = line.partition(':')
+        if name in { 'MemTotal', 'MemFree', 'MemAvailable' }:
+            memory[name] = int(value.strip().split(' ')[0]) # kB
+    return memory
+
+def sample(root = Path('/')):
+    root = Path(root)
+    return {
+        'time'    : time.time(),
+        'cpu'     : sample_cpu(root),
+        'load'    : sample_load(root),
+        'thermal' : sample_thermal(root),
+        'memory'  : sample_memory(root),
+        'jvms'    : [ cmd for pid, cmd in tools.get_running_jvms(root / 'proc') ]
+    }
+
+# Hardware fingerprint of the machine. Measurements are only comparable
+# to baselines with the same fingerprint (see 'baselines.py'). Besides the
+# maximum frequency of the CPU, the fingerprint includes the frequency that
+# it is limited (pinned) to, and its governor, so that baselines computed on
+# the same machine at different frequencies are distinguished.
+def get_fingerprint(root = Path('/')):
+    root     = Path(root)
+    cpufreq  = root / 'sys/devices/system/cpu/cpu0/cpufreq'
+    cpuinfo  = _read(root / 'proc/cpuinfo') or ''
+    models   = [ line.partition(':')[2].strip() for line in cpuinfo.split(os.linesep) if line.startswith('model name') ]
+    maxfreq  = _read(cpufreq / 'cpuinfo_max_freq')
+    limit    = _read(cpufreq / 'scaling_max_freq')
+    memory   = sample_memory(root).get('MemTotal')
+    return {
+        'machine'       : _read(root / 'proc/sys/kernel/hostname'),
+        'cpu'           : models[0] if len(models) > 0 else None,
+        'cpus'          : len(models) if len(models) > 0 else os.cpu_count(),
+        'cpufreq'       : int(maxfreq) // 1000 if not maxfreq is None else None, # MHz
+        'cpufreq_limit' : int(limit) // 1000 if not limit is None else None, # MHz
+        'governor'      : _read(cpufreq / 'scaling_governor'),
+        'memory'        : round(memory / 1024 ** 2) if not memory is None else None # GiB
+    }
+
+HARDWARE_KEYS = [ 'cpu', 'cpus', 'cpufreq', 'cpufreq_limit', 'governor', 'memory' ]
+MACHINE_KEYS  = [ 'machine' ] + HARDWARE_KEYS
+
+# Identifies a machine, or any machine with the same hardware if only 'HARDWARE_KEYS' are used.
+def get_fingerprint_id(fingerprint, keys = MACHINE_KEYS):
+    text = json.dumps([ (k, fingerprint.get(k)) for k in keys ])
+    return hashlib.md5(bytes(text, encoding = 'utf-8')).hexdigest()
+
+# Limits for what is considered a quiet machine. Limits set to None are
+# not checked.
+class Thresholds:
+    def __init__(self, max_load = None, max_temperature = None, allow_jvms = True, governor = None):
+        self.max_load        = max_load
+        self.max_temperature = max_temperature # Degrees Celsius.
+        self.allow_jvms      = allow_jvms
+        self.governor        = governor
+
+# Return a list of reasons why the sampled machine state is noisy. The load
+# should not be checked after a benchmark, since the benchmark's own work
+# raises the load average.
+def get_noise(sample, thresholds, check_load = True):
+    reasons = []
+    load    = sample['load'].get('load_1')
+    if check_load and not thresholds.max_load is None and not load is None and load > thresholds.max_load:
+        reasons.append(f"load {load} > {thresholds.max_load}")
+    if not thresholds.max_temperature is None:
+        for zone, temperature in sample['thermal'].items():
+            if temperature > thresholds.max_temperature:
+                reasons.append(f"temperature {zone} {temperature} > {thresholds.max_temperature}")
+    if not thresholds.allow_jvms and len(sample['jvms']) > 0:
+        reasons.append(f"{len(sample['jvms'])} running JVM(s)")
+    if not thresholds.governor is None:
+        for governor in sample['cpu']['governors']:
+            if governor != thresholds.governor:
+                reasons.append(f"governor {governor} != {thresholds.governor}")
+    return reasons
+
+# Wait until the machine is quiet. Returns the list of reasons why the
+# machine is still noisy after 'timeout' seconds, or an empty list.
+def wait_until_quiet(thresholds, timeout, interval = 10, root = Path('/')):
+    deadline = time.monotonic() + timeout
+    while True:
+        reasons = get_noise(sample(root), thresholds)
+        if len(reasons) == 0 or time.monotonic() >= deadline:
+            return reasons
+        print("Waiting for a quiet machine:", '; '.join(reasons))
+        time.sleep(min(interval, max(0, deadline - time.monotonic())))
+
+def store(file, samples):
+    with open(file, 'w') as f:
+        f.write(json.dumps(samples, sort_keys = True) + os.linesep)
@@ -3,6 +3,7 @@
 import argparse
 import datetime
 import itertools
+import json
 import logging
 import os
 import random
@@ -11,17 +12,34 @@ from random import randrange
 import shutil
 from subprocess import TimeoutExpired
 import tempfile
+import zipfile
 import zoneinfo
 
 from executor import load_state, save_state, do_files
+import allocation
+import baselines
+import build_cache
+import clustering
+import collect_jfr_metrics
+import confirmation
 import configuration
+import environment
+import jit_logs
+import leases
 import opportunity_cache
+import paired
+import planner
 import patch
+import redundancy
 import run_benchmark as bm_script
+import screening
+import sibling_failures
 import steering
 import tools
 import workspace     as ws_script
 
+from configuration import Metrics
+
 logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', datefmt='%m/%d/%Y %I:%M:%S %p')
 log = logging.getLogger(__name__)
 
@@ -148,7 +166,7 @@ def _refactor_proxy(workspace, data, descriptor):
         return
     ws_script.refactor(workspace, data, descriptor)
 
-def _create_refactor_task(workspace, data, line, counter):
+def _create_refactor_task(workspace, data, line, counter, sibling_failure_threshold):
     # Note: If line parsing fails, try removing the persisted
     #       file state written in the data folder. The issue
     #       is likely that there is state preserved from a
@@ -158,6 +176,16 @@ def _create_refactor_task(workspace, data, line, counter):
     if data.exists():
         return None, None
 
+    # Skip parameter variants of opportunities that fail regardless of parameters.
+    if sibling_failure_threshold > 0:
+        signature = sibling_failures.get_sibling_refactoring_failure(data.parent, descriptor.id(), sibling_failure_threshold)
+        if not signature is None:
+            print(f"Skipping refactoring with failed siblings: ID={descriptor.id()}; DATA={str(data)}")
+            sibling_failures.mark_skipped(data, signature)
+            with open(data / 'descriptor.txt', 'w') as f:
+                f.write(descriptor.line() + os.linesep)
+            return None, None
+
     # We count here, before going into the worker.
     counter['count'] = counter['count'] + 1
 
@@ -180,7 +208,7 @@ def refactor(args):
         files                = [str(path)]
         tell                 = load_state(state_file, files)
         workspace            = x_location(args) / x / 'workspaces' / bm / workload / 'workspace'
-        parse_task_from_line = lambda line: _create_refactor_task(workspace, data_bm, line, counter)
+        parse_task_from_line = lambda line: _create_refactor_task(workspace, data_bm, line, counter, args.sibling_failure_threshold)
         while counter['count'] < limit:
             print("Select refactorings from file: ", path)
             count_before = counter['count']
@@ -203,27 +231,49 @@ def prime_import_location(args, x, configuration, location, data):
     # Assume that we have workspaces available.
     # However, at this point we are only interested
     # in the orignal '-build.zip' files and patches.
+    #
+    # If 'data' is None, the unrefactored archives are primed. If 'data'
+    # is a list, the patches of all listed refactorings are applied, which
+    # requires that they patch disjoint files. (See 'screening.py'.)
+    #
+    # Archives without patches are copied into place (reflinked where
+    # supported) since the build may modify them in place. Only
+    # patched members of the remaining archives are extracted, patched,
+    # and written into a streamed copy of the archive.
     ws = x_location(args) / x / 'workspaces' / configuration.bm() / configuration.bm_workload() / 'workspace'
     for root, dirs, files in os.walk(ws):
         for file in files:
             if not file.endswith("-build.zip"):
                 continue
 
-            with tempfile.TemporaryDirectory(dir = location) as tmp:
-                temp           = Path(tmp)
-                stem           = file[:file.rfind('-')]
-                main_jar_patch = data / (stem + "-main-src.jar.patch")
-                test_jar_patch = data / (stem + "-test-src.jar.patch")
-
-                tools.unzip(ws / file, tmp)
-
-                if main_jar_patch.exists():
-                    patch.apply_patch(main_jar_patch, temp / 'src/main/java')
+            stem    = file[:file.rfind('-')]
+            datas   = [] if data is None else (data if isinstance(data, list) else [data])
+            patches = [ p for d in datas for p in [
+                (d / (stem + "-main-src.jar.patch"), 'src/main/java'),
+                (d / (stem + "-test-src.jar.patch"), 'src/test/java')
+            ] ]
+            patches = [ (p, src_root) for p, src_root in patches if p.exists() ]
 
-                if test_jar_patch.exists():
-                    patch.apply_patch(test_jar_patch, temp / 'src/test/java')
+            if len(patches) == 0:
+                tools.reflink_or_copy(ws / file, location / file)
+                continue
 
-                tools.zip(temp, location / file)
+            with tempfile.TemporaryDirectory(dir = location) as tmp:
+                temp    = Path(tmp)
+                members = [] # Patched member names.
+                with zipfile.ZipFile(ws / file, 'r') as z:
+                    names = set(z.namelist())
+                    for p, src_root in patches:
+                        for name in [ src_root + '/' + f for f in patch.get_patched_files(p) ]:
+                            members.append(name)
+                            if name in names:
+                                z.extract(name, temp)
+                for p, src_root in patches:
+                    (temp / src_root).mkdir(parents = True, exist_ok = True)
+                    patch.apply_patch(p, temp / src_root)
+
+                replacements = dict([ (name, temp / name) for name in members if (temp / name).exists() ])
+                tools.zip_replace(ws / file, location / file, replacements)
         break
 
 def build_and_benchmark(args, x, configuration, data_location, capture_flight_recording = True):
@@ -232,18 +282,60 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
     bm                 = configuration.bm()
     workload           = configuration.bm_workload()
 
+    if not has_available_cpus(configuration):
+        return False
+
     store              = data_location / 'stats' / configuration.params_id()
     failure            = store / 'FAILURE'
     success            = store / 'SUCCESS'
-    timeout_hint       = store / 'TIMEOUT'
     generic_hint       = store / 'GENERIC'
+    compile_hint       = store / 'COMPILE'
     jfr_save           = store / 'flight.jfr'
+    compilation_save   = store / 'compilation.json'
     metrics_save       = store / 'metrics.txt'
+    iterations_save    = store / 'iterations.txt'
+    gc_save            = store / 'gc.json'
     configuration_save = store / 'configuration.txt'
 
     store.mkdir(parents = True, exist_ok = True)
     configuration.store(configuration_save)
 
+    # Don't spend a build on a parameter variant of an opportunity
+    # that has failed regardless of parameters under this configuration.
+    if args.sibling_failure_threshold > 0:
+        signature = sibling_failures.get_sibling_benchmark_failure(
+            data_location.parent.parent, # Opportunity.
+            data_location.parent.name,   # Refactoring.
+            configuration.params_id(),
+            args.sibling_failure_threshold
+        )
+        if not signature is None:
+            log.warning("--- Benchmark skipped (parameter-independent failure of siblings) ---")
+            log.warning("data: %s", str(store))
+            log.warning("conf: %s", str(configuration._values))
+            log.warning("-------------------------")
+            sibling_failures.mark_skipped(store, signature)
+            with open(generic_hint, 'w'):
+                pass
+            return False
+
+    # Don't spend a build on patches that are known not to compile
+    # under this configuration's build parameters.
+    builds     = build_cache.BuildFailureCache(data_location)
+    diagnostic = builds.get(configuration)
+    if not diagnostic is None:
+        log.warning("--- Benchmark failure (cached compile failure) ---")
+        log.warning("data: %s", str(store))
+        log.warning("conf: %s", str(configuration._values))
+        log.warning("-------------------------")
+        with open(failure, 'w') as f:
+            f.write(diagnostic)
+        with open(generic_hint, 'w'):
+            pass
+        with open(compile_hint, 'w'):
+            pass
+        return False
+
     try:
         clean = True
         with tempfile.TemporaryDirectory(delete = True, dir = 'temp') as location:
@@ -252,13 +344,33 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
             jfr_file      = Path(location) / 'flight.jfr'
             deploy_dir.mkdir()
             prime_import_location(args, x, configuration, import_dir, data_location)
-            bm_script.deploy_benchmark(configuration, clean, deploy_dir, import_dir)
-
-            # Capture execution time with flight recording disabled.
-            exectime = bm_script.run_benchmark(configuration, deploy_dir, False, None)
-
-            with open(metrics_save, 'w') as f:
-                f.write("EXECUTION_TIME=" + str(exectime) + os.linesep)
+            deploy_refactoring(configuration, clean, deploy_dir, import_dir, builds, store)
+            run_smoke_tier(args, configuration, deploy_dir, store)
+
+            # Capture execution time and resource usage with flight
+            # recording disabled. Iteration times are recorded as they
+            # are reported.
+            env_before = sample_quiet_machine(args, store)
+            if env_before is None:
+                return False
+            iterations_save.unlink(missing_ok = True)
+            gc_save.unlink(missing_ok = True)
+            resources  = dict()
+            exectime   = bm_script.run_benchmark(
+                configuration,
+                deploy_dir,
+                False,
+                None,
+                iterations_save,
+                resources = resources,
+                gc_file   = gc_save if args.gc_log else None
+            )
+            env_after  = environment.sample()
+            record_environment(args, store, env_before, env_after)
+
+            Metrics().execution_time(str(exectime)).init_from_dict(resources).store(metrics_save)
+
+            confirm_outlier(args, configuration, deploy_dir, store, int(exectime))
 
             # ATTENTION
             # The captured flight recording is not for the benchmark
@@ -266,8 +378,11 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
 
             if capture_flight_recording:
                 print("Running again to capture flight recording")
-                bm_script.run_benchmark(configuration, deploy_dir, True, str(jfr_file))
+                bm_script.run_benchmark(configuration, deploy_dir, True, str(jfr_file), jfr_settings = collect_jfr_metrics.SETTINGS)
                 shutil.copy2(jfr_file, jfr_save)
+                record_compilation_metrics(jfr_save, compilation_save)
+
+            record_jit_diff(args, x, configuration, deploy_dir, store, data_location)
 
             with open(success, 'w'):
                 pass
@@ -276,7 +391,211 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
         raise e
     except TypeError as e:
         raise e
-    except TimeoutExpired as e:
+    except Exception as e:
+        record_benchmark_failure(store, configuration, e)
+    return False
+
+# Workloads of the benchmarks that are sized, from smallest to largest.
+_workload_sizes = [ 'small', 'default', 'large' ]
+
+# Return the workload of the smoke run, or None if the benchmark has no
+# valid workload smaller than the measured one. Without '--smoke-workload'
+# this is the smallest valid workload of the benchmark. Benchmarks whose
+# workloads are not sized (e.g. jacop) are not smoke tested unless the
+# workload is specified.
+def get_smoke_workload(args, configuration):
+    workloads = configuration.get_option_constraints(configuration.BM_WORKLOAD)
+    if args.smoke_workload != None:
+        workload = args.smoke_workload if workloads is None or args.smoke_workload in workloads else None
+    else:
+        workload = next((w for w in _workload_sizes if workloads is None or w in workloads), None)
+    return None if workload == configuration.bm_workload() else workload
+
+# Run the refactored deployment once on the smoke workload, with output
+# validation, before spending a full measurement on it. The outcome is
+# recorded in 'tier.txt', and failures also get the 'SMOKE' hint. The
+# exception of a failed smoke run is re-raised to fail the measurement.
+def run_smoke_tier(args, configuration, deploy_dir, store):
+    if not args.smoke:
+        return
+    workload = get_smoke_workload(args, configuration)
+    if workload is None:
+        print(f"No smoke workload for '{configuration.bm()}' workload '{configuration.bm_workload()}'")
+        return
+    tier_save = store / 'tier.txt'
+    print(f"Smoke run on workload '{workload}'")
+    try:
+        bm_script.run_benchmark(configuration, deploy_dir, False, None, iterations = 1, workload = workload)
+    except Exception as e:
+        with open(tier_save, 'w') as f:
+            f.write("SMOKE=FAILED" + os.linesep)
+        with open(store / 'SMOKE', 'w'):
+            pass
+        raise e
+    with open(tier_save, 'w') as f:
+        f.write("SMOKE=PASSED" + os.linesep)
+
+# Store JIT compilation metrics of the flight recording next to it. (See
+# 'collect_jfr_metrics.py'.) The measurement does not fail if the flight
+# recording cannot be printed, e.g. if 'jfr' is not available.
+def record_compilation_metrics(jfr_save, compilation_save):
+    try:
+        metrics = collect_jfr_metrics.compilation_metrics(str(jfr_save))
+    except (ValueError, KeyError) as e:
+        log.warning("Failed to collect compilation metrics: %s", str(e))
+        return
+    collect_jfr_metrics.store(metrics, compilation_save)
+    print(f"Compilations: {metrics['compilations']}, compile time: {metrics['compile_time']:.0f} ms, code size: {metrics['code_size']} bytes, deoptimizations: {metrics['deoptimizations']}")
+
+# Run the refactored deployment again, and the baseline deployment unless
+# its summary is cached for the configuration, with JIT compilations and
+# inlining decisions printed, and store their differences for the classes
+# patched by the refactoring in 'jit.json'. See 'jit_logs.py'. The
+# measurement does not fail if the differences cannot be recorded.
+def record_jit_diff(args, x, configuration, deploy_dir, store, data_location):
+    if not args.jit_diff:
+        return
+    try:
+        diff_jit(args, x, configuration, deploy_dir, store, data_location)
+    except AttributeError as e:
+        raise e
+    except TypeError as e:
+        raise e
+    except Exception as e:
+        log.warning("Failed to record JIT differences: %s", str(e))
+
+def diff_jit(args, x, configuration, deploy_dir, store, data_location):
+    jit_save      = store / 'jit.json'
+    baseline_save = x_location(args) / x / 'workloads' / configuration.bm() / configuration.bm_workload() / 'jit' / (configuration.id() + '.json')
+    with tempfile.TemporaryDirectory(delete = True, dir = 'temp') as location:
+        refactored_file = Path(location) / 'refactored.json'
+        print("Running again to capture JIT compilations")
+        bm_script.run_benchmark(configuration, deploy_dir, False, None, jit_file = refactored_file)
+        if not baseline_save.exists():
+            print("Running baseline to capture JIT compilations")
+            import_dir   = Path(location) / 'baseline' / 'import'
+            baseline_dir = Path(location) / 'baseline' / 'deployment'
+            import_dir.mkdir(parents = True)
+            baseline_dir.mkdir(parents = True)
+            prime_import_location(args, x, configuration, import_dir, None)
+            bm_script.deploy_benchmark(configuration, True, baseline_dir, import_dir)
+            baseline_save.parent.mkdir(parents = True, exist_ok = True)
+            bm_script.run_benchmark(configuration, baseline_dir, False, None, jit_file = baseline_save)
+        patched = [ f for p in sorted(data_location.glob('*-src.jar.patch')) for f in patch.get_patched_files(p) ]
+        diff    = jit_logs.diff(jit_logs.load(baseline_save), jit_logs.load(refactored_file), jit_logs.get_classes(patched))
+        jit_logs.store(diff, jit_save)
+        print(f"JIT differences: {len(diff['methods'])} methods, {len(diff['inlining'])} inlining decisions")
+
+# Re-run the deployment for '--confirm-forks' forks if the execution time
+# is an outlier against the baseline, and record whether the outlier is
+# confirmed or refuted. See 'confirmation.py'.
+def confirm_outlier(args, configuration, deploy_dir, store, exectime):
+    if args.confirm_forks <= 0:
+        return None
+    reference = confirmation.get_baseline(planner.load_baseline(args.baseline), configuration)
+    if reference is None:
+        return None
+    mean, std = reference
+    if not confirmation.is_outlier(exectime, mean, std, args.confirm_threshold):
+        return None
+    times    = []
+    failures = []
+    for i in range(args.confirm_forks):
+        print(f"Confirmation fork {i + 1}/{args.confirm_forks} of outlier {exectime} ms (baseline {mean:.0f} ms +/- {std:.0f} ms)")
+        try:
+            times.append(int(bm_script.run_benchmark(configuration, deploy_dir, False, None)))
+        except AttributeError as e:
+            raise e
+        except TypeError as e:
+            raise e
+        except Exception as e:
+            # The measurement stands. Remaining forks would likely fail too.
+            log.warning("Confirmation fork failed: %s", str(e)[:200])
+            failures.append(str(e))
+            break
+    status = confirmation.store(store, exectime, times, mean, std, args.confirm_threshold, failures)
+    print(f"Outlier {status.lower()}: {store}")
+    return status
+
+def get_noise_thresholds(args):
+    return environment.Thresholds(
+        max_load        = args.max_load,
+        max_temperature = args.max_temperature,
+        allow_jvms      = not args.exclusive,
+        governor        = args.governor
+    )
+
+def is_quiet_machine_required(args):
+    return args.max_load != None or args.max_temperature != None or args.exclusive or args.governor != None
+
+# Measurements pinned to more CPUs than this host may run on are left to
+# other hosts, and remain in the execution plan since nothing is stored.
+def has_available_cpus(configuration):
+    if bm_script.has_available_cpus(configuration):
+        return True
+    log.warning("Skipping measurement pinned to %s CPUs, of which %d are available", configuration.cpus(), len(tools.get_available_cpus()))
+    return False
+
+def is_noisy(store):
+    return (store / 'NOISY').exists()
+
+# Wait for a quiet machine right before a measurement, when the build and
+# the smoke run no longer raise the load, and sample its state. If the
+# machine is still noisy after '--quiet-wait' seconds, the measurement is
+# not taken. Its store gets the 'NOISY' hint listing the reasons instead,
+# and None is returned.
+def sample_quiet_machine(args, store):
+    noisy = store / 'NOISY'
+    noisy.unlink(missing_ok = True)
+    if is_quiet_machine_required(args):
+        reasons = environment.wait_until_quiet(get_noise_thresholds(args), args.quiet_wait)
+        if len(reasons) > 0:
+            log.warning("Skipping measurement on noisy machine: %s", '; '.join(reasons))
+            with open(noisy, 'w') as f:
+                f.write(os.linesep.join(reasons) + os.linesep)
+            return None
+    return environment.sample()
+
+# Save machine state sampled before and after a measurement, and the
+# hardware fingerprint of the machine, next to 'metrics.txt'. Measurements
+# taken on a noisy machine get a 'NOISY' hint listing the reasons. They are
+# left out of the results and measured again by later runs. The load is
+# only checked before the measurement since the benchmark itself raises
+# the load average.
+def record_environment(args, store, env_before, env_after):
+    environment.store(store / 'environment.json', { 'before' : env_before, 'after' : env_after })
+    baselines.store_fingerprint(store, environment.get_fingerprint())
+    noisy = store / 'NOISY'
+    if not is_quiet_machine_required(args):
+        return
+    thresholds = get_noise_thresholds(args)
+    reasons    = environment.get_noise(env_before, thresholds) + environment.get_noise(env_after, thresholds, check_load = False)
+    if len(reasons) > 0:
+        log.warning("Noisy measurement: %s", '; '.join(reasons))
+        with open(noisy, 'w') as f:
+            f.write(os.linesep.join(reasons) + os.linesep)
+
+# Deploy the refactored benchmark. Compile failures are recorded in the
+# build failure cache, and the 'COMPILE' hint is added to 'store'.
+def deploy_refactoring(configuration, clean, deploy_dir, import_dir, builds, store):
+    try:
+        bm_script.deploy_benchmark(configuration, clean, deploy_dir, import_dir)
+    except bm_script.BuildError as e:
+        diagnostic = build_cache.get_compiler_diagnostic(e.output())
+        if not diagnostic is None:
+            builds.put(configuration, diagnostic)
+            with open(store / 'COMPILE', 'w'):
+                pass
+        raise e
+
+def record_benchmark_failure(store, configuration, e):
+    global log
+
+    failure      = store / 'FAILURE'
+    timeout_hint = store / 'TIMEOUT'
+    generic_hint = store / 'GENERIC'
+
+    if isinstance(e, TimeoutExpired):
         log.warning("--- Benchmark failure (timeout) ---")
         log.warning("Please tune configured timeouts, if needed.")
         log.warning("The error has been written to the FAILURE file.")
@@ -285,9 +604,9 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
         log.warning("-------------------------")
         with open(failure, 'w') as f:
             f.write(str(e))
-        with open(timeout_hint, 'w') as e:
+        with open(timeout_hint, 'w'):
             pass
-    except Exception as e:
+    else:
         log.warning("--- Benchmark failure (generic) ---")
         log.warning("The error has been written to the FAILURE file.")
         log.warning("data: %s", str(store))
@@ -295,10 +614,98 @@ def build_and_benchmark(args, x, configuration, data_location, capture_flight_re
         log.warning("-------------------------")
         with open(failure, 'w') as f:
             f.write(str(e))
-        with open(generic_hint, 'w') as f:
+        with open(generic_hint, 'w'):
             pass
+
+# Measure the refactoring against the unrefactored benchmark, built from
+# the same workspace archives, by alternating forks of the two deployments.
+# The order within each pair alternates to cancel out order effects.
+# Results are stored in '<execution>/paired/<params_id>'.
+def build_and_benchmark_paired(args, x, configuration, data_location, forks):
+    global log
+
+    if not has_available_cpus(configuration):
+        return False
+
+    store              = data_location / 'paired' / configuration.params_id()
+    success            = store / 'SUCCESS'
+    pairs_save         = store / 'pairs.txt'
+    summary_save       = store / 'summary.json'
+    configuration_save = store / 'configuration.txt'
+
+    store.mkdir(parents = True, exist_ok = True)
+    configuration.store(configuration_save)
+
+    builds     = build_cache.BuildFailureCache(data_location)
+    diagnostic = builds.get(configuration)
+    if not diagnostic is None:
+        record_benchmark_failure(store, configuration, ValueError("Cached compile failure", diagnostic))
+        with open(store / 'COMPILE', 'w'):
+            pass
+        return False
+
+    try:
+        clean = True
+        with tempfile.TemporaryDirectory(delete = True, dir = 'temp') as location:
+            deployments = dict()
+            for which, data in [ (paired.BASELINE, None), (paired.REFACTORED, data_location) ]:
+                import_dir = Path(location) / which / 'import'
+                deploy_dir = Path(location) / which / 'deployment'
+                import_dir.mkdir(parents = True)
+                deploy_dir.mkdir(parents = True)
+                prime_import_location(args, x, configuration, import_dir, data)
+                if data is None:
+                    bm_script.deploy_benchmark(configuration, clean, deploy_dir, import_dir)
+                else:
+                    deploy_refactoring(configuration, clean, deploy_dir, import_dir, builds, store)
+                    run_smoke_tier(args, configuration, deploy_dir, store)
+                deployments[which] = deploy_dir
+
+            env_before = sample_quiet_machine(args, store)
+            if env_before is None:
+                return False
+            pairs_save.unlink(missing_ok = True)
+            pairs      = []
+            for i in range(forks):
+                order = paired.get_order(i)
+                times = dict()
+                for which in order:
+                    print(f"Paired fork {i + 1}/{forks}: {which}")
+                    times[which] = int(bm_script.run_benchmark(configuration, deployments[which], False, None))
+                pair = paired.Pair(i, order, times[paired.BASELINE], times[paired.REFACTORED])
+                pair.append_to(pairs_save)
+                pairs.append(pair)
+
+            record_environment(args, store, env_before, environment.sample())
+
+            with open(summary_save, 'w') as f:
+                f.write(json.dumps(paired.summarize(pairs), sort_keys = True) + os.linesep)
+
+            with open(success, 'w'):
+                pass
+        return True
+    except AttributeError as e:
+        raise e
+    except TypeError as e:
+        raise e
+    except Exception as e:
+        record_benchmark_failure(store, configuration, e)
     return False
 
+# Paired measurements are stored separately from regular measurements.
+def get_measurement_folder(args):
+    return 'paired' if args.paired > 0 else 'stats'
+
+def get_lease_path(store):
+    return store.parent / (store.name + '.lease')
+
+# Noisy measurements are measured again. (See 'record_environment()'.)
+def is_measured(store):
+    return ((store / 'SUCCESS').exists() and not is_noisy(store)) or (store / 'FAILURE').exists()
+
+def is_reclaimable(store, lease_duration):
+    return not is_measured(store) and not leases.is_leased(get_lease_path(store), lease_duration)
+
 def get_valid_configurations_of(args, x, bm, workload):
     configs    = []
     config     = get_x_workload_configuration(args, x, bm, workload)
@@ -350,11 +757,17 @@ def get_benchmark_execution_plan(args):
     plan           = []
     keys           = set()
     configurations = dict()
+    redundant      = dict()
     for x, b, w, l_name, l_path in get_arg_xbwlp_items(args):
+        # Workloads that exercise the same code as a representative workload are skipped. (See 'cluster_workloads.py'.)
+        if args.representative_workloads and not clustering.is_representative(clustering.load(x_location(args) / x / 'workloads' / b), w):
+            continue
         if not (x, b, w) in configurations:
             # All lists in the same (x,b,w)-tuple share the configuration set.
             # All refactorings on all lists in the same (x,b,w)-tuple should be benchmarked with these configurations.
             configurations[(x, b, w)] = get_valid_configurations_of(args, x, b, w)
+            # Configurations that behave like another configuration are sampled. (See 'prune_configurations.py'.)
+            redundant[(x, b, w)]      = redundancy.load(x_location(args) / x / 'workloads' / b / w)
         if not l_path.exists():
             continue
         with open(l_path, 'r') as f:
@@ -370,15 +783,22 @@ def get_benchmark_execution_plan(args):
                         if (Path(dir1) / execution / 'FAILURE').exists():
                             continue # The refactoring could not be applied.
                         for configuration in configurations[(x, b, w)]:
-                            stats_c = Path(dir1) / execution / 'stats' / configuration.params_id()
+                            stats_c = Path(dir1) / execution / get_measurement_folder(args) / configuration.params_id()
                             key     = (b, opportunity, refactoring, execution, configuration.params_id())
+                            if configuration.params_id() in redundant[(x, b, w)] and not redundancy.is_sampled(key, args.redundant_rate):
+                                continue
                             # NOTE: 'key' MUST NOT include 'x' because refactorings of a
                             #        benchmark can be shared between experiments.
                             # NOTE:  Opportunities and refactorings can be shared between
                             #        benchmark workloads. We separate their measurements
                             #        by including the workload name in the configuration.
                             #        Therefore, 'params_id' must depend on the workload.
-                            if not stats_c.exists() and not key in keys:
+                            # NOTE:  When coordinating with other hosts, measurements that
+                            #        were started but never completed are included once their
+                            #        lease has expired (e.g., the host crashed).
+                            # NOTE:  Measurements taken on a noisy machine are included again.
+                            is_pending = not stats_c.exists() or (args.lease and is_reclaimable(stats_c, args.lease_duration)) or (not args.lease and is_noisy(stats_c))
+                            if is_pending and not key in keys:
                                 # Here we can include 'x' in the result. ('w' is not needed.)
                                 plan.append((x, b, opportunity, refactoring, execution, configuration))
                                 keys.add(key)
@@ -418,9 +838,7 @@ def benchmark_2(args):
     for (x, bm, opportunity, refactoring, execution, configuration) in get_benchmark_execution_plan(args):
         b  = configuration.bm()
         w  = configuration.bm_workload()
-        id = opportunity_cache.RefactoringDescriptor.load(
-            x_location(args) / 'data' / bm / opportunity / refactoring / 'descriptor.txt'
-        ).refactoring_id()
+        id = get_refactoring_type(args, bm, opportunity, refactoring)
         if not (b, w) in refactorings:
             refactorings[(b, w)] = dict()
         rs = refactorings[(b, w)]
@@ -442,12 +860,11 @@ def benchmark_2(args):
                 # random.Random(0).shuffle(refactorings)
             print(f"Refactorings {b} {w} type={ref_id} nopp={opp_count}, nref={ref_count}")
 
-    tz_europe_stockholm = zoneinfo.ZoneInfo('Europe/Stockholm')
+    logfile = get_benchmarking_log()
 
-    logfile = 'benchmarking.log'
-    if not Path(logfile).exists():
-        with open(logfile, 'w') as f:
-            pass # Create
+    if args.adaptive:
+        benchmark_adaptive(args, refactorings, logfile, n)
+        return
 
     types = [ t for t in sorted(types) ]
     ti    = 0
@@ -481,42 +898,257 @@ def benchmark_2(args):
 
         ti = (ti + 1) % len(types)                  # Update type index for next iteration.
         random.Random().shuffle(selection)          # Unseeded to get a random order of execution within the batch.
-        for (x, bm, opportunity, refactoring, execution, configuration) in selection:
+        for item in selection:
+            if benchmark_plan_item(args, item, logfile, f"({k+1}/{n})"):
+                k = k + 1
+            if k >= n:
+                break
+
+# Screen the execution plan in groups of refactorings that patch disjoint
+# files. Groups without effect are not decomposed. See 'screening.py'.
+def screen(args):
+    baseline = planner.load_baseline(args.baseline)
+    logfile  = get_benchmarking_log()
+
+    candidates = dict() # { (<x>, <bm>, <params_id>) : [ (<item>, <touched files>) ] }
+    for item in get_benchmark_execution_plan(args):
+        (x, bm, opportunity, refactoring, execution, configuration) = item
+        data_location = get_data_location(args, item)
+        if screening.is_screened(data_location, configuration.params_id()):
+            continue
+        candidates.setdefault((x, bm, configuration.params_id()), []).append(
+            (item, screening.get_touched_files(data_location))
+        )
+
+    k = 0
+    for (x, bm, params_id), items in candidates.items():
+        configuration = items[0][0][-1]
+        if confirmation.get_baseline(baseline, configuration) is None:
+            print(f"Skipping configuration without baseline: {bm} {configuration.bm_workload()} {params_id}")
+            continue
+        for group in screening.form_groups(items, args.group_size):
+            if k >= args.n:
+                return
+            print(f"Screen group ({k+1}/{args.n}) of {len(group)} refactorings: {bm} {configuration.bm_workload()} {params_id}")
+            screen_group(args, x, configuration, group, baseline, logfile)
+            k = k + 1
+
+def get_data_location(args, item):
+    (x, bm, opportunity, refactoring, execution, configuration) = item
+    return x_location(args) / 'data' / bm / opportunity / refactoring / execution
+
+def screen_group(args, x, configuration, group, baseline, logfile):
+    if len(group) == 1:
+        benchmark_plan_item(args, group[0], logfile, "(screened)")
+        return
+
+    locations = [ get_data_location(args, item) for item in group ]
+    members   = [ location.relative_to(x_location(args) / 'data') for location in locations ]
+    group_id  = screening.get_group_id(members)
+    store     = x_location(args) / x / 'screening' / configuration.bm() / configuration.params_id() / group_id
 
-            data_location = Path(os.getcwd()) / x_location(args) / 'data' / bm / opportunity / refactoring / execution
+    status = screening.load_group_status(store)
+    if status is None:
+        status = build_and_benchmark_group(args, x, configuration, locations, members, store, baseline)
 
-            # Scan 'stats' folder for failures before spending time (re-)compiling a case that have already been proven to fail.
-            # Note: We perform the test here since we may not have any proof when the benchmark execution plan is created.
+    print(f"Group {group_id} of {len(group)} refactorings: {status}")
+    if status == screening.NULL:
+        for location in locations:
+            screening.mark_null(location, configuration.params_id(), group_id)
+        return
+    for half in screening.split(group):
+        screen_group(args, x, configuration, half, baseline, logfile)
 
-            is_failure = False
-            for dir, folders, files in os.walk(data_location / 'stats'):
-                for cid in folders:
-                    if (Path(dir) / cid / 'FAILURE').exists():
-                        is_failure = True
-                        break
+def build_and_benchmark_group(args, x, configuration, locations, members, store, baseline):
+    mean, std = confirmation.get_baseline(baseline, configuration)
+    try:
+        with tempfile.TemporaryDirectory(delete = True, dir = 'temp') as location:
+            import_dir = Path(location)
+            deploy_dir = Path(location) / 'deployment'
+            deploy_dir.mkdir()
+            prime_import_location(args, x, configuration, import_dir, locations)
+            bm_script.deploy_benchmark(configuration, True, deploy_dir, import_dir)
+            exectime = int(bm_script.run_benchmark(configuration, deploy_dir, False, None))
+    except AttributeError as e:
+        raise e
+    except TypeError as e:
+        raise e
+    except Exception as e:
+        log.warning("Group benchmark failed: %s", str(e)[:200])
+        screening.store_group(store, members, screening.FAILED)
+        return screening.FAILED
+    status = screening.get_status(exectime, mean, std, args.screen_threshold)
+    screening.store_group(store, members, status, exectime)
+    return status
+
+# Select refactorings one at a time from the (<type>, <bm>, <workload>)
+# whose measured effects are most extreme or uncertain, instead of cycling
+# through types. See 'allocation.py'.
+#
+# Selected refactorings are removed from the plan. To not lose them (and
+# skew the allocation) while the machine is noisy, the run stops instead,
+# and the remaining refactorings are picked up by a later run. Refactorings
+# that are known to fail, or leased by another host, are removed since they
+# will not be measured by this host. Effects measured by other hosts are
+# included by later runs.
+def benchmark_adaptive(args, refactorings, logfile, n):
+    baseline  = planner.load_baseline(args.baseline)
+    allocator = allocation.Allocator(
+        allocation.load_effects(x_location(args) / 'data', baseline),
+        args.min_share
+    )
+    k = 0
+    while k < n:
+        if is_quiet_machine_required(args):
+            reasons = environment.wait_until_quiet(get_noise_thresholds(args), args.quiet_wait)
+            if len(reasons) > 0:
+                print(f"Stopping on noisy machine ({'; '.join(reasons)})")
                 break
+        arms = [ (type, b, w) for (b, w), rs in refactorings.items() for type in rs.keys() ]
+        arm  = allocator.select(arms)
+        if arm is None:
+            print("No more benchmarks to run.")
+            break
+        (type, b, w) = arm
+        oppmap = refactorings[(b, w)][type]
+        oid    = list(oppmap.keys())[randrange(len(oppmap))]
+        opps   = oppmap[oid]
+        item   = opps.pop(randrange(len(opps)))
+        if len(opps) == 0:
+            del oppmap[oid]
+            if len(oppmap) == 0:
+                del refactorings[(b, w)][type]
+
+        print(f"Select refactoring: {b} {w} type={type} {oid} {item[-1].id()}")
+        if not benchmark_plan_item(args, item, logfile, f"({k+1}/{n})"):
+            continue
+        k = k + 1
+
+        (x, bm, opportunity, refactoring, execution, configuration) = item
+        store = x_location(args) / 'data' / bm / opportunity / refactoring / execution / get_measurement_folder(args) / configuration.params_id()
+        allocator.add(arm, allocation.get_effect(store, baseline))
+
+# Benchmark the execution plan within a wall-clock budget. Items are ordered
+# by estimated cost (see 'planner.py') so that the most valuable items
+# complete first, instead of being cut off at random when the run is killed.
+def benchmark_budgeted(args):
+    budget  = planner.parse_budget(args.budget)
+    logfile = get_benchmarking_log()
+    model   = planner.CostModel(
+        planner.load_durations(logfile),
+        planner.load_baseline(args.baseline),
+        runs = max(1, 2 * args.paired)
+    )
 
-            if is_failure:
-                print(f"Skipping failed case: {data_location}")
-                continue
+    items = []
+    for item in get_benchmark_execution_plan(args):
+        (x, bm, opportunity, refactoring, execution, configuration) = item
+        type = get_refactoring_type(args, bm, opportunity, refactoring)
+        items.append((type, model.estimate(configuration), item))
+
+    plan = planner.order_items(items, budget, args.objective)
+    if args.n > 0:
+        plan = plan[:args.n]
+
+    print(f"Planned {len(plan)} of {len(items)} benchmarks within {planner.format_seconds(budget)} (objective={args.objective})")
+    for type in sorted(set([ t for (t, cost, item) in plan ])):
+        count = len([ t for (t, cost, item) in plan if t == type ])
+        print(f"Planned type={type} n={count}")
+
+    progress = planner.Progress(plan, budget)
+    for i, (type, cost, item) in enumerate(plan):
+        if progress.is_over_budget(cost):
+            print(f"Skipping case that would exceed the budget (~{planner.format_seconds(cost)}): {item[-1].id()}")
+            progress.skipped(cost)
+            continue
+        t0 = datetime.datetime.now()
+        if benchmark_plan_item(args, item, logfile, f"({i+1}/{len(plan)}, ~{planner.format_seconds(cost)})"):
+            progress.done(cost, (datetime.datetime.now() - t0).total_seconds())
+        else:
+            progress.skipped(cost)
+        print(progress.report())
 
-            print()
-            print(f"Benchmark ({k+1}/{n}) {data_location}")
-            print()
+def get_refactoring_type(args, bm, opportunity, refactoring):
+    return opportunity_cache.RefactoringDescriptor.load(
+        x_location(args) / 'data' / bm / opportunity / refactoring / 'descriptor.txt'
+    ).refactoring_id()
 
-            enable_jfr = False
+_tz_europe_stockholm = zoneinfo.ZoneInfo('Europe/Stockholm')
 
-            t0 = datetime.datetime.now()
+def get_benchmarking_log():
+    logfile = 'benchmarking.log'
+    if not Path(logfile).exists():
+        with open(logfile, 'w') as f:
+            pass # Create
+    return logfile
+
+# Build and benchmark a single execution plan item, unless it is known to
+# fail, needs more CPUs than available, or another host has claimed it.
+# Returns True if the item was benchmarked.
+def benchmark_plan_item(args, item, logfile, label):
+    (x, bm, opportunity, refactoring, execution, configuration) = item
+
+    data_location = Path(os.getcwd()) / x_location(args) / 'data' / bm / opportunity / refactoring / execution
+
+    # Scan 'stats' folder for failures before spending time (re-)compiling a case that have already been proven to fail.
+    # Note: We perform the test here since we may not have any proof when the benchmark execution plan is created.
+
+    is_failure = False
+    for folder in set(['stats', get_measurement_folder(args)]):
+        for dir, folders, files in os.walk(data_location / folder):
+            for cid in folders:
+                if (Path(dir) / cid / 'FAILURE').exists():
+                    is_failure = True
+                    break
+            break
+
+    if is_failure:
+        print(f"Skipping failed case: {data_location}")
+        return False
+
+    print()
+    print(f"Benchmark {label} {data_location}")
+    print()
+
+    if not has_available_cpus(configuration):
+        return False
+
+    # Claim the measurement so that other hosts working on the same
+    # data directory skip it. Other hosts may also have completed it
+    # since the execution plan was created.
+    lease = None
+    if args.lease:
+        store = data_location / get_measurement_folder(args) / configuration.params_id()
+        lease = leases.Lease(get_lease_path(store), args.lease_duration)
+        if not lease.acquire():
+            print(f"Skipping case leased by another host: {store}")
+            return False
+        if is_measured(store):
+            print(f"Skipping case measured by another host: {store}")
+            lease.release()
+            return False
+        lease.start_heartbeat()
+
+    enable_jfr = False
+
+    try:
+        t0 = datetime.datetime.now()
+        if args.paired > 0:
+            build_and_benchmark_paired(args, x, configuration, data_location, args.paired)
+        else:
             build_and_benchmark(args, x, configuration, data_location, enable_jfr)
-            t1 = datetime.datetime.now()
+        t1 = datetime.datetime.now()
+    finally:
+        if not lease is None:
+            lease.release()
 
-            with open(logfile, 'a') as f:
-                time = datetime.datetime.now(tz = tz_europe_stockholm)
-                f.write(f"{time}: duration: {t1-t0} {data_location}" + os.linesep)
+    # The configuration is logged so that durations can be used to estimate
+    # the cost of benchmarking other refactorings. (See 'planner.py'.)
+    with open(logfile, 'a') as f:
+        time = datetime.datetime.now(tz = _tz_europe_stockholm)
+        f.write(f"{time}: duration: {t1-t0} {data_location} {configuration.params_id()}" + os.linesep)
 
-            k = k + 1
-            if k >= n:
-                break
+    return True
 
 # Print result objects to stdout.
 # See 'results.py' for CSV files and statistics.
@@ -551,6 +1183,34 @@ def print_execution_plan(args):
     for (x, bm, opportunity, refactoring, execution, configuration) in get_benchmark_execution_plan(args):
         print(bm, opportunity, refactoring, execution, configuration._values)
 
+# Arguments used by 'build_and_benchmark()'. Shared with other scripts
+# that measure through the same pipeline.
+def add_measurement_arguments(parser):
+    parser.add_argument('--sibling-failure-threshold', required = False, type = int, default = sibling_failures.DEFAULT_THRESHOLD,
+        help = "Skip parameter variants of an opportunity once this many variants have failed for the same reason. Use 0 to disable.")
+    parser.add_argument('--max-load', required = False, type = float, default = None,
+        help = "Do not start benchmarks while the 1-minute load average is above this value")
+    parser.add_argument('--max-temperature', required = False, type = float, default = None,
+        help = "Do not start benchmarks while any thermal zone is above this temperature (Celsius)")
+    parser.add_argument('--exclusive', required = False, action = 'store_true',
+        help = "Do not start benchmarks while other JVMs are running")
+    parser.add_argument('--governor', required = False, default = None,
+        help = "Do not start benchmarks unless all CPUs use this frequency governor (e.g. 'performance')")
+    parser.add_argument('--smoke', required = False, action = 'store_true',
+        help = "Validate refactored deployments with a single run on the smoke workload (see '--smoke-workload') before measuring them")
+    parser.add_argument('--smoke-workload', required = False, default = None,
+        help = "Workload used to validate refactored deployments. Defaults to the smallest valid workload of the benchmark. Benchmarks without this workload are not smoke tested.")
+    parser.add_argument('--confirm-forks', required = False, type = int, default = 0,
+        help = "Re-run outliers against the baseline (see '--baseline') for the specified number of forks and record whether they are confirmed or refuted")
+    parser.add_argument('--confirm-threshold', required = False, type = float, default = confirmation.DEFAULT_THRESHOLD,
+        help = "Baseline standard deviations beyond which a measurement is an outlier.")
+    parser.add_argument('--gc-log', required = False, action = 'store_true',
+        help = "Log GC (JDK 9+) and record GC pauses, GC CPU time and heap after GC in 'metrics.txt' (measured iteration) and 'gc.json' (all iterations)")
+    parser.add_argument('--jit-diff', required = False, action = 'store_true',
+        help = "Run measured refactorings, and the baseline, again with JIT compilations and inlining printed, and store their differences for the patched classes in 'jit.json'")
+    parser.add_argument('--quiet-wait', required = False, type = int, default = 300,
+        help = "Seconds to wait for a quiet machine before skipping a benchmark")
+
 # Return [(x, b, w, l, p)] filtered by specified arguments.
 def get_arg_xbwlp_items(args):
     # An empty set means "include all".
@@ -627,6 +1287,34 @@ if __name__ == '__main__':
         help = "Benchmark refactoring(s)")
     parser.add_argument('--n', required = False, type = int, default = 1,
         help = "The number of refactorings or benchmarks to run.")
+    parser.add_argument('--adaptive', required = False, action = 'store_true',
+        help = "Favor refactoring types and workloads whose measured effects are most extreme or uncertain, instead of cycling through types")
+    parser.add_argument('--min-share', required = False, type = float, default = allocation.DEFAULT_MIN_SHARE,
+        help = "Minimum share of benchmarks of each refactoring type in adaptive mode, relative to round-robin allocation (0 to 1).")
+    parser.add_argument('--screen', required = False, action = 'store_true',
+        help = "Screen refactorings in groups that patch disjoint files, and only decompose groups with an effect against the baseline (see '--baseline'). '--n' is the number of groups.")
+    parser.add_argument('--group-size', required = False, type = int, default = screening.DEFAULT_GROUP_SIZE,
+        help = "Maximum number of refactorings in a screening group.")
+    parser.add_argument('--screen-threshold', required = False, type = float, default = screening.DEFAULT_THRESHOLD,
+        help = "Baseline standard deviations beyond which a group has an effect.")
+    parser.add_argument('--representative-workloads', required = False, action = 'store_true',
+        help = "Only benchmark the representative workload of each cluster of similar workloads found by 'cluster_workloads.py'")
+    parser.add_argument('--redundant-rate', required = False, type = float, default = redundancy.DEFAULT_RATE,
+        help = "Fraction of refactorings benchmarked with configurations found to be redundant by 'prune_configurations.py'. Defaults to all.")
+    parser.add_argument('--budget', required = False, default = None,
+        help = "Benchmark within a wall-clock budget (e.g. '8h' or '90m'), ordering benchmarks by their estimated cost. '--n' limits the number of benchmarks if positive.")
+    parser.add_argument('--objective', required = False, default = planner.COUNT, choices = planner.OBJECTIVES,
+        help = "What to maximize within the budget: the number of completed benchmarks ('count') or the number of benchmarks of the least covered refactoring type ('coverage').")
+    parser.add_argument('--baseline', required = False, default = 'baseline.txt',
+        help = "Baseline file used to estimate the cost (see '--budget') and effect (see '--adaptive') of benchmarks. Defaults to 'baseline.txt'.")
+    parser.add_argument('--paired', required = False, type = int, default = 0,
+        help = "Measure refactorings in paired mode: alternate the specified number of forks of the unrefactored and refactored benchmark")
+    parser.add_argument('--lease', required = False, action = 'store_true',
+        help = "Claim benchmarks using lease files in the data directory to coordinate with other hosts sharing it")
+    parser.add_argument('--lease-duration', required = False, type = int, default = leases.DEFAULT_DURATION,
+        help = "Seconds before a lease that is not renewed expires and its benchmark can be reclaimed.")
+
+    add_measurement_arguments(parser)
 
     # Print/Show options.
     parser.add_argument('--show-configurations', required = False, action = 'store_true',
@@ -657,6 +1345,10 @@ if __name__ == '__main__':
 
     if args.create:
         create(args)
+    elif args.benchmark and args.screen:
+        screen(args)
+    elif args.benchmark and args.budget is not None:
+        benchmark_budgeted(args)
     elif args.benchmark:
         benchmark_2(args)
     elif args.refactor:
@@ -0,0 +1,81 @@
+#!/bin/env python3
+
+import argparse
+import tempfile
+
+from pathlib    import Path
+from subprocess import TimeoutExpired
+
+import evaluation
+import heap_sizes
+import run_benchmark as bm_script
+
+from configuration import Configuration
+
+# Find the minimum heap size at which each workload passes under each JRE
+# (and JVM option set), and store it in 'min_heap.txt'. Measurements can
+# then use multiples of the minimum heap size (e.g. 'heap_size = 2x, 4x').
+# (See 'heap_sizes.py'.)
+#
+# Usage:
+#   ./find_min_heap.py [--data <data=experiments>] [--bs <bs>] [--ws <ws>] [--max <MB>]
+
+def passes(configuration, deploy_dir, megabytes, iterations):
+    candidate = Configuration().init_from_dict(configuration.to_dict())
+    candidate.heap_size(f"{megabytes}M")
+    try:
+        bm_script.run_benchmark(candidate, deploy_dir, False, None, iterations = iterations)
+        print(f"Heap {megabytes}M: passed")
+        return True
+    except TimeoutExpired as e:
+        print(f"Heap {megabytes}M: timed out")
+    except ValueError as e:
+        print(f"Heap {megabytes}M: failed")
+    return False
+
+def find_min_heaps(args):
+    min_heaps = heap_sizes.load(args.out)
+    for x, b, w in evaluation.get_arg_xbw_items(args):
+        for configuration in evaluation.get_valid_configurations_of(args, x, b, w):
+            key = heap_sizes.get_key(configuration)
+            if key in min_heaps and not args.force:
+                continue
+            print()
+            print(f"Find minimum heap size of {key}")
+            print()
+            with tempfile.TemporaryDirectory(delete = True, dir = 'temp') as location:
+                deploy_dir = Path(location)
+                bm_script.deploy_benchmark(configuration, True, deploy_dir, None)
+                min_heaps[key] = heap_sizes.search(
+                    lambda megabytes: passes(configuration, deploy_dir, megabytes, args.iterations),
+                    args.min,
+                    args.max,
+                    args.tolerance
+                )
+            print(f"Minimum heap size of {key}: {min_heaps[key]}M")
+            heap_sizes.store(min_heaps, args.out)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--xs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified experiments")
+    parser.add_argument('--bs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified benchmarks")
+    parser.add_argument('--ws', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified workloads")
+    parser.add_argument('--data', required = False, default = 'experiments',
+        help = "Location where experiments are stored. Defaults to 'experiments'.")
+    parser.add_argument('--out', required = False, default = 'min_heap.txt',
+        help = "File where minimum heap sizes are stored. Defaults to 'min_heap.txt'.")
+    parser.add_argument('--min', required = False, type = int, default = 8,
+        help = "Lower bound of the search in megabytes.")
+    parser.add_argument('--max', required = False, type = int, default = 8192,
+        help = "Upper bound of the search in megabytes.")
+    parser.add_argument('--tolerance', required = False, type = int, default = 8,
+        help = "Precision of the search in megabytes.")
+    parser.add_argument('--iterations', required = False, type = int, default = 10,
+        help = "Harness iterations per run. Use the number of iterations of measurements, since the heap also has to hold state retained between iterations.")
+    parser.add_argument('--force', required = False, action = 'store_true',
+        help = "Search again for workloads with a known minimum heap size")
+    args = parser.parse_args()
+    find_min_heaps(args)
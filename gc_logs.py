@@ -0,0 +1,105 @@
+import json
+import os
+import re
+
+from configuration import Metrics
+
+# Parse unified GC logs ('-Xlog:gc*', JDK 9+) into per-iteration statistics.
+#
+# Log lines are decorated with the wall-clock time in milliseconds so that
+# GC events can be attributed to the harness iterations that they occurred
+# in (see 'HarnessOutputMonitor' in 'run_benchmark.py'). Events before the
+# first iteration (JVM startup) are ignored.
+#
+# Per-iteration GC statistics json object (times in ms, sizes in kB):
+# [ { 'pauses' : int, 'pause_time' : float, 'max_pause' : float, 'cpu_time' : float, 'heap_after' : int } ]
+
+DECORATORS = 'timemillis,tags'
+
+_line_pattern  = re.compile('^\\[(\\d+)ms\\]\\[([^\\]]*)\\]\\s*(.*)$')
+
+# 'GC(0) Pause Young (Normal) (G1 Evacuation Pause) 24M->4M(256M) 5.123ms' (Serial, Parallel, G1, Shenandoah)
+# 'GC(0) Pause Mark Start 0.010ms' (ZGC, logged with the 'gc,phases' tags)
+# 'GC(0) y: Pause Mark Start 0.011ms' (generational ZGC)
+_pause_pattern = re.compile('^GC\\(\\d+\\) (?:\\w+: )?Pause .* (\\d+(?:\\.\\d+)?)ms$')
+_pause_tags    = { 'gc', 'gc,phases' }
+
+# '24M->4M(256M)' or '42M(1%)->28M(1%)'
+_heap_pattern  = re.compile('(\\d+)([KMG])(?:\\(\\d+%\\))?->(\\d+)([KMG])')
+
+# 'GC(0) User=0.02s Sys=0.00s Real=0.01s'
+_cpu_pattern   = re.compile('^GC\\(\\d+\\) User=(\\d+(?:\\.\\d+)?)s Sys=(\\d+(?:\\.\\d+)?)s')
+
+_kilobytes = { 'K' : 1, 'M' : 1024, 'G' : 1024 * 1024 }
+
+def get_log_option(file):
+    return f"-Xlog:gc*:file={file}:{DECORATORS}"
+
+# Unified logging is not available before JDK 9.
+def is_supported(configuration):
+    jre = configuration.jre()
+    return int(jre[:jre.find('.')]) >= 9
+
+# Return [(<time ms>, <kind>, <value>)] where kind is 'pause' (ms), 'heap_after' (kB) or 'cpu' (ms).
+def parse(lines):
+    events = []
+    for line in lines:
+        match = _line_pattern.match(line.strip())
+        if not match:
+            continue
+        time    = int(match.group(1))
+        tags    = match.group(2).strip()
+        message = match.group(3)
+        pause   = _pause_pattern.match(message) if tags in _pause_tags else None
+        if pause:
+            events.append((time, 'pause', float(pause.group(1))))
+        heap = _heap_pattern.search(message) if tags == 'gc' else None
+        if heap:
+            events.append((time, 'heap_after', int(heap.group(3)) * _kilobytes[heap.group(4)]))
+        cpu = _cpu_pattern.match(message) if tags == 'gc,cpu' else None
+        if cpu:
+            events.append((time, 'cpu', (float(cpu.group(1)) + float(cpu.group(2))) * 1000))
+    return events
+
+def load(file):
+    with open(file, 'r', errors = 'replace') as f:
+        return parse(f)
+
+# Attribute events to the iterations starting at the specified wall-clock
+# times (ms). The last iteration includes everything until JVM exit.
+def summarize(events, iteration_starts):
+    iterations = [ { 'pauses' : 0, 'pause_time' : 0.0, 'max_pause' : 0.0, 'cpu_time' : 0.0, 'heap_after' : None } for _ in iteration_starts ]
+    for time, kind, value in events:
+        i = sum(1 for start in iteration_starts if start <= time) - 1
+        if i < 0:
+            continue # JVM startup.
+        iteration = iterations[i]
+        if kind == 'pause':
+            iteration['pauses']     = iteration['pauses'] + 1
+            iteration['pause_time'] = iteration['pause_time'] + value
+            iteration['max_pause']  = max(iteration['max_pause'], value)
+        elif kind == 'cpu':
+            iteration['cpu_time']   = iteration['cpu_time'] + value
+        elif kind == 'heap_after':
+            # The largest heap after GC approximates the live set of the iteration.
+            iteration['heap_after'] = max(iteration['heap_after'] or 0, value)
+    return iterations
+
+def store(iterations, file):
+    with open(file, 'w') as f:
+        f.write(json.dumps(iterations, indent = 4) + os.linesep)
+
+# Metrics of the measured (last) iteration, like 'EXECUTION_TIME'.
+def get_metrics(iterations):
+    if len(iterations) == 0:
+        return dict()
+    iteration = iterations[-1]
+    metrics   = {
+        Metrics.GC_PAUSES     : str(iteration['pauses']),
+        Metrics.GC_PAUSE_TIME : str(round(iteration['pause_time'], 3)),
+        Metrics.GC_MAX_PAUSE  : str(round(iteration['max_pause'], 3)),
+        Metrics.GC_CPU_TIME   : str(round(iteration['cpu_time'], 3))
+    }
+    if not iteration['heap_after'] is None:
+        metrics[Metrics.GC_HEAP_AFTER] = str(iteration['heap_after'])
+    return metrics
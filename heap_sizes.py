@@ -0,0 +1,65 @@
+import json
+import os
+import re
+
+from pathlib import Path
+
+# Minimum heap sizes per workload and JRE, found by 'find_min_heap.py'.
+# Heap sizes can be configured as multiples of the minimum heap size,
+# e.g. 'heap_size = 2x, 4x', to control memory pressure across workloads.
+#
+# Minimum heap sizes json object (megabytes):
+# { '<bm>-<workload>-<jre>[-<jvm_options>]' : int }
+
+_min_heap_path = Path('min_heap.txt')
+
+multiple_pattern = re.compile('^(\\d+(?:\\.\\d+)?)[xX]$')
+
+# The JVM option set is included since it may select a different GC.
+def get_key(configuration):
+    parts = [ configuration.bm(), configuration.bm_workload(), configuration.jre() ]
+    if configuration.jvm_options() != None:
+        parts.append(configuration.jvm_options())
+    return '-'.join(parts)
+
+def load(file = None):
+    file = Path(file) if not file is None else _min_heap_path
+    if not file.exists():
+        return dict()
+    with open(file, 'r') as f:
+        return json.load(f)
+
+def store(min_heaps, file = None):
+    file = Path(file) if not file is None else _min_heap_path
+    with open(file, 'w') as f:
+        f.write(json.dumps(min_heaps, indent = 4, sort_keys = True) + os.linesep)
+
+def is_multiple(heap_size):
+    return heap_size != None and multiple_pattern.match(heap_size) != None
+
+# Resolve the configured heap size to a '-Xmx' value. Multiples of the
+# minimum heap size require that it has been found for the configuration.
+def resolve(configuration, min_heaps = None):
+    heap_size = configuration.heap_size()
+    if not is_multiple(heap_size):
+        return heap_size
+    min_heaps = min_heaps if not min_heaps is None else load()
+    key       = get_key(configuration)
+    if not key in min_heaps:
+        raise ValueError(f"Minimum heap size of '{key}' not found in '{_min_heap_path}'. Please run './find_min_heap.py'.")
+    factor = float(multiple_pattern.match(heap_size).group(1))
+    return f"{int(round(factor * int(min_heaps[key])))}M"
+
+# Binary search for the smallest heap size (in megabytes) within [low, high]
+# for which 'passes(<megabytes>)' returns True, within 'tolerance' megabytes.
+# Assumes that larger heaps pass if smaller heaps pass.
+def search(passes, low, high, tolerance = 8):
+    if not passes(high):
+        raise ValueError("Benchmark does not pass with the maximum heap size", high)
+    while high - low > tolerance:
+        middle = (low + high) // 2
+        if passes(middle):
+            high = middle
+        else:
+            low  = middle
+    return high
@@ -0,0 +1,118 @@
+import json
+import os
+import re
+
+# Parse '-XX:+PrintCompilation -XX:+PrintInlining' output into a summary of
+# JIT compilations and inlining decisions, and diff the summaries of the
+# baseline and refactored deployments for the methods of the classes that
+# a refactoring touches. The output is printed by the JVM together with
+# the harness output (see 'run_benchmark.py').
+#
+# NOTE
+# Inlining decisions are printed after the compilation line of the method
+# that they are compiled into. Output of concurrent compiler threads may be
+# interleaved, so a few decisions can be attributed to the wrong method.
+#
+# HotSpot marks a compilation 'made not entrant' when it is deoptimized,
+# but also when it is replaced by a compilation at a higher tier, so the
+# 'not_entrant' count is not a deoptimization count.
+#
+# Summary json object (sizes are bytecode sizes):
+# {
+#   'methods'  : { '<class>::<method>' : { 'tier' : int, 'bytes' : int, 'compilations' : int, 'not_entrant' : int } },
+#   'inlining' : { '<class>::<method> (tier <tier>)' : { '<callee>' : '<decision>' } }
+# }
+
+OPTIONS = [
+    '-XX:+UnlockDiagnosticVMOptions',
+    '-XX:+PrintCompilation',
+    '-XX:+PrintInlining'
+]
+
+# '    112   12 %     4       org.jacop.core.IntVar::dom @ 12 (80 bytes)   made not entrant'
+_compilation_pattern = re.compile('^\\s*\\d+\\s+\\d+\\s+([%sbn!\\s]*?)\\s*(\\d)?\\s+(\\S+::\\S+?)(?: @ \\d+)?\\s+\\((\\d+) bytes\\)(.*)$')
+
+# '                              @ 12   java.lang.StringLatin1::hashCode (42 bytes)   inline (hot)'
+_inlining_pattern    = re.compile('^[\\s\\d%sbn!]*@ \\d+\\s+(\\S+::\\S+?)\\s+\\((\\d+) bytes\\)\\s+(.*)$')
+
+def _get_method(summary, method):
+    return summary['methods'].setdefault(method, { 'tier' : 0, 'bytes' : 0, 'compilations' : 0, 'not_entrant' : 0 })
+
+# A method is compiled at several tiers, each with its own inlining decisions.
+def _get_inlining_key(method, tier):
+    return f"{method} (tier {tier})"
+
+def parse(lines):
+    summary = { 'methods' : dict(), 'inlining' : dict() }
+    current = None # Method and tier of the last compilation line.
+    for line in lines:
+        match = _inlining_pattern.match(line)
+        if match:
+            if not current is None:
+                summary['inlining'].setdefault(current, dict())[match.group(1)] = match.group(3).strip()
+            continue
+        match = _compilation_pattern.match(line)
+        if not match:
+            continue
+        method = _get_method(summary, match.group(3))
+        if 'made not entrant' in match.group(5):
+            method['not_entrant'] = method['not_entrant'] + 1
+            continue
+        if 'made zombie' in match.group(5):
+            continue
+        current                = _get_inlining_key(match.group(3), int(match.group(2) or 0))
+        method['compilations'] = method['compilations'] + 1
+        method['bytes']        = int(match.group(4))
+        method['tier']         = max(method['tier'], int(match.group(2) or 0))
+    return summary
+
+def load(file):
+    with open(file, 'r') as f:
+        return json.load(f)
+
+def store(summary, file):
+    with open(file, 'w') as f:
+        f.write(json.dumps(summary, indent = 4, sort_keys = True) + os.linesep)
+
+# Class names ('org.jacop.core.IntVar') of the specified Java source files.
+def get_classes(source_files):
+    return { f[:-len('.java')].replace('/', '.') for f in source_files if f.endswith('.java') }
+
+# Methods of nested and anonymous classes, and lambdas, belong to the touched class.
+def is_touched(method, classes):
+    holder = method.split('::')[0]
+    return any(holder == c or holder.startswith(c + '$') for c in classes)
+
+# Compilation and 'made not entrant' counts depend on the timing of the
+# compiler threads, so methods only differ by their tier and size. Their
+# counts are reported with the differing methods.
+_compared = [ 'tier', 'bytes' ]
+
+def _is_different(b, r):
+    if b is None or r is None:
+        return not (b is None and r is None)
+    return any(b[k] != r[k] for k in _compared)
+
+# Return the differences between the baseline and the refactored summary
+# that involve methods of the specified classes:
+# {
+#   'methods'  : { '<method>' : { 'baseline' : <method> | None, 'refactored' : <method> | None } },
+#   'inlining' : { '<method> (tier <tier>) -> <callee>' : { 'baseline' : <decision> | None, 'refactored' : <decision> | None } }
+# }
+def diff(baseline, refactored, classes):
+    methods  = dict()
+    inlining = dict()
+    for method in set(baseline['methods'].keys()).union(refactored['methods'].keys()):
+        b = baseline['methods'].get(method)
+        r = refactored['methods'].get(method)
+        if is_touched(method, classes) and _is_different(b, r):
+            methods[method] = { 'baseline' : b, 'refactored' : r }
+    for method in set(baseline['inlining'].keys()).union(refactored['inlining'].keys()):
+        b_calls = baseline['inlining'].get(method, dict())
+        r_calls = refactored['inlining'].get(method, dict())
+        for callee in set(b_calls.keys()).union(r_calls.keys()):
+            b = b_calls.get(callee)
+            r = r_calls.get(callee)
+            if (is_touched(method, classes) or is_touched(callee, classes)) and b != r:
+                inlining[f"{method} -> {callee}"] = { 'baseline' : b, 'refactored' : r }
+    return { 'methods' : methods, 'inlining' : inlining }
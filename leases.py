@@ -0,0 +1,147 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+from pathlib import Path
+
+# Lease files let several hosts benchmark the same plan from a shared
+# data directory without a central service. A lease is claimed by
+# creating its file exclusively (O_CREAT | O_EXCL), which is atomic on
+# local file systems and on NFSv3+. A lease expires unless renewed, so
+# that work claimed by a crashed host is eventually reclaimed.
+#
+# Takeover of an expired lease is done by renaming the lease file to a
+# unique name (only one host can succeed) and then verifying that the
+# renamed file is the expired lease. If another host claimed the lease
+# in between, the lease is restored, and the takeover is abandoned.
+#
+# ATTENTION
+# Expiry times are wall-clock times. Hosts sharing a data directory
+# must have synchronized clocks (e.g., NTP).
+
+DEFAULT_DURATION = 3600 # Seconds.
+
+def _new_owner():
+    return ':'.join([socket.gethostname(), str(os.getpid()), uuid.uuid4().hex])
+
+class Lease:
+    def __init__(self, path, duration = DEFAULT_DURATION):
+        self._path      = Path(path)
+        self._duration  = duration
+        self._owner     = _new_owner()
+        self._heartbeat = None
+        self._stop      = threading.Event()
+
+    def path(self):
+        return self._path
+
+    def owner(self):
+        return self._owner
+
+    def _content(self):
+        return json.dumps({ 'owner' : self._owner, 'expires' : time.time() + self._duration }) + os.linesep
+
+    def _read(self, path):
+        try:
+            with open(path, 'r') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _is_expired(self, path):
+        lease = self._read(path)
+        if lease is None:
+            # The owner may have crashed between creating and writing the
+            # lease, or we are reading it while it is being written.
+            try:
+                return os.path.getmtime(path) + self._duration < time.time()
+            except OSError:
+                return False
+        return float(lease['expires']) < time.time()
+
+    def _create(self):
+        try:
+            fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            f.write(self._content())
+        return True
+
+    def _take_over(self):
+        expired = self._read(self._path)
+        if not self._is_expired(self._path):
+            return False
+        tombstone = self._path.with_name(self._path.name + '.' + self._owner.replace(':', '-'))
+        try:
+            os.rename(self._path, tombstone)
+        except FileNotFoundError:
+            return self._create() # Released or taken over by someone else in between.
+        try:
+            if not self._is_expired(tombstone) or self._read(tombstone) != expired:
+                # We renamed a lease that was claimed after we checked it. Restore it,
+                # unless yet another host has already claimed the lease again.
+                try:
+                    os.link(tombstone, self._path)
+                except FileExistsError:
+                    pass
+                return False
+            return self._create()
+        finally:
+            tombstone.unlink(missing_ok = True)
+
+    # Return True if the lease was acquired.
+    def acquire(self):
+        self._path.parent.mkdir(parents = True, exist_ok = True)
+        if self._create():
+            return True
+        return self._take_over()
+
+    def is_held(self):
+        lease = self._read(self._path)
+        return not lease is None and lease['owner'] == self._owner
+
+    def renew(self):
+        if not self.is_held():
+            raise ValueError("Lease is not held", str(self._path))
+        temp = self._path.with_name(self._path.name + '.' + self._owner.replace(':', '-') + '.renew')
+        with open(temp, 'w') as f:
+            f.write(self._content())
+        os.replace(temp, self._path)
+
+    def release(self):
+        self.stop_heartbeat()
+        if self.is_held():
+            self._path.unlink(missing_ok = True)
+
+    # Renew the lease periodically (in a background thread) until released.
+    def start_heartbeat(self, interval = None):
+        if interval is None:
+            interval = self._duration / 3
+        def beat():
+            while not self._stop.wait(interval):
+                try:
+                    self.renew()
+                except Exception as e:
+                    print("Failed to renew lease", str(self._path), str(e))
+                    return
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target = beat, daemon = True)
+        self._heartbeat.start()
+
+    def stop_heartbeat(self):
+        if self._heartbeat is None:
+            return
+        self._stop.set()
+        self._heartbeat.join()
+        self._heartbeat = None
+
+# Return True if there is an unexpired lease at the specified path.
+def is_leased(path, duration = DEFAULT_DURATION):
+    path = Path(path)
+    if not path.exists():
+        return False
+    return not Lease(path, duration)._is_expired(path)
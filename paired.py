@@ -0,0 +1,72 @@
+import json
+import math
+import os
+import statistics
+
+# Paired A/B measurements: forks of the baseline (unrefactored) and the
+# refactored deployment alternate, and each pair is stored. Since both
+# forks of a pair run at almost the same time, machine drift cancels out
+# in the paired difference.
+
+BASELINE   = 'baseline'
+REFACTORED = 'refactored'
+
+# Alternate the order within pairs (AB, BA, AB, ...) to cancel out
+# effects of running first or second.
+def get_order(i):
+    return [BASELINE, REFACTORED] if i % 2 == 0 else [REFACTORED, BASELINE]
+
+class Pair:
+    def __init__(self, fork, order, baseline, refactored):
+        self.fork       = int(fork)
+        self.order      = list(order)
+        self.baseline   = int(baseline)
+        self.refactored = int(refactored)
+
+    def difference(self):
+        return self.refactored - self.baseline
+
+    # Speedup is defined as > 1 if speedup and < 1 if slowdown. (See 'plots.py'.)
+    def speedup(self):
+        return self.baseline / self.refactored
+
+    def to_dict(self):
+        return {
+            'fork'       : self.fork,
+            'order'      : self.order,
+            BASELINE     : self.baseline,
+            REFACTORED   : self.refactored
+        }
+
+    def append_to(self, file):
+        with open(file, 'a') as f:
+            f.write(json.dumps(self.to_dict(), sort_keys = True) + os.linesep)
+
+def load_pairs(file):
+    pairs = []
+    with open(file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line == '':
+                continue
+            d = json.loads(line)
+            pairs.append(Pair(d['fork'], d['order'], d[BASELINE], d[REFACTORED]))
+    return pairs
+
+def summarize(pairs):
+    n           = len(pairs)
+    differences = [ p.difference() for p in pairs ]
+    speedups    = [ p.speedup() for p in pairs ]
+    summary     = {
+        'n'               : n,
+        'baseline_mean'   : statistics.mean([ p.baseline for p in pairs ]),
+        'refactored_mean' : statistics.mean([ p.refactored for p in pairs ]),
+        'difference_mean' : statistics.mean(differences),
+        'speedup_mean'    : statistics.mean(speedups)
+    }
+    if n > 1:
+        std = statistics.stdev(differences)
+        summary['difference_std'] = std
+        summary['difference_se']  = std / math.sqrt(n)
+        summary['speedup_std']    = statistics.stdev(speedups)
+    return summary
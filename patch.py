@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import subprocess
 import tempfile
@@ -8,7 +9,7 @@ def apply_patch(patch, target_dir):
     if patch.exists():
         cmd = ' '.join([
             "patch",
-            "-p4",    # Removes: /tmp/<tmp>/new/
+            f"-p{_strip}",    # Removes: /tmp/<tmp>/new/
             "<",
             str(patch)
         ])
@@ -19,6 +20,23 @@ def apply_patch(patch, target_dir):
             cwd        = str(target_dir)
         )
 
+# Number of leading path components removed when the patch is applied. (See 'create_patch()'.)
+_strip = 4
+
+# Return the paths, relative to the directory that the patch is applied
+# in, of all files modified or created by the specified patch.
+def get_patched_files(patch):
+    files = []
+    with open(patch, 'r', errors = 'replace') as f:
+        for line in f:
+            if not line.startswith('+++ '):
+                continue
+            path  = line[4:].rstrip(os.linesep).split('\t')[0]
+            parts = path.split('/')[_strip:]
+            if len(parts) > 0:
+                files.append('/'.join(parts))
+    return files
+
 def create_patch(old, new, out):
     # We use the /tmp directory as root here
     # so that there is a known (fixed-length)
@@ -0,0 +1,196 @@
+import datetime
+import json
+import os
+import re
+import statistics
+
+from pathlib import Path
+
+# Time-budgeted benchmark planning. The cost of an execution plan item is
+# estimated from the durations logged in 'benchmarking.log' (see
+# 'evaluation.benchmark_plan_item()'), and items are ordered so that the
+# most valuable ones complete before the budget runs out.
+
+DEFAULT_BUILD_COST = 60     # Seconds. Used when nothing has been logged yet.
+DEFAULT_COST       = 120    # Seconds.
+ITERATIONS         = 10     # See 'run_benchmark.run_benchmark()'.
+
+COUNT    = 'count'          # Maximize the number of completed measurements.
+COVERAGE = 'coverage'       # Maximize the number of measurements of the least covered type.
+
+OBJECTIVES = [ COUNT, COVERAGE ]
+
+# '<time>: duration: [<d> day[s], ]<h>:<mm>:<ss>[.<us>] <data location>[ <params id>]'
+# The configuration id was added later. Older lines are attributed to the benchmark only.
+_log_pattern      = re.compile('^.*: duration: (?:(\\d+) days?, )?(\\d+):(\\d+):(\\d+(?:\\.\\d+)?) (\\S+)(?: (\\S+))?\\s*$')
+_budget_pattern   = re.compile('^(?:(\\d+)d)?(?:(\\d+)h)?(?:(\\d+)m)?(?:(\\d+)s?)?$')
+
+def parse_duration(days, hours, minutes, seconds):
+    return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+# Parse budgets such as '8h', '90m', '1h30m' or '3600' (seconds).
+def parse_budget(text):
+    match = _budget_pattern.match(text.strip())
+    if not match or not any(match.groups()):
+        raise ValueError("Invalid budget. Expected e.g. '8h', '90m', '1h30m' or seconds.", text)
+    d, h, m, s = [ int(g or 0) for g in match.groups() ]
+    return d * 86400 + h * 3600 + m * 60 + s
+
+# Returns [ (<bm>, <params id or None>, <seconds>) ] for all logged benchmark executions.
+def load_durations(logfile):
+    durations = []
+    if not Path(logfile).exists():
+        return durations
+    with open(logfile, 'r') as f:
+        for line in f:
+            match = _log_pattern.match(line)
+            if not match:
+                continue
+            days, hours, minutes, seconds, location, params_id = match.groups()
+            parts = Path(location).parts
+            if len(parts) < 5 or parts[-5] != 'data':
+                continue
+            durations.append((parts[-4], params_id, parse_duration(days, hours, minutes, seconds)))
+    return durations
+
+def load_baseline(file):
+    if file is None or not Path(file).exists():
+        return dict()
+    with open(file, 'r') as f:
+        return json.load(f)
+
+# Estimates the wall-clock cost (in seconds) of building and benchmarking
+# a configuration. The most specific information available is used:
+#
+#   1. Logged durations of the same configuration.
+#   2. Logged durations of the same benchmark.
+#   3. Build cost plus the baseline runtime of the configuration.
+#   4. Logged durations of any benchmark.
+#   5. 'DEFAULT_COST'.
+class CostModel:
+    def __init__(self, durations, baseline = dict(), runs = 1):
+        self.runs          = runs       # Benchmark executions per item (e.g. two per fork in paired mode).
+        self.baseline      = baseline
+        self.by_params_id  = dict()
+        self.by_bm         = dict()
+        self.all           = []
+        for bm, params_id, seconds in durations:
+            if not params_id is None:
+                self.by_params_id.setdefault(params_id, []).append(seconds)
+            self.by_bm.setdefault(bm, []).append(seconds)
+            self.all.append(seconds)
+
+    def build_cost(self):
+        # Logged durations include the baseline runtime, so this is an overestimate.
+        if len(self.all) > 0:
+            return min(self.all)
+        return DEFAULT_BUILD_COST
+
+    def baseline_cost(self, configuration):
+        key = '-'.join([configuration.bm(), configuration.bm_workload(), configuration.id()]) + '-mean'
+        if not key in self.baseline:
+            return None
+        return self.build_cost() + self.runs * ITERATIONS * float(self.baseline[key]) / 1000
+
+    def estimate(self, configuration):
+        if configuration.params_id() in self.by_params_id:
+            return statistics.median(self.by_params_id[configuration.params_id()])
+        if configuration.bm() in self.by_bm:
+            return statistics.median(self.by_bm[configuration.bm()])
+        cost = self.baseline_cost(configuration)
+        if not cost is None:
+            return cost
+        if len(self.all) > 0:
+            return statistics.median(self.all)
+        return DEFAULT_COST
+
+# Order items ([ (<type>, <cost>, <item>) ]) according to the objective and
+# drop items that cannot complete within the budget (in seconds, or None).
+#
+#   COUNT:    Shortest job first, which maximizes the number of completed items.
+#   COVERAGE: Repeatedly pick the cheapest item of the type with the fewest
+#             planned items, so that every type gets measurements early.
+def order_items(items, budget = None, objective = COUNT):
+    if not objective in OBJECTIVES:
+        raise ValueError("Unknown planning objective", objective, OBJECTIVES)
+
+    remaining = float('inf') if budget is None else budget
+    plan      = []
+
+    if objective == COUNT:
+        for t, cost, item in sorted(items, key = lambda i: i[1]):
+            if cost > remaining:
+                break
+            plan.append((t, cost, item))
+            remaining = remaining - cost
+        return plan
+
+    pending = dict() # { <type> : [ (<type>, <cost>, <item>) ] } cheapest first.
+    for i in sorted(items, key = lambda i: i[1]):
+        pending.setdefault(i[0], []).append(i)
+    counts = { t : 0 for t in pending.keys() }
+    while len(pending) > 0:
+        t = min(pending.keys(), key = lambda t: (counts[t], pending[t][0][1], t))
+        i = pending[t].pop(0)
+        if i[1] > remaining:
+            del pending[t]                          # Remaining items of this type are even more expensive.
+            continue
+        if len(pending[t]) == 0:
+            del pending[t]
+        plan.append(i)
+        counts[t] = counts[t] + 1
+        remaining = remaining - i[1]
+    return plan
+
+def format_seconds(seconds):
+    return str(datetime.timedelta(seconds = int(seconds)))
+
+# Tracks progress through a plan and estimates the time of completion.
+# Remaining estimates are scaled by the ratio between actual and estimated
+# cost of completed items, so that a poor cost model is corrected as the
+# run proceeds.
+class Progress:
+    def __init__(self, plan, budget = None, now = None):
+        self.budget    = budget
+        self.started   = now if not now is None else datetime.datetime.now()
+        self.remaining = sum([ cost for (t, cost, item) in plan ])
+        self.count     = len(plan)
+        self.completed = 0
+        self.estimated = 0.0    # Estimated cost of completed items.
+        self.actual    = 0.0    # Actual cost of completed items.
+
+    def done(self, cost, seconds):
+        self.completed = self.completed + 1
+        self.remaining = self.remaining - cost
+        self.estimated = self.estimated + cost
+        self.actual    = self.actual + seconds
+
+    def skipped(self, cost):
+        self.remaining = self.remaining - cost
+
+    def ratio(self):
+        if self.estimated <= 0:
+            return 1.0
+        return self.actual / self.estimated
+
+    def elapsed(self, now = None):
+        now = now if not now is None else datetime.datetime.now()
+        return (now - self.started).total_seconds()
+
+    def is_over_budget(self, cost, now = None):
+        if self.budget is None:
+            return False
+        return self.elapsed(now) + cost * self.ratio() > self.budget
+
+    def eta(self, now = None):
+        now = now if not now is None else datetime.datetime.now()
+        return now + datetime.timedelta(seconds = max(0, self.remaining) * self.ratio())
+
+    def report(self, now = None):
+        now     = now if not now is None else datetime.datetime.now()
+        elapsed = self.elapsed(now)
+        text    = f"Progress {self.completed}/{self.count}: elapsed {format_seconds(elapsed)}"
+        if not self.budget is None:
+            text = text + f", budget left {format_seconds(max(0, self.budget - elapsed))}"
+        text = text + f", remaining ~{format_seconds(max(0, self.remaining) * self.ratio())} (x{self.ratio():.2f}), ETA {self.eta(now).strftime('%Y-%m-%d %H:%M')}"
+        return text
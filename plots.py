@@ -12,6 +12,7 @@ import statsmodels.api as sm
 from statsmodels.formula.api import ols
 from pathlib                 import Path
 
+import baselines
 import experiment
 import math_helpers as mh
 from configuration     import Configuration, Metrics, RefactoringConfiguration, ConfigurationBase
@@ -322,8 +323,16 @@ class Plot:
             raise ValueError("Too many figures!")
 
 class Experiments:
-    def __init__(self, location):
-        self.location = Path(location)
+    def __init__(self, location, baseline_files = ['baseline.txt']):
+        self.location       = Path(location)
+        self.baseline_files = baseline_files
+        self._baselines     = None
+
+    # Baselines of all machines that measurements were taken on. (See 'baselines.py'.)
+    def get_baselines(self):
+        if self._baselines is None:
+            self._baselines = baselines.Baselines(self.baseline_files)
+        return self._baselines
 
     def get_experiments(self):
         for dir, xs, files in os.walk(self.location):
@@ -458,7 +467,6 @@ class Experiments:
 
         print("Compute", target_b, target_w, target_configuration, target_refactoring_id, target_refactoring_configuration)
 
-        baseline   = self.get_baseline()
         benchmarks = dict() # { (<refactoring id>, <refactoring config id>) : (refactoring_config, [<data path>], count) }
         for b in self.get_folders(self.location / 'data'):
             if target_b != None and b != target_b:
@@ -473,6 +481,8 @@ class Experiments:
 
                             if (instance_location / execution / 'stats' / configuration_id / 'FAILURE').exists():
                                 continue
+                            if (instance_location / execution / 'stats' / configuration_id / 'NOISY').exists():
+                                continue
                             
                             data_descriptor = RefactoringDescriptor.load(
                                 instance_location / 'descriptor.txt'
@@ -511,8 +521,8 @@ class Experiments:
                             bw_key                     = (data_configuration.bm(), data_configuration.bm_workload())
                             benchmarks[key][2][bw_key] = (benchmarks[key][2][bw_key] + 1) if bw_key in benchmarks[key][2] else 1
 
-                            baseline_key = '-'.join([data_configuration.bm(), data_configuration.bm_workload(), data_configuration.id()])
-                            benchmarks[key][1].append(int(data_metrics._values['EXECUTION_TIME']) / int(baseline[baseline_key]))
+                            fingerprint = baselines.load_fingerprint(instance_location / execution / 'stats' / configuration_id)
+                            benchmarks[key][1].append(int(data_metrics._values['EXECUTION_TIME']) / int(self.get_baselines().execution_time(data_configuration, fingerprint)))
         return [ Column(t, tc, data, count, constraints) for (t, tc_id), (tc, data, count) in benchmarks.items() ]
 
     def create_data_file(self, the_file):
@@ -526,6 +536,8 @@ class Experiments:
 
                             if (instance_location / execution / 'stats' / configuration_id / 'FAILURE').exists():
                                 continue
+                            if (instance_location / execution / 'stats' / configuration_id / 'NOISY').exists():
+                                continue
 
                             data_descriptor = RefactoringDescriptor.load(
                                 instance_location / 'descriptor.txt'
@@ -542,6 +554,7 @@ class Experiments:
                             w = data_configuration.bm_workload()
                             x = data_configuration
                             r = data_descriptor._params
+                            h = baselines.load_fingerprint(instance_location / execution / 'stats' / configuration_id)
 
                             the_file.write(json.dumps({
                                 'T' : { 'type' : t },
@@ -549,12 +562,12 @@ class Experiments:
                                 'W' : { 'name' : w },
                                 'X' : x._values,
                                 t   : r,
-                                'M' : data_metrics._values
+                                'M' : data_metrics._values,
+                                'H' : h
                             }) + os.linesep)
 
     def filter_data_file(self, path, filter, workload_filter):
         print("FILTER", filter)
-        baseline    = self.get_baseline()
         entries     = []
         coordinates = []
         with open(path, 'r') as f:
@@ -573,8 +586,7 @@ class Experiments:
                 if is_match and (workload_filter == None or (entry['B']['name'], entry['W']['name']) in workload_filter):
                     tms          = entry['M']['EXECUTION_TIME']
                     x            = Configuration().init_from_dict(entry['X'])
-                    baseline_key = '-'.join([x.bm(), x.bm_workload(), x.id()])
-                    speedup      =  int(baseline[baseline_key]) / int(tms) # Speedup is defined as > 1 if speedup, < 1 if no slowdown
+                    speedup      = self.get_baselines().speedup(x, tms, entry.get('H')) # Speedup is defined as > 1 if speedup, < 1 if no slowdown
                     #print(f"MATCH ({i})", entry['T']['type'], x.bm(), x.bm_workload())
                     entries.append((entry, speedup))
                     coordinates.append((len(coordinates), i))
@@ -1074,9 +1086,10 @@ class ANOVATable:
             entry['EXECUTION_TIME'] = float(speedup)
             results.append(entry)
 
-            for k in m.keys():
-                d_vars.add(k)
-                variables.add(k)
+            # Only the execution time is normalized against the baseline.
+            # (Resource usage metrics are analyzed by 'results.py'.)
+            d_vars.add(Metrics.EXECUTION_TIME)
+            variables.add(Metrics.EXECUTION_TIME)
 
             for k in x.keys():
                 i_vars.add(k)
@@ -1216,7 +1229,7 @@ def _plot_from_file(args):
     output_location       = Path(args.plots_out)
     table_output_location = Path(args.tables_out)
 
-    repo = Experiments(args.x_location)
+    repo = Experiments(args.x_location, args.baseline_files)
     file = Path(args.file)
 
     if not file.exists():
@@ -1668,7 +1681,7 @@ def _plot_from_file(args):
         plt.close()
 
 def _main(args):
-    repo = Experiments(args.x_location)
+    repo = Experiments(args.x_location, args.baseline_files)
     xbw  = repo.get_xbw()
 
     # Write all data to specified file.
@@ -1810,7 +1823,7 @@ if __name__ == '__main__':
     parser.add_argument('--print-btable', required = False, default = False, action = 'store_true',
         help = "Print baseline table to standard output.")
     parser.add_argument('--baseline-files', required = False, nargs = '+',  default = ['baseline.txt'],
-        help = "Baseline input files for --print-btable")
+        help = "Baseline input files for --print-btable, and baselines of the machines that measurements were taken on. Measurements from machines without baseline use the first file.")
     parser.add_argument('--baseline-out', required = False,
         help = "Baseline tables output folder.")
     parser.add_argument('--plots-out', required = False, default = 'figures',
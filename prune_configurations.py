@@ -0,0 +1,58 @@
+#!/bin/env python3
+
+import argparse
+
+import evaluation
+import planner
+import redundancy
+
+# Find configurations that are redundant per workload, based on the
+# baseline and on existing measurements, and store them for the planner.
+# (See 'redundancy.py'.)
+#
+# Usage:
+#   ./prune_configurations.py [--data <data=experiments>] [--bs <bs>] [--ws <ws>]
+#   ./evaluation.py --benchmark --n <n> --redundant-rate 0.1
+
+def prune(args):
+    baseline = planner.load_baseline(args.baseline)
+    n        = int(baseline.get('_meta_', dict()).get('bexec', args.bexec))
+    for x, b, w in evaluation.get_arg_xbw_items(args):
+        configurations = evaluation.get_valid_configurations_of(args, x, b, w)
+        redundant      = redundancy.find_redundant(
+            [ c.params_id() for c in configurations ],
+            redundancy.get_baselines(baseline, configurations),
+            redundancy.load_effects(evaluation.x_location(args) / 'data', b, w, baseline),
+            n,
+            args.margin,
+            args.z,
+            args.min_pairs
+        )
+        location = evaluation.x_location(args) / x / 'workloads' / b / w
+        redundancy.store(location, redundant)
+        print(f"Redundant configurations {x} {b} {w}: {len(redundant)}/{len(configurations)}")
+        for pid, rep in sorted(redundant.items()):
+            print(f"  {pid} ~ {rep}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--xs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified experiments")
+    parser.add_argument('--bs', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified benchmarks")
+    parser.add_argument('--ws', nargs = '+', default = [], required = False,
+        help = "Limit operation to specified workloads")
+    parser.add_argument('--data', required = False, default = 'experiments',
+        help = "Location where experiments are stored. Defaults to 'experiments'.")
+    parser.add_argument('--baseline', required = False, default = 'baseline.txt',
+        help = "Baseline file. Defaults to 'baseline.txt'.")
+    parser.add_argument('--bexec', required = False, type = int, default = 10,
+        help = "Number of baseline executions, unless specified by the '_meta_' object of the baseline.")
+    parser.add_argument('--margin', required = False, type = float, default = redundancy.DEFAULT_MARGIN,
+        help = "Relative difference within which configurations are equivalent.")
+    parser.add_argument('--z', required = False, type = float, default = redundancy.DEFAULT_Z,
+        help = "Critical value of the confidence intervals.")
+    parser.add_argument('--min-pairs', required = False, type = int, default = redundancy.DEFAULT_MIN_PAIRS,
+        help = "Refactorings measured under both configurations needed to compare effects.")
+    args = parser.parse_args()
+    prune(args)
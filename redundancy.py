@@ -0,0 +1,117 @@
+import hashlib
+import json
+import math
+import os
+import statistics
+
+from pathlib import Path
+
+import allocation
+import confirmation
+
+from configuration import Configuration
+
+# Redundant configurations. Two configurations of a workload are redundant
+# if they are equivalent within a margin: their baseline execution times,
+# and the effects of refactorings measured under both, differ by less than
+# the margin with confidence. (See 'prune_configurations.py'.)
+#
+# Redundant configurations are mapped to a representative, and the planner
+# samples refactorings for them at a reduced rate (see 'is_sampled()').
+#
+# Mapping: '<x>/workloads/<bm>/<workload>/redundant.json' : { <params_id> : <representative params_id> }
+
+DEFAULT_MARGIN    = 0.02    # Relative difference.
+DEFAULT_Z         = 1.96    # Two-sided 95% confidence.
+DEFAULT_MIN_PAIRS = 3       # Refactorings measured under both configurations.
+DEFAULT_RATE      = 1.0     # Sampling rate of redundant configurations.
+
+FILE = 'redundant.json'
+
+# Baselines are equivalent if the confidence interval of the relative
+# difference between means lies within the margin.
+def is_baseline_equivalent(a, b, n, margin = DEFAULT_MARGIN, z = DEFAULT_Z):
+    (mean_a, std_a), (mean_b, std_b) = a, b
+    difference = (mean_a - mean_b) / mean_b
+    se         = math.sqrt(std_a ** 2 / n + std_b ** 2 / n) / mean_b
+    return abs(difference) + z * se < margin
+
+# Effects (log speedups) are equivalent if the confidence interval of the
+# mean difference over refactorings measured under both configurations lies
+# within the margin. Returns None if too few refactorings were measured.
+def is_effect_equivalent(a, b, margin = DEFAULT_MARGIN, z = DEFAULT_Z, min_pairs = DEFAULT_MIN_PAIRS):
+    keys = sorted(set(a.keys()).intersection(b.keys()))
+    if len(keys) < max(2, min_pairs):
+        return None
+    differences = [ a[k] - b[k] for k in keys ]
+    se          = statistics.stdev(differences) / math.sqrt(len(differences))
+    return abs(statistics.mean(differences)) + z * se < margin
+
+# Map each configuration to the first configuration (by params id) that it is
+# redundant with. 'baselines' is { <params_id> : (<mean>, <std>) } and 'effects'
+# is { <params_id> : { <refactoring> : <effect> } }. Configurations without
+# baseline are never redundant.
+def find_redundant(params_ids, baselines, effects, n, margin = DEFAULT_MARGIN, z = DEFAULT_Z, min_pairs = DEFAULT_MIN_PAIRS):
+    representatives = []
+    redundant       = dict()
+    for pid in sorted(params_ids):
+        for rep in representatives:
+            if not pid in baselines or not rep in baselines:
+                continue
+            if not is_baseline_equivalent(baselines[pid], baselines[rep], n, margin, z):
+                continue
+            if is_effect_equivalent(effects.get(pid, dict()), effects.get(rep, dict()), margin, z, min_pairs) == False:
+                continue
+            redundant[pid] = rep
+            break
+        else:
+            representatives.append(pid)
+    return redundant
+
+# Returns { <params_id> : { <execution> : <effect> } } of all measurements of the workload.
+def load_effects(data_location, bm, workload, baseline):
+    effects = dict()
+    for opportunity in _folders(Path(data_location) / bm):
+        for refactoring in _folders(opportunity):
+            for execution in _folders(refactoring):
+                for store in _folders(execution / 'stats'):
+                    effect = allocation.get_effect(store, baseline)
+                    if effect is None:
+                        continue
+                    if Configuration().load(store / 'configuration.txt').bm_workload() != workload:
+                        continue
+                    key = '/'.join([opportunity.name, refactoring.name, execution.name])
+                    effects.setdefault(store.name, dict())[key] = effect
+    return effects
+
+def _folders(location):
+    for dir, folders, files in os.walk(location):
+        return [ Path(dir) / folder for folder in folders ]
+    return []
+
+def get_baselines(baseline, configurations):
+    baselines = dict()
+    for c in configurations:
+        reference = confirmation.get_baseline(baseline, c)
+        if not reference is None:
+            baselines[c.params_id()] = reference
+    return baselines
+
+def store(location, redundant):
+    with open(Path(location) / FILE, 'w') as f:
+        f.write(json.dumps(redundant, indent = 4, sort_keys = True) + os.linesep)
+
+def load(location):
+    file = Path(location) / FILE
+    if not file.exists():
+        return dict()
+    with open(file, 'r') as f:
+        return json.load(f)
+
+# Deterministic sampling so that the same refactorings are selected for a
+# redundant configuration across runs and hosts.
+def is_sampled(key, rate):
+    if rate >= 1:
+        return True
+    digest = hashlib.md5(bytes(str(key), encoding = 'utf-8')).hexdigest()
+    return int(digest, 16) / 16 ** len(digest) < rate
@@ -0,0 +1,79 @@
+import os
+
+from pathlib import Path
+
+from configuration import Metrics
+
+# Resource usage of a benchmark run, stored next to the execution time in
+# 'metrics.txt' so that refactorings that keep the execution time but burn
+# more CPU or memory show up in the analysis.
+#
+# The resource usage of the process tree of the run is taken from
+# 'os.wait4()' on the session leader (see 'tools.run_in_new_session()').
+# The leader waits for the JVM, so its resource usage includes the JVM.
+#
+# If the machine uses cgroup v2, the CPU usage of the cgroup of this
+# process is also sampled before and after the run. The cgroup may contain
+# other processes (e.g. the whole container), so the cgroup metrics are an
+# upper bound, but they also include throttling by CPU quotas.
+#
+# All paths are relative to 'root' so that sampling can be tested against
+# a fake file system tree.
+
+_cgroup_keys = {
+    'usage_usec'     : Metrics.CGROUP_CPU_TIME,
+    'user_usec'      : Metrics.CGROUP_USER_TIME,
+    'system_usec'    : Metrics.CGROUP_SYSTEM_TIME,
+    'throttled_usec' : Metrics.CGROUP_THROTTLED_TIME
+}
+
+def get_rusage_metrics(rusage):
+    if rusage is None:
+        return dict()
+    return {
+        Metrics.USER_TIME                    : str(int(rusage.ru_utime * 1000)), # ms
+        Metrics.SYSTEM_TIME                  : str(int(rusage.ru_stime * 1000)), # ms
+        Metrics.MAX_RSS                      : str(rusage.ru_maxrss),            # kB
+        Metrics.VOLUNTARY_CONTEXT_SWITCHES   : str(rusage.ru_nvcsw),
+        Metrics.INVOLUNTARY_CONTEXT_SWITCHES : str(rusage.ru_nivcsw),
+        Metrics.MINOR_PAGE_FAULTS            : str(rusage.ru_minflt),
+        Metrics.MAJOR_PAGE_FAULTS            : str(rusage.ru_majflt)
+    }
+
+# The cgroup v2 directory of this process, or None if the machine does not
+# use cgroup v2 (the unified hierarchy has a single '0::<path>' entry).
+def get_cgroup(root = Path('/')):
+    root = Path(root)
+    try:
+        with open(root / 'proc/self/cgroup', 'r') as f:
+            lines = f.read().strip().split(os.linesep)
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith('0::'):
+            cgroup = root / 'sys/fs/cgroup' / line[3:].lstrip('/')
+            return cgroup if (cgroup / 'cpu.stat').exists() else None
+    return None
+
+def sample_cgroup(root = Path('/')):
+    cgroup = get_cgroup(root)
+    if cgroup is None:
+        return dict()
+    try:
+        with open(cgroup / 'cpu.stat', 'r') as f:
+            lines = f.read().strip().split(os.linesep)
+    except OSError:
+        return dict()
+    stat = dict()
+    for line in lines:
+        name, _, value = line.partition(' ')
+        if name in _cgroup_keys:
+            stat[name] = int(value)
+    return stat
+
+def get_cgroup_metrics(before, after):
+    metrics = dict()
+    for name, key in _cgroup_keys.items():
+        if name in before and name in after:
+            metrics[key] = str((after[name] - before[name]) // 1000) # ms
+    return metrics
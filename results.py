@@ -204,7 +204,7 @@ class Results:
         self._results     = []
 
     def add_benchmark(self, descriptor, location):
-        if (location / 'FAILURE').exists():
+        if (location / 'FAILURE').exists() or (location / 'NOISY').exists():
             return
         config   = Configuration().load(location / 'configuration.txt')
         # Only include data for specified workload to get all comparable results.
@@ -218,9 +218,9 @@ class Results:
             for k, v in params.items():
                 self._i_variables.add(k)
                 self._variables.add(k)
-            for k, v in metrics._values.items():
-                self._d_variables.add(k)
-                self._variables.add(k)
+        for k, v in metrics._values.items():
+            self._d_variables.add(k)
+            self._variables.add(k)
 
     def compute_statistics(self):
         if len(self._results) == 0:
@@ -238,7 +238,7 @@ class Results:
             header = ','.join(sorted(self._variables))
             f.write(header + os.linesep)
             for result in self._results:
-                f.write(','.join([ result[var] for var in sorted(self._variables) ]) + os.linesep)
+                f.write(','.join([ result.get(var, '') for var in sorted(self._variables) ]) + os.linesep)
 
         anova(self._i_variables, self._d_variables, csv_path)
 
@@ -381,6 +381,8 @@ def compute_results(args):
                                 for id in configuration_ids:
                                     if (Path(dir2) / id / 'FAILURE').exists():
                                         continue # Benchmark failed.
+                                    if (Path(dir2) / id / 'NOISY').exists():
+                                        continue # Measured on a noisy machine, to be measured again.
                                     #
                                     # TODO: Consider which parameters and meta attributes are of interest in the analysis, if any.
                                     #
@@ -394,7 +396,7 @@ def compute_results(args):
                                     identity = { 'data' : '/'.join([descriptor.opportunity_id(), descriptor.id(), execution, 'stats', id]) }
                                     results.append({ **identity, **config._values, **metrics._values })
                                     if len(variables) == 0:
-                                        # All configurations and metrics contain the same variables.
+                                        # All configurations contain the same variables.
                                         #
                                         # TODO: This will not be true when we involve meta attributes
                                         #       or mix refactorings of different types.
@@ -402,9 +404,9 @@ def compute_results(args):
                                         for k, v in config._values.items():
                                             results_independent_variables.add(k)
                                             variables.add(k)
-                                        for k, v in metrics._values.items():
-                                            results_dependent_variables.add(k)
-                                            variables.add(k)
+                                    for k, v in metrics._values.items():
+                                        results_dependent_variables.add(k)
+                                        variables.add(k)
                                 break
                         break
 
@@ -421,7 +423,7 @@ def compute_results(args):
             header = ','.join(sorted(variables))
             f.write(header + os.linesep)
             for result in results: # TODO: Consider sorting on 'data' attribute (which is our ID variable)
-                f.write(','.join([ result[var] for var in sorted(variables) ]) + os.linesep)
+                f.write(','.join([ result.get(var, '') for var in sorted(variables) ]) + os.linesep)
 
         anova(results_independent_variables, results_dependent_variables, csv_path)
 
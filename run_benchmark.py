@@ -6,10 +6,17 @@ import json
 import os
 from pathlib import Path
 import re
+import shlex
 import subprocess
 import tempfile
+import time
 
+import energy
+import gc_logs
+import heap_sizes
+import jit_logs
 import patch
+import resource_usage
 import tools
 
 # Timeout configuration json object (integer timeouts in seconds):
@@ -60,13 +67,38 @@ def get_runtime_options(configuration):
     if configuration.stack_size() != None:
         java_options.append("-Xss" + configuration.stack_size())
     if configuration.heap_size() != None:
-        java_options.append("-Xmx" + configuration.heap_size())
+        java_options.append("-Xmx" + heap_sizes.resolve(configuration)) # Multiples of the minimum heap size are resolved.
+    java_options.extend(configuration.get_jvm_options())
     return java_options
 
-def get_harness_options(configuration):
-    options = [ '-size', configuration.bm_workload() ]
+def get_harness_options(configuration, workload = None):
+    options = [ '-size', workload if workload != None else configuration.bm_workload() ]
+    if configuration.threads() != None:
+        options.extend([ '-t', configuration.threads() ])
     return options
 
+# Configurations are valid on every host, but only hosts with at least
+# 'cpus' available CPUs can run them.
+def has_available_cpus(configuration):
+    return configuration.cpus() == None or int(configuration.cpus()) <= len(tools.get_available_cpus())
+
+# Pin the benchmark to the first 'cpus' of the available CPUs. The JVM
+# sizes its thread pools (GC, JIT) according to the CPUs it is allowed to
+# run on.
+def get_cpu_affinity(configuration):
+    if configuration.cpus() == None:
+        return []
+    if not has_available_cpus(configuration):
+        raise ValueError(f"Benchmark failed. Option 'cpus'=\"{configuration.cpus()}\" exceeds the number of available CPUs ({len(tools.get_available_cpus())})")
+    cpus = tools.get_available_cpus()[:int(configuration.cpus())]
+    return [ 'taskset', '-c', ','.join([ str(cpu) for cpu in cpus ]) ]
+
+# Raised by 'deploy_benchmark()' when the build fails. The first
+# argument is the build output.
+class BuildError(ValueError):
+    def output(self):
+        return self.args[0]
+
 def deploy_benchmark(configuration, clean, context = None, import_dir = None):
     if not context:
         context = Path(os.getcwd()) / 'deployments'
@@ -84,22 +116,31 @@ def deploy_benchmark(configuration, clean, context = None, import_dir = None):
     ]
     cmd        = " ".join(options)
     DAIVY_HOME = os.environ['DAIVY_HOME']
-    result     = subprocess.run(
+    result     = tools.run_in_new_session(
         tools.sdk_run(configuration.jdk(), cmd),
-        stdout     = subprocess.PIPE,
-        stderr     = subprocess.STDOUT,
-        shell      = True,
-        executable = '/bin/bash',
-        cwd        = DAIVY_HOME
+        cwd = DAIVY_HOME
     )
 
     if result.returncode != 0:
-        raise ValueError(result.stdout.decode('utf-8'))
+        raise BuildError(result.stdout.decode('utf-8'))
 
-def run_benchmark(configuration, deployment, jfr, jfr_file):
+# The harness runs the benchmark 'iterations' times and reports the
+# execution time of the last iteration. The configured workload can be
+# overridden, e.g. to validate a deployment on a smaller workload.
+# The resource usage of the run is added to 'resources', if specified, as
+# metrics (see 'resource_usage.py').
+# Energy consumption of the measured iteration is added to 'resources'
+# where RAPL counters are available (see 'energy.py').
+# If 'gc_file' is specified, the run is GC logged, per-iteration GC
+# statistics are written to 'gc_file', and the GC metrics of the measured
+# iteration are added to 'resources' (see 'gc_logs.py').
+# If 'jit_file' is specified, JIT compilations and inlining decisions are
+# printed and summarized in 'jit_file' (see 'jit_logs.py').
+# Event settings in 'jfr_settings' (e.g. 'jdk.Compilation#threshold=0 ms')
+# are added to the flight recording configuration.
+def run_benchmark(configuration, deployment, jfr, jfr_file, iterations_file = None, iterations = 10, workload = None, resources = None, gc_file = None, jit_file = None, jfr_settings = None):
 
-    bm         = configuration.bm()
-    workload   = configuration.bm_workload()
+    bm       = configuration.bm()
 
     options  = []
     features = []
@@ -110,16 +151,12 @@ def run_benchmark(configuration, deployment, jfr, jfr_file):
     if jfr:
         # Seems like different JDKs ship different default configurations (atleast by checksum).
         # Best to generate a configuration that is compatible with the one that is actually used.
-        result = subprocess.run(
+        result = tools.run_in_new_session(
             tools.sdk_run(
                 configuration.jre(),
-                "${JAVA_HOME}/bin/jfr configure --output jfr/custom.jfc method-profiling=max"
+                ' '.join([ "${JAVA_HOME}/bin/jfr configure --output jfr/custom.jfc method-profiling=max" ] + [ shlex.quote(s) for s in (jfr_settings or []) ])
             ),
-            shell      = True,
-            executable = '/bin/bash',
-            stdout     = subprocess.PIPE,
-            stderr     = subprocess.STDOUT,
-            timeout    = 10 # Raises subprocess.TimeoutExpired.
+            timeout = 10 # Raises subprocess.TimeoutExpired.
         )
 
         if result.returncode != 0:
@@ -139,37 +176,141 @@ def run_benchmark(configuration, deployment, jfr, jfr_file):
             "-XX:FlightRecorderOptions=" + ",".join(jfr_options),
             "-XX:StartFlightRecording=" + ",".join(jfr_start_options)
         ])
+    gc_log = None
+    if not gc_file is None:
+        if gc_logs.is_supported(configuration):
+            # The raw log is removed once parsed.
+            gc_log = Path(gc_file).with_suffix('.log')
+            gc_log.unlink(missing_ok = True)
+            features.append(gc_logs.get_log_option(gc_log))
+        else:
+            print("WARNING: GC logging requires JDK 9 or later", configuration.jre())
+    if not jit_file is None:
+        features.extend(jit_logs.OPTIONS)
     options.extend(features)
     options.extend([
         "-jar",
-        str(deployment / f"{bm}-1.0.jar {bm} -n 10") # Run -n times and return exec-time of last iteration.
+        str(deployment / f"{bm}-1.0.jar"), bm, "-n", str(iterations) # Run -n times and return exec-time of last iteration.
     ])
-    options.extend(get_harness_options(configuration))
+    options.extend(get_harness_options(configuration, workload))
 
     java_options = get_runtime_options(configuration)
 
-    code = ' '.join(['java', ' '.join(java_options), ' '.join(options)])
+    # Options of JVM option sets (e.g. '-Xlog:gc*') must not be expanded by the shell.
+    code = ' '.join([ shlex.quote(s) for s in get_cpu_affinity(configuration) + ['java'] + java_options + options ])
     print("--- Run benchmark using ---")
     print(code)
     print("-" * 27)
-    result = subprocess.run(
-        tools.sdk_run(configuration.jre(), code),
-        shell      = True,
-        executable = '/bin/bash',
-        stdout     = subprocess.PIPE,
-        stderr     = subprocess.STDOUT,
-        timeout    = get_configured_benchmark_timeout(configuration) # Raises subprocess.TimeoutExpired.
-    )
-    text = result.stdout.decode('utf-8')
+
+    # A JVM that survived a previous timeout would skew this measurement.
+    tools.ensure_no_stray_jvms()
+
+    # The benchmark runs in its own process group so that the JVM is
+    # killed together with the SDKMAN! bash wrapper on timeout, or as
+    # soon as the harness output shows that the benchmark has failed.
+    monitor       = HarnessOutputMonitor(iterations_file, energy.sample if not resources is None else None)
+    cgroup_before = resource_usage.sample_cgroup()
     print("--- BENCHMARK OUTPUT ---")
-    print(text)
-    print("--- BENCHMARK OUTPUT END ---")
+    try:
+        result = tools.run_in_new_session(
+            tools.sdk_run(configuration.jre(), code),
+            timeout = get_configured_benchmark_timeout(configuration), # Raises subprocess.TimeoutExpired.
+            on_line = monitor
+        )
+    finally:
+        print("--- BENCHMARK OUTPUT END ---")
+    cgroup_after = resource_usage.sample_cgroup()
+    text = monitor.text()
     if result.returncode != 0:
         raise ValueError("Benchmark failed", text)
-    if text.find('Benchmark failed to converge') != -1:
-        raise ValueError("Benchmark failed to converge")
-    p    = re.compile('PASSED in (\\d+) msec')
-    execution_time = p.findall(text)[0]
-    print("CAPTURED EXECUTION TIME", execution_time, "ms")
-    return execution_time
+    if monitor.execution_time is None:
+        raise ValueError("Benchmark failed. No execution time found in output.", text)
+    print("CAPTURED EXECUTION TIME", monitor.execution_time, "ms")
+    if not resources is None:
+        resources.update(resource_usage.get_rusage_metrics(result.rusage))
+        resources.update(resource_usage.get_cgroup_metrics(cgroup_before, cgroup_after))
+        resources.update(energy.get_metrics(monitor.energy_before, monitor.energy_after))
+        print("CAPTURED RESOURCE USAGE", resources)
+    if not gc_log is None:
+        gc = gc_logs.summarize(gc_logs.load(gc_log), monitor.iteration_starts)
+        gc_logs.store(gc, gc_file)
+        gc_log.unlink()
+        if not resources is None:
+            resources.update(gc_logs.get_metrics(gc))
+    if not jit_file is None:
+        jit_logs.store(jit_logs.parse(monitor.lines()), jit_file)
+    return monitor.execution_time
+
+# Harness output patterns that prove that a benchmark run has failed.
+# The run is terminated as soon as one of these is seen, instead of
+# running the remaining iterations until completion or timeout.
+_failure_patterns = [
+    re.compile('^===== DaCapo .* FAILED'),      # Failed iteration or output validation.
+    re.compile('Benchmark failed to converge'),
+    re.compile('Digest validation failed'),
+    re.compile('Exception in thread "main"')
+]
+
+_starting_pattern  = re.compile(' starting (?:warmup \\d+ )?=====')
+_measured_pattern  = re.compile(' starting =====')
+_iteration_pattern = re.compile('completed warmup (\\d+) in (\\d+) msec')
+_passed_pattern    = re.compile('PASSED in (\\d+) msec')
+
+# Consumes harness output line by line (see 'tools.run_in_new_session()').
+# Iteration times are appended to 'iterations_file', if specified, as they
+# are reported so that partial results survive a timeout. The wall-clock
+# time (ms) at which each iteration starts is recorded so that GC log
+# events can be attributed to iterations. If 'sample_energy' is specified,
+# energy counters are sampled when the measured (last) iteration starts and
+# when it passes.
+class HarnessOutputMonitor:
+    def __init__(self, iterations_file = None, sample_energy = None):
+        self._lines           = []
+        self._iteration       = 0
+        self.iterations       = []
+        self.iteration_starts = []
+        self.execution_time   = None
+        self.iterations_file  = iterations_file
+        self.sample_energy    = sample_energy
+        self.energy_before    = None
+        self.energy_after     = None
+
+    def lines(self):
+        return self._lines
+
+    def text(self):
+        return os.linesep.join(self._lines)
+
+    def _record_iteration(self, msec):
+        self._iteration = self._iteration + 1
+        self.iterations.append(msec)
+        if self.iterations_file is not None:
+            with open(self.iterations_file, 'a') as f:
+                f.write(f"{self._iteration}={msec}" + os.linesep)
+
+    def __call__(self, line):
+        self._lines.append(line)
+        print(line)
+
+        if _starting_pattern.search(line):
+            self.iteration_starts.append(int(time.time() * 1000))
+            if _measured_pattern.search(line) and self.sample_energy is not None:
+                self.energy_before = self.sample_energy()
+            return
+
+        match = _iteration_pattern.search(line)
+        if match:
+            self._record_iteration(match.group(2))
+            return
+
+        match = _passed_pattern.search(line)
+        if match:
+            if self.sample_energy is not None:
+                self.energy_after = self.sample_energy()
+            self.execution_time = match.group(1)
+            self._record_iteration(self.execution_time)
+            return
 
+        for pattern in _failure_patterns:
+            if pattern.search(line):
+                raise ValueError("Benchmark failed", self.text())
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+from pathlib import Path
+
+import confirmation
+import patch
+
+# Group screening (adaptive group testing) of refactorings. Refactorings
+# that patch disjoint files are combined into a single deployment. If the
+# combination has no effect against the baseline, all members are marked
+# as screened. Otherwise the group is split in halves that are screened
+# recursively, down to single refactorings which are measured as usual.
+#
+# Since most refactorings have no effect, far fewer builds and benchmark
+# runs are needed per screened refactoring.
+#
+# ATTENTION
+# Effects of members of a group may cancel out. Screening trades this
+# (unlikely) risk for throughput.
+#
+# Screening outcomes of a group are stored in '<x>/screening/<bm>/<params_id>/<group id>',
+# and members that are screened without effect get '<execution>/screened/<params_id>/NULL'.
+
+DEFAULT_GROUP_SIZE = 8
+DEFAULT_THRESHOLD  = 2.0    # Baseline standard deviations.
+
+NULL   = 'NULL'             # No effect.
+EFFECT = 'EFFECT'           # Effect beyond the threshold.
+FAILED = 'FAILED'           # Build or benchmark failure.
+
+# Returns the files touched by the patches of a refactoring, identified
+# by patch (archive and source root) and path.
+def get_touched_files(data_location):
+    files = set()
+    for p in sorted(Path(data_location).glob('*.patch')):
+        for f in patch.get_patched_files(p):
+            files.add((p.name, f))
+    return files
+
+# Partition candidates ([ (<key>, <touched files>) ]) into groups of at
+# most 'size' members that touch disjoint files. Candidates are placed in
+# the first group they fit in. Returns [ [ <key> ] ].
+def form_groups(candidates, size = DEFAULT_GROUP_SIZE):
+    if size < 1:
+        raise ValueError("Group size must be positive", size)
+    groups = [] # [ ([ <key> ], <touched files>) ]
+    for key, files in candidates:
+        for members, touched in groups:
+            if len(members) < size and touched.isdisjoint(files):
+                members.append(key)
+                touched.update(files)
+                break
+        else:
+            groups.append(([key], set(files)))
+    return [ members for members, touched in groups ]
+
+def split(members):
+    half = (len(members) + 1) // 2
+    return [ members[:half], members[half:] ]
+
+def get_group_id(members):
+    text = os.linesep.join(sorted([ str(m) for m in members ]))
+    return hashlib.md5(bytes(text, encoding = 'utf-8')).hexdigest()
+
+def get_status(time, mean, std, threshold = DEFAULT_THRESHOLD):
+    return EFFECT if confirmation.is_outlier(time, mean, std, threshold) else NULL
+
+def store_group(store, members, status, time = None):
+    store.mkdir(parents = True, exist_ok = True)
+    with open(store / 'members.txt', 'w') as f:
+        for m in members:
+            f.write(str(m) + os.linesep)
+    if not time is None:
+        with open(store / 'metrics.txt', 'w') as f:
+            f.write("EXECUTION_TIME=" + str(time) + os.linesep)
+    with open(store / 'screening.txt', 'w') as f:
+        f.write(status + os.linesep)
+
+def load_group_status(store):
+    if not (store / 'screening.txt').exists():
+        return None
+    with open(store / 'screening.txt', 'r') as f:
+        return f.read().strip()
+
+def get_screened_path(data_location, params_id):
+    return Path(data_location) / 'screened' / params_id
+
+def mark_null(data_location, params_id, group_id):
+    store = get_screened_path(data_location, params_id)
+    store.mkdir(parents = True, exist_ok = True)
+    with open(store / NULL, 'w') as f:
+        f.write(group_id + os.linesep)
+
+def is_screened(data_location, params_id):
+    return (get_screened_path(data_location, params_id) / NULL).exists()
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import re
+
+from pathlib import Path
+
+# Parameterized refactoring types produce several descriptors per
+# opportunity (siblings) that only differ in 'params'. When siblings
+# fail for the same reason, the failure is most likely independent
+# of the parameters, and remaining siblings can be skipped.
+#
+# A failure is classified as parameter-independent when at least
+# 'threshold' siblings fail with the same failure signature:
+#   - Refactoring: the error lines of the refactoring framework output.
+#   - Compilation: the set of compiler error locations and messages.
+#   - Benchmark:   the exception and its top stack frame, or the
+#                  failure line reported by the harness.
+#
+# Timeouts have no signature and never cause siblings to be skipped, since
+# whether a run exceeds the timeout often depends on the parameters.
+#
+# Benchmark failures are compared per configuration since a build or
+# runtime failure under one configuration does not imply failure under
+# another configuration.
+#
+# Skipped cases are marked as failures with an additional 'SKIPPED'
+# hint, so that they are excluded from signature computations and can
+# be separated from actual failures during analysis.
+
+DEFAULT_THRESHOLD = 2
+
+_compiler_error_pattern  = re.compile('([\\w/$.-]+\\.java):(\\d+): error: ([^\\n]*)')
+_exception_pattern       = re.compile('([A-Za-z_$][\\w$]*(?:\\.[A-Za-z_$][\\w$]*)+(?:Exception|Error))')
+_frame_pattern           = re.compile('at ([\\w$.<>]+)\\(([\\w$]+\\.java:\\d+)\\)')
+_harness_failure_pattern = re.compile('FAILED|Digest validation failed|failed to converge')
+_refactoring_error       = re.compile('error|exception|fatal', re.IGNORECASE)
+_source_root_pattern     = re.compile('.*?(src/(?:main|test)/java/)')
+
+def _md5(text):
+    return hashlib.md5(bytes(text, encoding = 'utf-8')).hexdigest()
+
+def _read(path):
+    with open(path, 'r', errors = 'replace') as f:
+        # Exceptions are written using 'str(e)', which escapes line breaks
+        # in the exception arguments.
+        return f.read().replace('\\n', '\n')
+
+def get_compile_signature(text):
+    errors = set()
+    for path, line, message in _compiler_error_pattern.findall(text):
+        # Builds run in temporary directories; keep only the path below the source root.
+        path = _source_root_pattern.sub('\\1', path)
+        errors.add(f"{path}:{line}: {message.strip()}")
+    if len(errors) == 0:
+        return None
+    return 'compile:' + _md5(os.linesep.join(sorted(errors)))
+
+def get_benchmark_signature(text):
+    exception = _exception_pattern.search(text)
+    if exception:
+        frame = _frame_pattern.search(text, exception.end())
+        where = '' if frame is None else frame.group(1) + '(' + frame.group(2) + ')'
+        return 'exception:' + _md5(exception.group(1) + ' ' + where)
+    for line in text.split('\n'):
+        if _harness_failure_pattern.search(line):
+            return 'harness:' + _md5(line.strip())
+    return None
+
+def get_refactoring_signature(text):
+    errors = [ line.strip() for line in text.split('\n') if _refactoring_error.search(line) ]
+    if len(errors) == 0:
+        errors = [ text.strip() ]
+    return 'refactoring:' + _md5(os.linesep.join(errors))
+
+# Return the signature of the refactoring failure at the specified
+# refactoring location, or None if the refactoring did not fail.
+def get_refactoring_failure_signature(refactoring_location):
+    location = Path(refactoring_location)
+    if not (location / 'FAILURE').exists() or (location / 'SKIPPED').exists():
+        return None
+    output = location / 'refactoring-output.txt'
+    if not output.exists():
+        return None
+    return get_refactoring_signature(_read(output))
+
+# Return the signature of the benchmark failure at the specified
+# measurement location, or None if the benchmark did not fail or timed out.
+def get_benchmark_failure_signature(measurement_location):
+    location = Path(measurement_location)
+    failure  = location / 'FAILURE'
+    if not failure.exists() or (location / 'SKIPPED').exists():
+        return None
+    if (location / 'TIMEOUT').exists():
+        return None
+    text = _read(failure)
+    if (location / 'COMPILE').exists():
+        return get_compile_signature(text)
+    return get_compile_signature(text) or get_benchmark_signature(text)
+
+def _get_folders(path):
+    for dir, folders, files in os.walk(path):
+        return [ Path(dir) / folder for folder in folders ]
+    return []
+
+def _is_parameter_independent(signatures, threshold):
+    counts = dict()
+    for signature in signatures:
+        if signature is None:
+            continue
+        counts[signature] = counts.get(signature, 0) + 1
+        if counts[signature] >= threshold:
+            return signature
+    return None
+
+# Return the signature of a parameter-independent refactoring failure
+# among siblings of the specified refactoring, or None.
+def get_sibling_refactoring_failure(opportunity_location, refactoring_id, threshold = DEFAULT_THRESHOLD):
+    signatures = [
+        get_refactoring_failure_signature(sibling)
+        for sibling in _get_folders(opportunity_location) if sibling.name != refactoring_id
+    ]
+    return _is_parameter_independent(signatures, threshold)
+
+# Return the signature of a parameter-independent benchmark failure
+# among siblings of the specified refactoring under the specified
+# configuration, or None.
+def get_sibling_benchmark_failure(opportunity_location, refactoring_id, configuration_id, threshold = DEFAULT_THRESHOLD):
+    signatures = []
+    for sibling in _get_folders(opportunity_location):
+        if sibling.name == refactoring_id:
+            continue
+        # Count each sibling once, even if it has several executions.
+        sibling_signatures = set()
+        for execution in _get_folders(sibling):
+            sibling_signatures.add(get_benchmark_failure_signature(execution / 'stats' / configuration_id))
+        signatures.extend(sibling_signatures)
+    return _is_parameter_independent(signatures, threshold)
+
+def mark_skipped(location, signature):
+    location = Path(location)
+    location.mkdir(parents = True, exist_ok = True)
+    with open(location / 'FAILURE', 'w') as f:
+        f.write(f"Skipped: parameter-independent failure of sibling descriptors ({signature})" + os.linesep)
+    with open(location / 'SKIPPED', 'w') as f:
+        f.write(signature + os.linesep)
@@ -12,6 +12,11 @@ import collect_hot_methods as jfr
 def get_all_sampled_methods(cache_location, configuration):
     return [m for (m,_,_) in _filter_methods(cache_location, configuration, 0.0)]
 
+# Return a dictionary mapping method signature to its fraction of all samples.
+def get_sampled_method_fractions(cache_location, configuration):
+    total, methods = _load_method_samples(cache_location, configuration)
+    return { m : c / total for m, c in methods } if total > 0 else dict()
+
 def decimals(num):
     s = str(num)
     n = len(s[s.rfind('.')+1:])
@@ -0,0 +1,65 @@
+#!/bin/env python3
+
+import json
+import math
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import allocation
+
+from configuration import Configuration, Metrics
+
+class TestAllocation(unittest.TestCase):
+
+    def test_effect(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        baseline = { f"jacop-mzc18_1-{config.id()}-mean" : 1000.0 }
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Path(tmp)
+            config.store(store / 'configuration.txt')
+            metrics = Metrics()
+            metrics.execution_time('500')
+            metrics.store(store / 'metrics.txt')
+            self.assertIsNone(allocation.get_effect(store, baseline))   # Not successful.
+            (store / 'SUCCESS').touch()
+            self.assertAlmostEqual(math.log(2), allocation.get_effect(store, baseline))
+            self.assertIsNone(allocation.get_effect(store, dict()))     # No baseline.
+            with open(store / 'summary.json', 'w') as f:
+                json.dump({ 'speedup_mean' : 0.5 }, f)
+            self.assertAlmostEqual(math.log(0.5), allocation.get_effect(store, dict()))
+            (store / 'NOISY').touch()
+            self.assertIsNone(allocation.get_effect(store, dict()))     # Noisy.
+
+    def test_explores_new_arms_first(self):
+        a         = ('inline-temp', 'jacop', 'mzc18_1')
+        b         = ('rename', 'jacop', 'mzc18_1')
+        allocator = allocation.Allocator({ a : [0.1, 0.2, 0.3] })
+        self.assertEqual(b, allocator.select([a, b]))
+
+    def test_favors_extreme_and_uncertain_arms(self):
+        a         = ('inline-temp', 'jacop', 'mzc18_1')
+        b         = ('rename', 'jacop', 'mzc18_1')
+        effects   = { a : [0.3, -0.2, 0.4, 0.1], b : [0.001, 0.0, -0.001, 0.0] }
+        allocator = allocation.Allocator(effects, min_share = 0)
+        self.assertEqual(a, allocator.select([a, b]))
+        allocator.add(b)                                                # Failed attempt.
+        self.assertEqual(5, allocator.attempts[b])
+        self.assertEqual(4, len(allocator.effects[b]))
+
+    def test_minimum_share(self):
+        a         = ('inline-temp', 'jacop', 'mzc18_1')
+        b         = ('rename', 'jacop', 'mzc18_1')
+        effects   = { a : [0.3, -0.2, 0.4, 0.1] * 4, b : [0.0, 0.0] }
+        allocator = allocation.Allocator(effects, min_share = 0.5)
+        self.assertEqual(b, allocator.select([a, b]))                   # 2 < 0.5 * 18 / 2
+        allocator = allocation.Allocator(effects, min_share = 0.2)
+        self.assertEqual(a, allocator.select([a, b]))
+        with self.assertRaises(ValueError):
+            allocation.Allocator(effects, min_share = 2)
+
+if __name__ == '__main__':
+    unittest.main()
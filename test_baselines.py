@@ -0,0 +1,66 @@
+#!/bin/env python3
+
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import baselines
+
+from configuration import Configuration
+
+def _fingerprint(machine, cpu = 'cpu-a', limit = 4000):
+    return { 'machine' : machine, 'cpu' : cpu, 'cpus' : 8, 'cpufreq' : 4000, 'cpufreq_limit' : limit, 'governor' : 'performance', 'memory' : 16 }
+
+def _baseline(file, key, value, fingerprint = None):
+    baseline = { key : value }
+    if not fingerprint is None:
+        baseline['_meta_'] = { 'hardware' : { 'machine' : fingerprint['machine'], 'cpufreq' : 4000 }, 'fingerprint' : fingerprint }
+    with open(file, 'w') as f:
+        json.dump(baseline, f)
+
+class TestBaselines(unittest.TestCase):
+
+    def test_machine_baselines(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        key    = f"jacop-mzc18_1-{config.id()}"
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            _baseline(tmp / 'a.txt', key, 1000, _fingerprint('a'))
+            _baseline(tmp / 'b.txt', key, 2000, _fingerprint('b', 'cpu-b'))
+            bs = baselines.Baselines([tmp / 'a.txt', tmp / 'b.txt'])
+            self.assertEqual(1000, bs.execution_time(config))                                   # Default.
+            self.assertEqual(2000, bs.execution_time(config, _fingerprint('b', 'cpu-b')))       # Same machine.
+            self.assertEqual(2000, bs.execution_time(config, _fingerprint('c', 'cpu-b')))       # Same hardware.
+            self.assertEqual(1000, bs.execution_time(config, _fingerprint('d', 'cpu-d')))       # Unknown.
+            self.assertEqual(2.0, bs.speedup(config, 1000, _fingerprint('b', 'cpu-b')))
+        with self.assertRaises(ValueError):
+            baselines.Baselines([])
+
+    def test_pinned_frequencies(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        key    = f"jacop-mzc18_1-{config.id()}"
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            _baseline(tmp / 'a.txt', key, 1000, _fingerprint('pascal', limit = 3500))
+            _baseline(tmp / 'b.txt', key, 3000, _fingerprint('pascal', limit = 1200))
+            bs = baselines.Baselines([tmp / 'a.txt', tmp / 'b.txt'])
+            self.assertEqual(1000, bs.execution_time(config, _fingerprint('pascal', limit = 3500)))
+            self.assertEqual(3000, bs.execution_time(config, _fingerprint('pascal', limit = 1200)))
+            _baseline(tmp / 'c.txt', key, 1100, _fingerprint('pascal', limit = 3500))
+            with self.assertRaises(ValueError):
+                baselines.Baselines([tmp / 'a.txt', tmp / 'c.txt'])
+
+    def test_fingerprint_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(baselines.load_fingerprint(tmp))
+            baselines.store_fingerprint(tmp, _fingerprint('a'))
+            self.assertEqual(_fingerprint('a'), baselines.load_fingerprint(tmp))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import build_cache
+
+from configuration import Configuration
+
+def _configuration(jdk, target_version = '17'):
+    config = Configuration()
+    config.bm('jacop')
+    config.bm_version('1.0')
+    config.bm_workload('mzc18_1')
+    config.jdk(jdk)
+    config.jre(jdk)
+    config.target_version(target_version)
+    return config
+
+class TestBuildFailureCache(unittest.TestCase):
+
+    def test_compiler_diagnostic(self):
+        text = os.linesep.join([
+            "[javac] Compiling 10 source files",
+            "[javac] /tmp/x/src/Foo.java:12: error: cannot find symbol",
+            "[javac]     _x_();",
+            "[javac]     ^",
+            "BUILD FAILED"
+        ])
+        diagnostic = build_cache.get_compiler_diagnostic(text)
+        self.assertEqual(3, len(diagnostic.split(os.linesep)))
+        self.assertIsNone(build_cache.get_compiler_diagnostic("BUILD FAILED"))
+
+    def test_failure_is_shared_by_build_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp)
+            with open(data / 'jacop-main-src.jar.patch', 'w') as f:
+                f.write("--- a" + os.linesep)
+            cache = build_cache.BuildFailureCache(data)
+            cache.put(_configuration('17.0.9-graalce'), "Foo.java:12: error: x")
+
+            # A configuration that only differs in runtime parameters shares the build.
+            other_jre = _configuration('17.0.9-graalce')
+            other_jre.jre('17.0.14-tem')
+            other_jre.heap_size('4G')
+            self.assertEqual("Foo.java:12: error: x", build_cache.BuildFailureCache(data).get(other_jre))
+
+            self.assertIsNone(cache.get(_configuration('17.0.14-tem')))
+            self.assertIsNone(cache.get(_configuration('17.0.9-graalce', '11')))
+
+            # Different patches is a different build.
+            with open(data / 'jacop-main-src.jar.patch', 'w') as f:
+                f.write("--- b" + os.linesep)
+            self.assertIsNone(build_cache.BuildFailureCache(data).get(_configuration('17.0.9-graalce')))
+
+if __name__ == '__main__':
+    unittest.main()
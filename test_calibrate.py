@@ -0,0 +1,21 @@
+#!/bin/env python3
+
+import unittest
+
+import calibrate
+
+class TestCalibrate(unittest.TestCase):
+
+    def test_false_positive_rate_against_reference(self):
+        summary = calibrate.summarize([100, 100, 103, 110], reference = 100, thresholds = [0.01, 0.05])
+        self.assertEqual(4, summary['n'])
+        self.assertEqual(0.5, summary['false_positive_rate']['0.01'])
+        self.assertEqual(0.25, summary['false_positive_rate']['0.05'])
+
+    def test_reference_defaults_to_mean(self):
+        summary = calibrate.summarize([90, 110])
+        self.assertEqual(100, summary['reference'])
+        self.assertIn('cv', summary)
+
+if __name__ == '__main__':
+    unittest.main()
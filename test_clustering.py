@@ -0,0 +1,43 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+import clustering
+
+class TestClustering(unittest.TestCase):
+
+    def test_similarity(self):
+        self.assertAlmostEqual(1.0, clustering.cosine_similarity({ 'a' : 0.5, 'b' : 0.5 }, { 'a' : 0.5, 'b' : 0.5 }))
+        self.assertAlmostEqual(0.0, clustering.cosine_similarity({ 'a' : 1.0 }, { 'b' : 1.0 }))
+        self.assertAlmostEqual(0.5, clustering.jaccard_similarity({ 'a', 'b' }, { 'b', 'c', 'a', 'd' }))
+        self.assertAlmostEqual(0.5, clustering.get_similarity(({ 'a' : 1.0 }, { 'x' }), ({ 'a' : 1.0 }, { 'y' })))
+        self.assertAlmostEqual(1.0, clustering.get_similarity(({ 'a' : 1.0 }, { 'x' }), ({ 'a' : 1.0 }, None)))
+
+    def test_cluster(self):
+        features = {
+            'mzc18_1' : ({ 'a' : 0.6, 'b' : 0.3, 'c' : 0.1 }, None),
+            'mzc18_2' : ({ 'a' : 0.5, 'b' : 0.4, 'c' : 0.1 }, None),
+            'mzc18_3' : ({ 'a' : 0.6, 'b' : 0.35, 'c' : 0.05 }, None),
+            'mzc18_4' : ({ 'x' : 0.9, 'y' : 0.1 }, None)
+        }
+        clusters = clustering.cluster(features, 0.8)
+        self.assertEqual(2, len(clusters))
+        self.assertEqual(['mzc18_4'], clusters['mzc18_4'])
+        representative = [ r for r in clusters.keys() if r != 'mzc18_4' ][0]
+        self.assertEqual(['mzc18_1', 'mzc18_2', 'mzc18_3'], clusters[representative])
+        self.assertEqual(4, len(clustering.cluster(features, 1.01)))
+
+    def test_representatives(self):
+        clusters = { 'mzc18_1' : ['mzc18_1', 'mzc18_2'] }
+        self.assertTrue(clustering.is_representative(clusters, 'mzc18_1'))
+        self.assertFalse(clustering.is_representative(clusters, 'mzc18_2'))
+        self.assertTrue(clustering.is_representative(clusters, 'small'))
+        self.assertTrue(clustering.is_representative(None, 'mzc18_2'))
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(clustering.load(tmp))
+            clustering.store(tmp, clusters)
+            self.assertEqual(clusters, clustering.load(tmp))
+
+if __name__ == '__main__':
+    unittest.main()
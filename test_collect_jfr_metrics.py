@@ -0,0 +1,108 @@
+#!/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import collect_jfr_metrics
+
+def _method(holder, name):
+    return { 'type' : { 'name' : holder }, 'name' : name, 'descriptor' : '()I', 'modifiers' : 1, 'hidden' : False }
+
+def _compilation(start, holder, name, level, duration, code_size, succeeded = True):
+    return ('jdk.Compilation', {
+        'startTime'    : start,
+        'duration'     : duration,
+        'compileId'    : 1,
+        'compiler'     : 'c2' if level == 4 else 'c1',
+        'method'       : _method(holder, name),
+        'compileLevel' : level,
+        'succeded'     : succeeded,
+        'isOsr'        : False,
+        'codeSize'     : code_size,
+        'inlinedBytes' : 10
+    })
+
+_events = [
+    _compilation('2024-05-01T12:00:00.100Z', 'java/lang/String', 'hashCode', 3, 'PT0.0005S', 400),
+    _compilation('2024-05-01T12:00:00.200Z', 'java/lang/String', 'hashCode', 4, 'PT0.002S', 250),
+    _compilation('2024-05-01T12:00:00.300Z', 'org/jacop/core/IntVar', 'dom', 4, 'PT0.01S', 0, succeeded = False),
+    ('jdk.CompilerInlining', {
+        'startTime' : '2024-05-01T12:00:00.200Z',
+        'caller'    : _method('java/lang/String', 'hashCode'),
+        'callee'    : { 'type' : 'java/lang/String', 'name' : 'isLatin1', 'descriptor' : '()Z' },
+        'succeeded' : True,
+        'message'   : 'inline (hot)',
+        'bci'       : 1
+    }),
+    ('jdk.CompilerInlining', {
+        'startTime' : '2024-05-01T12:00:00.200Z',
+        'caller'    : _method('java/lang/String', 'hashCode'),
+        'callee'    : { 'type' : 'java/lang/StringLatin1', 'name' : 'hashCode', 'descriptor' : '([B)I' },
+        'succeeded' : False,
+        'message'   : 'callee is too large',
+        'bci'       : 12
+    }),
+    ('jdk.Deoptimization', {
+        'startTime' : '2024-05-01T12:00:00.250Z',
+        'method'    : _method('java/lang/String', 'hashCode'),
+        'reason'    : 'unstable_if',
+        'action'    : 'reinterpret'
+    })
+]
+
+class TestCompilationMetrics(unittest.TestCase):
+
+    def test_duration(self):
+        self.assertAlmostEqual(365.715, collect_jfr_metrics.get_duration_ms('PT0.365715S'))
+        self.assertAlmostEqual(61000, collect_jfr_metrics.get_duration_ms('PT1M1S'))
+        self.assertEqual(0, collect_jfr_metrics.get_duration_ms('PT0S'))
+
+    def test_method_name(self):
+        self.assertEqual('java.lang.String::hashCode', collect_jfr_metrics.get_method_name(_method('java/lang/String', 'hashCode')))
+        self.assertEqual('java.lang.String::isLatin1', collect_jfr_metrics.get_method_name(_events[3][1]['callee']))
+
+    def test_metrics(self):
+        metrics = collect_jfr_metrics.get_compilation_metrics(_events)
+        self.assertEqual(2, metrics['compilations'])
+        self.assertEqual(1, metrics['failed_compilations'])
+        self.assertAlmostEqual(12.5, metrics['compile_time'])
+        self.assertEqual(650, metrics['code_size'])
+        self.assertEqual(20, metrics['inlined_bytes'])
+        self.assertEqual(1, metrics['inlined'])
+        self.assertEqual(1, metrics['not_inlined'])
+        self.assertEqual(1, metrics['deoptimizations'])
+        method = metrics['methods']['java.lang.String::hashCode']
+        self.assertEqual([ 3, 4 ], method['tiers'])
+        self.assertEqual(250, method['code_size'])
+        self.assertEqual(1, method['deoptimizations'])
+        self.assertEqual([ 4 ], metrics['methods']['org.jacop.core.IntVar::dom']['tiers'])
+        self.assertEqual(0, metrics['methods']['org.jacop.core.IntVar::dom']['code_size'])
+
+    def test_jfr_print(self):
+        # A fake 'jfr' prints the events in the format of 'jfr print --json'.
+        with tempfile.TemporaryDirectory() as tmp:
+            events = Path(tmp) / 'events.json'
+            with open(events, 'w') as f:
+                json.dump({ 'recording' : { 'events' : [ { 'type' : t, 'values' : v } for t, v in _events ] } }, f)
+            jfr = Path(tmp) / 'jfr'
+            with open(jfr, 'w') as f:
+                f.write(f"#!/bin/bash\ncat {events}\n")
+            jfr.chmod(0o755)
+            path = os.environ['PATH']
+            try:
+                os.environ['PATH'] = tmp + os.pathsep + path
+                metrics = collect_jfr_metrics.compilation_metrics('flight.jfr')
+            finally:
+                os.environ['PATH'] = path
+            self.assertEqual(collect_jfr_metrics.get_compilation_metrics(_events), metrics)
+
+    def test_jfr_print_fails(self):
+        with self.assertRaises(ValueError):
+            collect_jfr_metrics.get_events('/nonexistent/flight.jfr', [ 'jdk.Compilation' ])
+
+if __name__ == '__main__':
+    unittest.main()
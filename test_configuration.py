@@ -0,0 +1,106 @@
+#!/bin/env python3
+
+import json
+import tempfile
+import unittest
+
+from pathlib       import Path
+from unittest.mock import patch
+
+import run_benchmark as bm_script
+import tools
+
+from configuration import Configuration
+
+def _configuration(jvm_options = None):
+    config = Configuration()
+    config.bm('jacop')
+    config.bm_version('1.0')
+    config.bm_workload('mzc18_1')
+    config.source_version('8')
+    config.heap_size('2G')
+    if not jvm_options is None:
+        config.jvm_options(jvm_options)
+    return config
+
+class TestJvmOptionSets(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp  = tempfile.TemporaryDirectory()
+        self._path = Configuration._jvm_option_sets_path
+        Configuration._jvm_option_sets_path = Path(self._tmp.name) / 'jvm_options.config'
+        Configuration._jvm_option_sets      = None
+        with open(Configuration._jvm_option_sets_path, 'w') as f:
+            json.dump({
+                'parallel-gc' : [ '-XX:+UseParallelGC' ],
+                'no-inline'   : [ '-XX:MaxInlineSize=0', '-XX:FreqInlineSize=0' ],
+                'c1'          : [ '-XX:TieredStopAtLevel=1' ],
+                'bad'         : [ 'UseParallelGC' ],
+                'heap'        : [ '-Xmx4G' ],
+                'max-heap'    : [ '-XX:MaxHeapSize=4g' ],
+                'stack'       : [ '-XX:ThreadStackSize=2048' ]
+            }, f)
+
+    def tearDown(self):
+        Configuration._jvm_option_sets_path = self._path
+        Configuration._jvm_option_sets      = None
+        self._tmp.cleanup()
+
+    def test_options_are_passed_to_the_jvm(self):
+        self.assertEqual(['-Xmx2G'], bm_script.get_runtime_options(_configuration()))
+        self.assertEqual(['-Xmx2G'], bm_script.get_runtime_options(_configuration('default')))
+        self.assertEqual(['-Xmx2G', '-XX:MaxInlineSize=0', '-XX:FreqInlineSize=0'], bm_script.get_runtime_options(_configuration('no-inline')))
+
+    def test_params_id_is_stable(self):
+        self.assertEqual(_configuration().params_id(), _configuration().params_id())
+        self.assertEqual(_configuration('c1').params_id(), _configuration('c1').params_id())
+        self.assertNotEqual(_configuration().params_id(), _configuration('c1').params_id())
+        self.assertNotEqual(_configuration('parallel-gc').params_id(), _configuration('c1').params_id())
+
+    def test_option_set_axis(self):
+        config = Configuration().init_from_dict({ 'bm' : 'jacop', 'jvm_options' : ['default', 'parallel-gc', 'c1'] })
+        self.assertEqual(['default', 'parallel-gc', 'c1'], [ c.jvm_options() for c in config.get_all_combinations() ])
+
+    def test_constraints(self):
+        self.assertEqual([], Configuration.get_jvm_option_errors('no-inline'))
+        self.assertEqual(1, len(Configuration.get_jvm_option_errors('unknown')))
+        self.assertEqual(1, len(Configuration.get_jvm_option_errors('bad')))
+        self.assertEqual(1, len(Configuration.get_jvm_option_errors('heap')))
+        self.assertEqual(1, len(Configuration.get_jvm_option_errors('max-heap')))
+        self.assertEqual(1, len(Configuration.get_jvm_option_errors('stack')))
+        with self.assertRaises(ValueError) as e:
+            _configuration('heap')._raise_errors()
+        self.assertTrue(any([ "'-Xmx4G'" in error for error in e.exception.args[1] ]))
+
+class TestScalingParameters(unittest.TestCase):
+
+    def _errors(self, config):
+        try:
+            config._raise_errors()
+        except ValueError as e:
+            return e.args[1]
+        return []
+
+    def test_thread_axis(self):
+        config = Configuration().init_from_dict({ 'bm' : 'lusearch', 'threads' : ['1', '2', '4'] })
+        self.assertEqual(['1', '2', '4'], [ c.threads() for c in config.get_all_combinations() ])
+        self.assertEqual(3, len({ c.params_id() for c in config.get_all_combinations() }))
+
+    def test_constraints(self):
+        config = _configuration()
+        config.threads('0')
+        config.cpus('0')
+        errors = self._errors(config)
+        self.assertTrue(any([ "'threads'" in error for error in errors ]))
+        self.assertTrue(any([ "'cpus'" in error for error in errors ]))
+        config.threads('2')
+        config.cpus('1')
+        errors = self._errors(config)
+        self.assertFalse(any([ "'threads'" in error or "'cpus'" in error for error in errors ]))
+        # The available CPUs are checked when the benchmark runs.
+        config.cpus('3')
+        with patch.object(tools, 'get_available_cpus', lambda: [4, 5]):
+            self.assertFalse(any([ "'cpus'" in error for error in self._errors(config) ]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/bin/env python3
+
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import confirmation
+
+from configuration import Configuration
+
+class TestConfirmation(unittest.TestCase):
+
+    def test_baseline(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        key    = f"jacop-mzc18_1-{config.id()}"
+        self.assertEqual((1000.0, 10.0), confirmation.get_baseline({ key : 1000, key + '-mean' : 1000.0, key + '-std' : 10.0 }, config))
+        self.assertIsNone(confirmation.get_baseline({ key : 1000 }, config))
+
+    def test_outlier(self):
+        self.assertFalse(confirmation.is_outlier(1020, 1000, 10, 3))
+        self.assertTrue(confirmation.is_outlier(1040, 1000, 10, 3))
+        self.assertTrue(confirmation.is_outlier(960, 1000, 10, 3))
+        self.assertTrue(confirmation.is_outlier(1001, 1000, 0, 3))
+
+    def test_status(self):
+        self.assertEqual(confirmation.CONFIRMED, confirmation.get_status(1040, [1030, 1035, 1025, 1030], 1000, 10, 3))
+        self.assertEqual(confirmation.REFUTED, confirmation.get_status(1040, [1000, 1005, 995, 1002], 1000, 10, 3))
+        self.assertEqual(confirmation.REFUTED, confirmation.get_status(1040, [960, 965, 955, 960], 1000, 10, 3))
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Path(tmp)
+            self.assertIsNone(confirmation.load_status(store))
+            confirmation.store(store, 1040, [1030, 1035], 1000, 10, 3)
+            self.assertEqual(confirmation.CONFIRMED, confirmation.load_status(store))
+            confirmation.store(store, 1040, [1000, 1001], 1000, 10, 3)
+            self.assertEqual(confirmation.REFUTED, confirmation.load_status(store))
+            self.assertFalse((store / confirmation.CONFIRMED).exists())
+            with open(store / 'confirmation.json', 'r') as f:
+                self.assertEqual([1000, 1001], json.load(f)['forks'])
+
+    def test_failed_fork_is_inconclusive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Path(tmp)
+            confirmation.store(store, 1040, [1030, 1035], 1000, 10, 3)
+            confirmation.store(store, 1040, [1030], 1000, 10, 3, [ "Benchmark failed" ])
+            self.assertEqual(confirmation.INCONCLUSIVE, confirmation.load_status(store))
+            self.assertFalse((store / confirmation.CONFIRMED).exists())
+            with open(store / 'confirmation.json', 'r') as f:
+                self.assertEqual([ "Benchmark failed" ], json.load(f)['failures'])
+            confirmation.store(store, 1040, [], 1000, 10, 3, [ "Timeout" ])
+            self.assertEqual(confirmation.INCONCLUSIVE, confirmation.load_status(store))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import energy
+import run_benchmark as bm_script
+
+from configuration import Metrics
+
+def _write(path, text):
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with open(path, 'w') as f:
+        f.write(text + os.linesep)
+
+def _zone(root, zone, name, energy_uj, max_energy_uj = 262143328850):
+    _write(root / 'sys/class/powercap' / zone / 'name', name)
+    _write(root / 'sys/class/powercap' / zone / 'energy_uj', str(energy_uj))
+    _write(root / 'sys/class/powercap' / zone / 'max_energy_range_uj', str(max_energy_uj))
+
+class TestEnergy(unittest.TestCase):
+
+    def test_package_and_dram(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _zone(root, 'intel-rapl:0', 'package-0', 1000000)
+            _zone(root, 'intel-rapl:0:0', 'core', 500000)
+            _zone(root, 'intel-rapl:0:1', 'dram', 200000)
+            _zone(root, 'intel-rapl-mmio:0', 'package-0', 1000000)
+            before = energy.sample(root)
+            _zone(root, 'intel-rapl:0', 'package-0', 13500000)
+            _zone(root, 'intel-rapl:0:0', 'core', 9000000)
+            _zone(root, 'intel-rapl:0:1', 'dram', 2200000)
+            _zone(root, 'intel-rapl-mmio:0', 'package-0', 13500000)
+            after  = energy.sample(root)
+            self.assertEqual({
+                Metrics.ENERGY_PACKAGE : '12.5',
+                Metrics.ENERGY_DRAM    : '2.0'
+            }, energy.get_metrics(before, after))
+
+    def test_sockets_are_summed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _zone(root, 'intel-rapl:0', 'package-0', 0)
+            _zone(root, 'intel-rapl:1', 'package-1', 0)
+            before = energy.sample(root)
+            _zone(root, 'intel-rapl:0', 'package-0', 3000000)
+            _zone(root, 'intel-rapl:1', 'package-1', 4000000)
+            after  = energy.sample(root)
+            self.assertEqual({ 'package' : 7.0 }, energy.get_energy(before, after))
+
+    def test_wraparound(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _zone(root, 'intel-rapl:0', 'package-0', 9000000, 10000000)
+            before = energy.sample(root)
+            _zone(root, 'intel-rapl:0', 'package-0', 500000, 10000000)
+            after  = energy.sample(root)
+            self.assertEqual({ 'package' : 1.5 }, energy.get_energy(before, after))
+
+    def test_no_counters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self.assertEqual(dict(), energy.sample(root))
+            self.assertEqual(dict(), energy.get_metrics(energy.sample(root), energy.sample(root)))
+            self.assertEqual(dict(), energy.get_metrics(None, None))
+
+    def test_unreadable_counters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write(root / 'sys/class/powercap/intel-rapl:0/name', 'package-0')
+            self.assertEqual(dict(), energy.sample(root))
+
+    def test_measured_iteration_is_sampled(self):
+        samples = []
+        def sample_energy():
+            samples.append(len(samples))
+            return samples[-1]
+        monitor = bm_script.HarnessOutputMonitor(sample_energy = sample_energy)
+        monitor("===== DaCapo 23.11 jacop starting warmup 1 =====")
+        monitor("===== DaCapo 23.11 jacop completed warmup 1 in 3117 msec =====")
+        self.assertEqual([], samples)
+        monitor("===== DaCapo 23.11 jacop starting =====")
+        monitor("===== DaCapo 23.11 jacop PASSED in 2727 msec =====")
+        self.assertEqual(0, monitor.energy_before)
+        self.assertEqual(1, monitor.energy_after)
+
+if __name__ == '__main__':
+    unittest.main()
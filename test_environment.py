@@ -0,0 +1,98 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import environment
+
+def _write(path, text):
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with open(path, 'w') as f:
+        f.write(text + os.linesep)
+
+def _fake_root(root, load = '0.10 0.20 0.30 1/100 1234', temperature = '45000', java = False):
+    _write(root / 'proc/loadavg', load)
+    _write(root / 'proc/meminfo', os.linesep.join([
+        "MemTotal:       16000000 kB",
+        "MemFree:         8000000 kB",
+        "MemAvailable:   12000000 kB",
+        "Buffers:          100000 kB"
+    ]))
+    for cpu, frequency in [('cpu0', '3500000'), ('cpu1', '1200000')]:
+        _write(root / 'sys/devices/system/cpu' / cpu / 'cpufreq/scaling_cur_freq', frequency)
+        _write(root / 'sys/devices/system/cpu' / cpu / 'cpufreq/scaling_governor', 'performance')
+    _write(root / 'sys/class/thermal/thermal_zone0/type', 'x86_pkg_temp')
+    _write(root / 'sys/class/thermal/thermal_zone0/temp', temperature)
+    if java:
+        (root / 'proc/4242').mkdir()
+        with open(root / 'proc/4242/cmdline', 'wb') as f:
+            f.write(b'/opt/java/bin/java\0-jar\0dacapo.jar\0')
+
+class TestEnvironment(unittest.TestCase):
+
+    def test_sample(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _fake_root(root)
+            s = environment.sample(root)
+            self.assertEqual(1200, s['cpu']['frequency_min'])
+            self.assertEqual(3500, s['cpu']['frequency_max'])
+            self.assertEqual(['performance'], s['cpu']['governors'])
+            self.assertEqual(0.1, s['load']['load_1'])
+            self.assertEqual({ 'x86_pkg_temp' : 45 }, s['thermal'])
+            self.assertEqual(12000000, s['memory']['MemAvailable'])
+            self.assertEqual([], s['jvms'])
+
+    def test_missing_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'proc').mkdir()
+            s = environment.sample(Path(tmp))
+            self.assertEqual({ 'governors' : [] }, s['cpu'])
+            self.assertEqual(dict(), s['thermal'])
+
+    def test_noise(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _fake_root(root, load = '3.50 1.0 1.0 1/100 1234', temperature = '95000', java = True)
+            s          = environment.sample(root)
+            thresholds = environment.Thresholds(max_load = 1.0, max_temperature = 80, allow_jvms = False, governor = 'performance')
+            self.assertEqual(3, len(environment.get_noise(s, thresholds)))
+            self.assertEqual([], environment.get_noise(s, environment.Thresholds()))
+            # The load is not checked after benchmarks.
+            self.assertEqual(2, len(environment.get_noise(s, thresholds, check_load = False)))
+
+    def test_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _fake_root(root)
+            _write(root / 'proc/sys/kernel/hostname', 'bm1')
+            _write(root / 'proc/cpuinfo', os.linesep.join([
+                "processor\t: 0",
+                "model name\t: Intel(R) Core(TM) i7-8700 CPU @ 3.20GHz",
+                "processor\t: 1",
+                "model name\t: Intel(R) Core(TM) i7-8700 CPU @ 3.20GHz"
+            ]))
+            _write(root / 'sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq', '4600000')
+            _write(root / 'sys/devices/system/cpu/cpu0/cpufreq/scaling_max_freq', '1200000')
+            fingerprint = environment.get_fingerprint(root)
+            self.assertEqual('bm1', fingerprint['machine'])
+            self.assertEqual('Intel(R) Core(TM) i7-8700 CPU @ 3.20GHz', fingerprint['cpu'])
+            self.assertEqual(2, fingerprint['cpus'])
+            self.assertEqual(4600, fingerprint['cpufreq'])
+            self.assertEqual(1200, fingerprint['cpufreq_limit'])
+            self.assertEqual('performance', fingerprint['governor'])
+            self.assertEqual(15, fingerprint['memory'])
+            twin = { **fingerprint, 'machine' : 'bm2' }
+            self.assertNotEqual(environment.get_fingerprint_id(fingerprint), environment.get_fingerprint_id(twin))
+            self.assertEqual(
+                environment.get_fingerprint_id(fingerprint, environment.HARDWARE_KEYS),
+                environment.get_fingerprint_id(twin, environment.HARDWARE_KEYS)
+            )
+            pinned = { **fingerprint, 'cpufreq_limit' : 3500 }
+            self.assertNotEqual(environment.get_fingerprint_id(fingerprint), environment.get_fingerprint_id(pinned))
+
+if __name__ == '__main__':
+    unittest.main()
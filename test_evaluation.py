@@ -0,0 +1,177 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import unittest
+import zipfile
+
+from pathlib  import Path
+from types    import SimpleNamespace
+from unittest import mock
+
+import evaluation
+import patch
+import tools
+
+from configuration import Configuration
+
+def _write(path, text):
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+def _read_member(archive, name):
+    with zipfile.ZipFile(archive, 'r') as z:
+        return z.read(name).decode('utf-8')
+
+class TestPrimeImportLocation(unittest.TestCase):
+
+    def test_only_patched_archives_are_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp       = Path(tmp)
+            args      = SimpleNamespace(data = str(tmp / 'experiments'))
+            workspace = tmp / 'experiments' / 'x' / 'workspaces' / 'b' / 'w' / 'workspace'
+            data      = tmp / 'data'
+            location  = tmp / 'import'
+            workspace.mkdir(parents = True)
+            data.mkdir()
+            location.mkdir()
+
+            # Build archives: 'a' is refactored, 'b' is not.
+            for stem in ['a', 'b']:
+                sources = tmp / ('sources-' + stem)
+                _write(sources / 'src/main/java/p/A.java', "class A {}" + os.linesep)
+                _write(sources / 'src/main/java/p/B.java', "class B {}" + os.linesep)
+                tools.zip(sources, workspace / (stem + '-1.0-build.zip'))
+
+            # Create a patch the same way as the refactoring step does.
+            old = tmp / 'old'
+            new = tmp / 'new'
+            _write(old / 'p/A.java', "class A {}" + os.linesep)
+            _write(old / 'p/B.java', "class B {}" + os.linesep)
+            _write(new / 'p/A.java', "class A { int x; }" + os.linesep)
+            _write(new / 'p/B.java', "class B {}" + os.linesep)
+            _write(new / 'p/C.java', "class C {}" + os.linesep)
+            tools.zip(old, tmp / 'old.jar.zip')
+            tools.zip(new, tmp / 'new.jar.zip')
+            patch.create_patch(tmp / 'old.jar.zip', tmp / 'new.jar.zip', data / 'a-1.0-main-src.jar.patch')
+            self.assertEqual(['p/A.java', 'p/C.java'], sorted(patch.get_patched_files(data / 'a-1.0-main-src.jar.patch')))
+
+            configuration = Configuration()
+            configuration.bm('b')
+            configuration.bm_workload('w')
+            evaluation.prime_import_location(args, 'x', configuration, location, data)
+
+            a = location / 'a-1.0-build.zip'
+            b = location / 'b-1.0-build.zip'
+            self.assertEqual("class A { int x; }" + os.linesep, _read_member(a, 'src/main/java/p/A.java'))
+            self.assertEqual("class B {}" + os.linesep, _read_member(a, 'src/main/java/p/B.java'))
+            self.assertEqual("class C {}" + os.linesep, _read_member(a, 'src/main/java/p/C.java'))
+            self.assertFalse(os.path.samefile(workspace / 'b-1.0-build.zip', b))
+            self.assertEqual((workspace / 'b-1.0-build.zip').read_bytes(), b.read_bytes())
+            self.assertEqual(['a-1.0-build.zip', 'b-1.0-build.zip'], sorted(os.listdir(location)))
+
+    def test_patches_of_several_refactorings_are_combined(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp       = Path(tmp)
+            args      = SimpleNamespace(data = str(tmp / 'experiments'))
+            workspace = tmp / 'experiments' / 'x' / 'workspaces' / 'b' / 'w' / 'workspace'
+            location  = tmp / 'import'
+            workspace.mkdir(parents = True)
+            location.mkdir()
+
+            sources = tmp / 'sources'
+            _write(sources / 'src/main/java/p/A.java', "class A {}" + os.linesep)
+            _write(sources / 'src/main/java/p/B.java', "class B {}" + os.linesep)
+            tools.zip(sources, workspace / 'a-1.0-build.zip')
+
+            # Two refactorings that patch disjoint files.
+            datas = []
+            for name in ['A', 'B']:
+                old  = tmp / name / 'old'
+                new  = tmp / name / 'new'
+                data = tmp / name / 'data'
+                _write(old / f"p/{name}.java", f"class {name} {{}}" + os.linesep)
+                _write(new / f"p/{name}.java", f"class {name} {{ int x; }}" + os.linesep)
+                data.mkdir()
+                tools.zip(old, tmp / name / 'old.jar.zip')
+                tools.zip(new, tmp / name / 'new.jar.zip')
+                patch.create_patch(tmp / name / 'old.jar.zip', tmp / name / 'new.jar.zip', data / 'a-1.0-main-src.jar.patch')
+                datas.append(data)
+
+            configuration = Configuration()
+            configuration.bm('b')
+            configuration.bm_workload('w')
+            evaluation.prime_import_location(args, 'x', configuration, location, datas)
+
+            a = location / 'a-1.0-build.zip'
+            self.assertEqual("class A { int x; }" + os.linesep, _read_member(a, 'src/main/java/p/A.java'))
+            self.assertEqual("class B { int x; }" + os.linesep, _read_member(a, 'src/main/java/p/B.java'))
+
+class TestSmokeWorkload(unittest.TestCase):
+
+    def _configuration(self, bm, workload):
+        config = Configuration()
+        config.bm(bm)
+        config.bm_version('1.0')
+        config.bm_workload(workload)
+        return config
+
+    def test_smallest_valid_workload(self):
+        args = SimpleNamespace(smoke_workload = None)
+        self.assertEqual('small', evaluation.get_smoke_workload(args, self._configuration('lusearch', 'default')))
+        self.assertIsNone(evaluation.get_smoke_workload(args, self._configuration('lusearch', 'small')))
+        self.assertIsNone(evaluation.get_smoke_workload(args, self._configuration('jacop', 'mzc18_1')))
+
+    def test_specified_workload(self):
+        args = SimpleNamespace(smoke_workload = 'mzc18_2')
+        self.assertEqual('mzc18_2', evaluation.get_smoke_workload(args, self._configuration('jacop', 'mzc18_1')))
+        self.assertIsNone(evaluation.get_smoke_workload(args, self._configuration('lusearch', 'default')))
+
+class TestJITDiff(unittest.TestCase):
+
+    def test_failure_does_not_fail_the_measurement(self):
+        args = SimpleNamespace(jit_diff = True)
+        def fail(error):
+            def diff_jit(*args):
+                raise error
+            return diff_jit
+        with mock.patch.object(evaluation, 'diff_jit', fail(ValueError("Benchmark failed."))):
+            evaluation.record_jit_diff(args, 'x', Configuration(), Path('deployment'), Path('store'), Path('data'))
+        with mock.patch.object(evaluation, 'diff_jit', fail(TypeError())):
+            with self.assertRaises(TypeError):
+                evaluation.record_jit_diff(args, 'x', Configuration(), Path('deployment'), Path('store'), Path('data'))
+
+class TestQuietMachine(unittest.TestCase):
+
+    def _args(self, max_load = None):
+        return SimpleNamespace(max_load = max_load, max_temperature = None, exclusive = False, governor = None, quiet_wait = 0)
+
+    def test_noisy_measurements_are_measured_again(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Path(tmp)
+            with mock.patch.object(evaluation.environment, 'wait_until_quiet', lambda thresholds, timeout: [ "load 4.0 > 1.0" ]):
+                self.assertIsNone(evaluation.sample_quiet_machine(self._args(1.0), store))
+            self.assertEqual("load 4.0 > 1.0" + os.linesep, (store / 'NOISY').read_text())
+            (store / 'SUCCESS').touch()
+            self.assertFalse(evaluation.is_measured(store))
+            self.assertIsNotNone(evaluation.sample_quiet_machine(self._args(), store))
+            self.assertFalse(evaluation.is_noisy(store))
+            self.assertTrue(evaluation.is_measured(store))
+
+class TestAvailableCPUs(unittest.TestCase):
+
+    def test_measurement_is_left_to_other_hosts(self):
+        config = Configuration()
+        config.bm('lusearch')
+        config.bm_workload('default')
+        config.cpus('4')
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp)
+            with mock.patch.object(evaluation.tools, 'get_available_cpus', lambda: [0, 1]):
+                self.assertFalse(evaluation.build_and_benchmark(SimpleNamespace(), 'x', config, data))
+                self.assertFalse(evaluation.build_and_benchmark_paired(SimpleNamespace(), 'x', config, data, 1))
+            self.assertEqual([], os.listdir(data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import gc_logs
+
+from configuration import Configuration, Metrics
+
+_g1_log = [
+    "[1000ms][gc,init     ] Version: 21.0.2+13-LTS (release)",
+    "[1010ms][gc,start    ] GC(0) Pause Young (Normal) (G1 Evacuation Pause)",
+    "[1012ms][gc          ] GC(0) Pause Young (Normal) (G1 Evacuation Pause) 24M->4M(256M) 2.000ms",
+    "[1012ms][gc,cpu      ] GC(0) User=0.01s Sys=0.00s Real=0.00s",
+    "[2100ms][gc,start    ] GC(1) Pause Young (Normal) (G1 Evacuation Pause)",
+    "[2103ms][gc,heap     ] GC(1) Eden regions: 12->0(14)",
+    "[2103ms][gc,metaspace] GC(1) Metaspace: 700K(896K)->700K(896K) NonClass: 600K(704K)->600K(704K)",
+    "[2105ms][gc          ] GC(1) Pause Young (Normal) (G1 Evacuation Pause) 30M->6M(256M) 5.500ms",
+    "[2105ms][gc,cpu      ] GC(1) User=0.02s Sys=0.01s Real=0.01s",
+    "[2200ms][gc          ] GC(2) Concurrent Mark Cycle 20.100ms",
+    "[2300ms][gc          ] GC(2) Pause Remark 40M->40M(256M) 1.500ms",
+    "[3100ms][gc          ] GC(3) Pause Young (Normal) (G1 Evacuation Pause) 50M->8M(256M) 3.000ms",
+    "[3100ms][gc,cpu      ] GC(3) User=0.03s Sys=0.00s Real=0.01s",
+    "Not a log line"
+]
+
+_zgc_log = [
+    "[2010ms][gc,start    ] GC(0) Garbage Collection (Warmup)",
+    "[2011ms][gc,phases   ] GC(0) Pause Mark Start 0.010ms",
+    "[2020ms][gc,phases   ] GC(0) Pause Mark End 0.020ms",
+    "[2030ms][gc          ] GC(0) Garbage Collection (Warmup) 42M(1%)->28M(1%)"
+]
+
+class TestGCLogs(unittest.TestCase):
+
+    def test_g1_iterations(self):
+        iterations = gc_logs.summarize(gc_logs.parse(_g1_log), [ 2000, 3000 ])
+        self.assertEqual(2, len(iterations))
+        self.assertEqual(2, iterations[0]['pauses'])
+        self.assertEqual(7.0, iterations[0]['pause_time'])
+        self.assertEqual(5.5, iterations[0]['max_pause'])
+        self.assertEqual(30.0, iterations[0]['cpu_time'])
+        self.assertEqual(40 * 1024, iterations[0]['heap_after'])
+        self.assertEqual(1, iterations[1]['pauses'])
+        self.assertEqual(8 * 1024, iterations[1]['heap_after'])
+
+    def test_startup_is_ignored(self):
+        iterations = gc_logs.summarize(gc_logs.parse(_g1_log), [ 3000 ])
+        self.assertEqual(1, iterations[0]['pauses'])
+        self.assertEqual(3.0, iterations[0]['pause_time'])
+
+    def test_zgc(self):
+        iterations = gc_logs.summarize(gc_logs.parse(_zgc_log), [ 2000 ])
+        self.assertEqual(2, iterations[0]['pauses'])
+        self.assertAlmostEqual(0.03, iterations[0]['pause_time'])
+        self.assertEqual(28 * 1024, iterations[0]['heap_after'])
+
+    def test_metrics_of_measured_iteration(self):
+        metrics = gc_logs.get_metrics(gc_logs.summarize(gc_logs.parse(_g1_log), [ 2000, 3000 ]))
+        self.assertEqual({
+            Metrics.GC_PAUSES     : '1',
+            Metrics.GC_PAUSE_TIME : '3.0',
+            Metrics.GC_MAX_PAUSE  : '3.0',
+            Metrics.GC_CPU_TIME   : '30.0',
+            Metrics.GC_HEAP_AFTER : str(8 * 1024)
+        }, metrics)
+        Metrics().init_from_dict(metrics)
+        self.assertEqual(dict(), gc_logs.get_metrics([]))
+
+    def test_no_gc(self):
+        metrics = gc_logs.get_metrics(gc_logs.summarize([], [ 1000 ]))
+        self.assertEqual('0', metrics[Metrics.GC_PAUSES])
+        self.assertFalse(Metrics.GC_HEAP_AFTER in metrics)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / 'gc.log'
+            with open(log, 'w') as f:
+                f.write('\n'.join(_g1_log) + '\n')
+            self.assertEqual(gc_logs.parse(_g1_log), gc_logs.load(log))
+
+    def test_is_supported(self):
+        self.assertFalse(gc_logs.is_supported(Configuration().jre('8.0.412-tem')))
+        self.assertTrue(gc_logs.is_supported(Configuration().jre('21.0.2-tem')))
+
+if __name__ == '__main__':
+    unittest.main()
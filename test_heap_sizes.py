@@ -0,0 +1,53 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import heap_sizes
+import run_benchmark as bm_script
+
+from configuration import Configuration
+
+def _configuration(heap_size):
+    config = Configuration()
+    config.bm('xalan')
+    config.bm_workload('default')
+    config.jre('17.0.14-tem')
+    config.heap_size(heap_size)
+    return config
+
+class TestHeapSizes(unittest.TestCase):
+
+    def test_search(self):
+        runs   = []
+        passes = lambda mb: runs.append(mb) or mb >= 300
+        self.assertEqual(300, heap_sizes.search(passes, 8, 1024, 1))
+        self.assertTrue(len(runs) <= 12)
+        self.assertTrue(abs(300 - heap_sizes.search(passes, 8, 1024, 16)) <= 16)
+        with self.assertRaises(ValueError):
+            heap_sizes.search(lambda mb: False, 8, 1024)
+
+    def test_resolve(self):
+        min_heaps = { 'xalan-default-17.0.14-tem' : 100 }
+        self.assertEqual('2G', heap_sizes.resolve(_configuration('2G'), min_heaps))
+        self.assertEqual('200M', heap_sizes.resolve(_configuration('2x'), min_heaps))
+        self.assertEqual('150M', heap_sizes.resolve(_configuration('1.5x'), min_heaps))
+        config = _configuration('4x')
+        config.jvm_options('parallel-gc')
+        with self.assertRaises(ValueError):
+            heap_sizes.resolve(config, min_heaps)
+
+    def test_runtime_options(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = heap_sizes._min_heap_path
+            try:
+                heap_sizes._min_heap_path = Path(tmp) / 'min_heap.txt'
+                heap_sizes.store({ 'xalan-default-17.0.14-tem' : 64 })
+                self.assertEqual(['-Xmx256M'], bm_script.get_runtime_options(_configuration('4x')))
+            finally:
+                heap_sizes._min_heap_path = path
+
+if __name__ == '__main__':
+    unittest.main()
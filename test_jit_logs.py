@@ -0,0 +1,86 @@
+#!/bin/env python3
+
+import unittest
+
+import jit_logs
+
+_baseline = [
+    "===== DaCapo 23.11 jacop starting =====",
+    "    112   12       3       java.lang.String::hashCode (60 bytes)",
+    "                              @ 1   java.lang.String::isLatin1 (19 bytes)   inline (hot)",
+    "    120   13       4       org.jacop.core.IntVar::dom (120 bytes)",
+    "                              @ 5   org.jacop.core.IntVar::size (8 bytes)   inline (hot)",
+    "                              @ 12   org.jacop.core.Domain::check (400 bytes)   callee is too large",
+    "    130   14 %     4       org.jacop.core.IntVar$1::run @ 12 (80 bytes)",
+    "     34    5     n 0       java.lang.invoke.MethodHandle::linkToStatic(LLLLLLL)L (native)   (static)",
+    "    200   12       3       java.lang.String::hashCode (60 bytes)   made not entrant",
+    "===== DaCapo 23.11 jacop PASSED in 2727 msec ====="
+]
+
+_refactored = [
+    "    112   12       3       java.lang.String::hashCode (60 bytes)",
+    "                              @ 1   java.lang.String::isLatin1 (19 bytes)   inline (hot)",
+    "    120   13       4       org.jacop.core.IntVar::dom (30 bytes)",
+    "                              @ 5   org.jacop.core.IntVar::size (8 bytes)   inline (hot)",
+    "                              @ 12   org.jacop.core.IntVar::domExtracted (95 bytes)   inline (hot)",
+    "    130   14 %     4       org.jacop.core.IntVar$1::run @ 12 (80 bytes)",
+    "    140   15       4       org.jacop.core.Store::consistency (300 bytes)",
+    "                              @ 40   org.jacop.core.Domain::check (400 bytes)   callee is too large"
+]
+
+class TestJITLogs(unittest.TestCase):
+
+    def test_parse(self):
+        summary = jit_logs.parse(_baseline)
+        self.assertEqual({ 'tier' : 3, 'bytes' : 60, 'compilations' : 1, 'not_entrant' : 1 }, summary['methods']['java.lang.String::hashCode'])
+        self.assertEqual({ 'tier' : 4, 'bytes' : 80, 'compilations' : 1, 'not_entrant' : 0 }, summary['methods']['org.jacop.core.IntVar$1::run'])
+        self.assertEqual({
+            'org.jacop.core.IntVar::size'  : 'inline (hot)',
+            'org.jacop.core.Domain::check' : 'callee is too large'
+        }, summary['inlining']['org.jacop.core.IntVar::dom (tier 4)'])
+        self.assertFalse('java.lang.invoke.MethodHandle::linkToStatic(LLLLLLL)L' in summary['methods'])
+
+    def test_get_classes(self):
+        self.assertEqual({ 'org.jacop.core.IntVar' }, jit_logs.get_classes([ 'org/jacop/core/IntVar.java', 'META-INF/MANIFEST.MF' ]))
+
+    def test_is_touched(self):
+        classes = { 'org.jacop.core.IntVar' }
+        self.assertTrue(jit_logs.is_touched('org.jacop.core.IntVar::dom', classes))
+        self.assertTrue(jit_logs.is_touched('org.jacop.core.IntVar$1::run', classes))
+        self.assertFalse(jit_logs.is_touched('org.jacop.core.IntVarSet::dom', classes))
+
+    def test_diff(self):
+        diff = jit_logs.diff(jit_logs.parse(_baseline), jit_logs.parse(_refactored), { 'org.jacop.core.IntVar' })
+        self.assertEqual([ 'org.jacop.core.IntVar::dom' ], sorted(diff['methods'].keys()))
+        self.assertEqual(120, diff['methods']['org.jacop.core.IntVar::dom']['baseline']['bytes'])
+        self.assertEqual(30, diff['methods']['org.jacop.core.IntVar::dom']['refactored']['bytes'])
+        self.assertEqual({
+            'org.jacop.core.IntVar::dom (tier 4) -> org.jacop.core.Domain::check'        : { 'baseline' : 'callee is too large', 'refactored' : None },
+            'org.jacop.core.IntVar::dom (tier 4) -> org.jacop.core.IntVar::domExtracted' : { 'baseline' : None, 'refactored' : 'inline (hot)' }
+        }, diff['inlining'])
+
+    def test_inlining_per_tier(self):
+        summary = jit_logs.parse([
+            "    100   10       3       org.jacop.core.IntVar::dom (120 bytes)",
+            "                              @ 5   org.jacop.core.IntVar::size (8 bytes)   inline",
+            "    150   11       4       org.jacop.core.IntVar::dom (120 bytes)",
+            "                              @ 5   org.jacop.core.IntVar::size (8 bytes)   inline (hot)",
+            "    151   10       3       org.jacop.core.IntVar::dom (120 bytes)   made not entrant"
+        ])
+        self.assertEqual({ 'org.jacop.core.IntVar::size' : 'inline' }, summary['inlining']['org.jacop.core.IntVar::dom (tier 3)'])
+        self.assertEqual({ 'org.jacop.core.IntVar::size' : 'inline (hot)' }, summary['inlining']['org.jacop.core.IntVar::dom (tier 4)'])
+        # Tier-up, not a deoptimization.
+        self.assertEqual(1, summary['methods']['org.jacop.core.IntVar::dom']['not_entrant'])
+
+    def test_counts_are_not_compared(self):
+        baseline   = jit_logs.parse(_baseline)
+        refactored = jit_logs.parse(_baseline + [ "    300   16       3       org.jacop.core.IntVar::dom (120 bytes)" ])
+        self.assertEqual(2, refactored['methods']['org.jacop.core.IntVar::dom']['compilations'])
+        self.assertEqual(dict(), jit_logs.diff(baseline, refactored, { 'org.jacop.core.IntVar' })['methods'])
+
+    def test_no_diff(self):
+        summary = jit_logs.parse(_baseline)
+        self.assertEqual({ 'methods' : dict(), 'inlining' : dict() }, jit_logs.diff(summary, summary, { 'org.jacop.core.IntVar' }))
+
+if __name__ == '__main__':
+    unittest.main()
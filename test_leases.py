@@ -0,0 +1,66 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import time
+import unittest
+
+from multiprocessing import Pool
+from pathlib         import Path
+
+import leases
+
+def _claim_all(location, n):
+    claimed = []
+    for i in range(n):
+        if leases.Lease(Path(location) / f"{i}.lease", 60).acquire():
+            claimed.append(i)
+    return claimed
+
+class TestLeases(unittest.TestCase):
+
+    def test_lease_is_exclusive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'x.lease'
+            a    = leases.Lease(path, 60)
+            b    = leases.Lease(path, 60)
+            self.assertTrue(a.acquire())
+            self.assertFalse(b.acquire())
+            self.assertTrue(leases.is_leased(path))
+            a.release()
+            self.assertFalse(leases.is_leased(path))
+            self.assertTrue(b.acquire())
+
+    def test_expired_lease_is_reclaimed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'x.lease'
+            a    = leases.Lease(path, 0.1)
+            b    = leases.Lease(path, 0.1)
+            self.assertTrue(a.acquire())
+            time.sleep(0.2)
+            self.assertTrue(b.acquire())
+            self.assertTrue(b.is_held())
+            self.assertFalse(a.is_held())
+            self.assertEqual(['x.lease'], os.listdir(tmp))
+
+    def test_heartbeat_keeps_lease(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'x.lease'
+            a    = leases.Lease(path, 0.3)
+            self.assertTrue(a.acquire())
+            a.start_heartbeat(0.05)
+            time.sleep(0.6)
+            self.assertFalse(leases.Lease(path, 0.3).acquire())
+            a.release()
+            self.assertFalse(path.exists())
+
+    def test_processes_claim_each_item_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            n = 200
+            with Pool(4) as pool:
+                results = pool.starmap(_claim_all, [ (tmp, n) ] * 4)
+            claimed = [ i for result in results for i in result ]
+            self.assertEqual(list(range(n)), sorted(claimed))
+
+if __name__ == '__main__':
+    unittest.main()
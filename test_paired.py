@@ -0,0 +1,34 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import paired
+
+class TestPaired(unittest.TestCase):
+
+    def test_order_alternates(self):
+        self.assertEqual([paired.BASELINE, paired.REFACTORED], paired.get_order(0))
+        self.assertEqual([paired.REFACTORED, paired.BASELINE], paired.get_order(1))
+
+    def test_pairs_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / 'pairs.txt'
+            for i, (a, b) in enumerate([(100, 90), (110, 100)]):
+                paired.Pair(i, paired.get_order(i), a, b).append_to(file)
+            pairs = paired.load_pairs(file)
+            self.assertEqual([100, 110], [ p.baseline for p in pairs ])
+            self.assertEqual([90, 100], [ p.refactored for p in pairs ])
+
+    def test_summary(self):
+        pairs   = [ paired.Pair(0, paired.get_order(0), 100, 90), paired.Pair(1, paired.get_order(1), 110, 100) ]
+        summary = paired.summarize(pairs)
+        self.assertEqual(2, summary['n'])
+        self.assertEqual(-10, summary['difference_mean'])
+        self.assertEqual(0, summary['difference_std'])
+        self.assertAlmostEqual((100 / 90 + 110 / 100) / 2, summary['speedup_mean'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/bin/env python3
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import planner
+
+from configuration import Configuration
+
+def _configuration(bm, workload = 'default', heap_size = None):
+    config = Configuration()
+    config.bm(bm)
+    config.bm_version('1.0')
+    config.bm_workload(workload)
+    if not heap_size is None:
+        config.heap_size(heap_size)
+    return config
+
+def _log_line(bm, seconds, params_id = None):
+    location = f"/home/x/experiments/x1/data/{bm}/opp/ref/exec"
+    duration = datetime.timedelta(seconds = seconds)
+    line     = f"2025-01-01 00:00:00.000000+01:00: duration: {duration} {location}"
+    if not params_id is None:
+        line = line + f" {params_id}"
+    return line + os.linesep
+
+class TestPlanner(unittest.TestCase):
+
+    def test_parse_budget(self):
+        self.assertEqual(8 * 3600, planner.parse_budget('8h'))
+        self.assertEqual(90 * 60, planner.parse_budget('90m'))
+        self.assertEqual(5400, planner.parse_budget('1h30m'))
+        self.assertEqual(600, planner.parse_budget('600'))
+        with self.assertRaises(ValueError):
+            planner.parse_budget('soon')
+
+    def test_cost_estimates(self):
+        a = _configuration('jacop')
+        b = _configuration('jacop', heap_size = '1g')
+        c = _configuration('batik')
+        d = _configuration('xalan')
+        with tempfile.TemporaryDirectory() as tmp:
+            logfile = Path(tmp) / 'benchmarking.log'
+            with open(logfile, 'w') as f:
+                f.write(_log_line('jacop', 100))                        # Old format without configuration.
+                f.write(_log_line('jacop', 300, a.params_id()))
+                f.write(_log_line('jacop', 500, a.params_id()))
+                f.write("garbage" + os.linesep)
+            durations = planner.load_durations(logfile)
+            self.assertEqual(3, len(durations))
+            model = planner.CostModel(durations, { f"batik-default-{c.id()}-mean" : 2000.0 })
+            self.assertEqual(400, model.estimate(a))                    # Same configuration.
+            self.assertEqual(300, model.estimate(b))                    # Same benchmark.
+            self.assertEqual(100 + 10 * 2, model.estimate(c))           # Build plus baseline runtime.
+            self.assertEqual(300, model.estimate(d))                    # Any benchmark.
+        self.assertEqual(planner.DEFAULT_COST, planner.CostModel([]).estimate(d))
+
+    def test_shortest_job_first(self):
+        items = [ ('a', 30, 1), ('a', 10, 2), ('b', 20, 3), ('b', 50, 4) ]
+        plan  = planner.order_items(items, 60, planner.COUNT)
+        self.assertEqual([2, 3, 1], [ item for (t, cost, item) in plan ])
+
+    def test_coverage(self):
+        items = [ ('a', 10, 1), ('a', 10, 2), ('a', 10, 3), ('b', 40, 4), ('c', 100, 5) ]
+        plan  = planner.order_items(items, 70, planner.COVERAGE)
+        self.assertEqual([1, 4, 2, 3], [ item for (t, cost, item) in plan ])
+
+    def test_progress(self):
+        t0       = datetime.datetime(2025, 1, 1, 0, 0, 0)
+        plan     = [ ('a', 100, 1), ('a', 100, 2), ('a', 100, 3) ]
+        progress = planner.Progress(plan, 1000, now = t0)
+        progress.done(100, 200)                                         # Twice as slow as estimated.
+        now = t0 + datetime.timedelta(seconds = 200)
+        self.assertEqual(2.0, progress.ratio())
+        self.assertEqual(now + datetime.timedelta(seconds = 400), progress.eta(now))
+        self.assertFalse(progress.is_over_budget(100, now))
+        self.assertTrue(progress.is_over_budget(450, now))
+        self.assertIn("1/3", progress.report(now))
+
+if __name__ == '__main__':
+    unittest.main()
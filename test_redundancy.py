@@ -0,0 +1,45 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import redundancy
+
+class TestRedundancy(unittest.TestCase):
+
+    def test_baseline_equivalence(self):
+        self.assertTrue(redundancy.is_baseline_equivalent((1000, 10), (1002, 10), 10, 0.02))
+        self.assertFalse(redundancy.is_baseline_equivalent((1000, 10), (1100, 10), 10, 0.02))
+        self.assertFalse(redundancy.is_baseline_equivalent((1000, 100), (1000, 100), 10, 0.02)) # Too noisy to tell.
+
+    def test_effect_equivalence(self):
+        a = { 'r1' : 0.10, 'r2' : -0.05, 'r3' : 0.00, 'r4' : 0.02 }
+        b = { 'r1' : 0.101, 'r2' : -0.049, 'r3' : 0.001, 'r4' : 0.021 }
+        c = { 'r1' : 0.20, 'r2' : 0.05, 'r3' : 0.10, 'r4' : 0.12 }
+        self.assertTrue(redundancy.is_effect_equivalent(a, b))
+        self.assertFalse(redundancy.is_effect_equivalent(a, c))
+        self.assertIsNone(redundancy.is_effect_equivalent(a, { 'r1' : 0.1 }))
+
+    def test_find_redundant(self):
+        baselines = { 'a' : (1000, 5), 'b' : (1001, 5), 'c' : (1200, 5) }
+        effects   = { 'a' : { 'r1' : 0.1, 'r2' : 0.0, 'r3' : -0.1 }, 'b' : { 'r1' : 0.3, 'r2' : 0.2, 'r3' : 0.1 } }
+        self.assertEqual(dict(), redundancy.find_redundant(['a', 'b', 'c', 'd'], baselines, effects, 10))
+        self.assertEqual({ 'b' : 'a' }, redundancy.find_redundant(['a', 'b', 'c', 'd'], baselines, dict(), 10))
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(dict(), redundancy.load(tmp))
+            redundancy.store(tmp, { 'b' : 'a' })
+            self.assertEqual({ 'b' : 'a' }, redundancy.load(tmp))
+
+    def test_sampling(self):
+        keys    = [ ('jacop', 'o', f"r{i}", 'e', 'p') for i in range(1000) ]
+        sampled = [ k for k in keys if redundancy.is_sampled(k, 0.1) ]
+        self.assertTrue(50 < len(sampled) < 150)
+        self.assertEqual(sampled, [ k for k in keys if redundancy.is_sampled(k, 0.1) ])
+        self.assertTrue(all([ redundancy.is_sampled(k, 1.0) for k in keys ]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/bin/env python3
+
+import os
+import resource
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import resource_usage
+
+from configuration import Metrics
+
+def _write(path, text):
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with open(path, 'w') as f:
+        f.write(text + os.linesep)
+
+def _cpu_stat(usage, user, system, throttled):
+    return os.linesep.join([
+        f"usage_usec {usage}",
+        f"user_usec {user}",
+        f"system_usec {system}",
+        "nr_periods 10",
+        "nr_throttled 2",
+        f"throttled_usec {throttled}"
+    ])
+
+class TestResourceUsage(unittest.TestCase):
+
+    def test_rusage_metrics(self):
+        metrics = resource_usage.get_rusage_metrics(resource.getrusage(resource.RUSAGE_SELF))
+        self.assertEqual(7, len(metrics))
+        self.assertGreater(int(metrics[Metrics.USER_TIME]), 0)
+        self.assertGreater(int(metrics[Metrics.MAX_RSS]), 0)
+        # Metrics are stored in 'metrics.txt'.
+        self.assertEqual(metrics[Metrics.MAX_RSS], Metrics().init_from_dict(metrics)._values[Metrics.MAX_RSS])
+
+    def test_no_rusage(self):
+        self.assertEqual(dict(), resource_usage.get_rusage_metrics(None))
+
+    def test_cgroup_metrics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root   = Path(tmp)
+            cgroup = root / 'sys/fs/cgroup/user.slice/session-1.scope'
+            _write(root / 'proc/self/cgroup', '0::/user.slice/session-1.scope')
+            _write(cgroup / 'cpu.stat', _cpu_stat(1000000, 700000, 300000, 0))
+            before = resource_usage.sample_cgroup(root)
+            _write(cgroup / 'cpu.stat', _cpu_stat(3500000, 2700000, 800000, 250000))
+            after  = resource_usage.sample_cgroup(root)
+            self.assertEqual(cgroup, resource_usage.get_cgroup(root))
+            self.assertEqual({
+                Metrics.CGROUP_CPU_TIME       : '2500',
+                Metrics.CGROUP_USER_TIME      : '2000',
+                Metrics.CGROUP_SYSTEM_TIME    : '500',
+                Metrics.CGROUP_THROTTLED_TIME : '250'
+            }, resource_usage.get_cgroup_metrics(before, after))
+
+    def test_cgroup_v1_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write(root / 'proc/self/cgroup', os.linesep.join([
+                "12:cpu,cpuacct:/user.slice",
+                "1:name=systemd:/user.slice/session-1.scope"
+            ]))
+            self.assertIsNone(resource_usage.get_cgroup(root))
+            self.assertEqual(dict(), resource_usage.sample_cgroup(root))
+            self.assertEqual(dict(), resource_usage.get_cgroup_metrics(dict(), dict()))
+
+    def test_no_cgroup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(dict(), resource_usage.sample_cgroup(Path(tmp)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib       import Path
+from unittest.mock import patch
+
+import run_benchmark as bm_script
+
+from configuration import Configuration
+
+class TestHarnessOutputMonitor(unittest.TestCase):
+
+    def test_passed(self):
+        monitor = bm_script.HarnessOutputMonitor()
+        monitor("===== DaCapo 23.11 jacop starting warmup 1 =====")
+        monitor("===== DaCapo 23.11 jacop completed warmup 1 in 3117 msec =====")
+        monitor("===== DaCapo 23.11 jacop starting =====")
+        monitor("===== DaCapo 23.11 jacop PASSED in 2727 msec =====")
+        self.assertEqual('2727', monitor.execution_time)
+        self.assertEqual(['3117', '2727'], monitor.iterations)
+
+    def test_iteration_starts(self):
+        monitor = bm_script.HarnessOutputMonitor()
+        monitor("===== DaCapo 23.11 jacop starting warmup 1 =====")
+        monitor("===== DaCapo 23.11 jacop completed warmup 1 in 3117 msec =====")
+        monitor("===== DaCapo 23.11 jacop starting =====")
+        monitor("===== DaCapo 23.11 jacop PASSED in 2727 msec =====")
+        self.assertEqual(2, len(monitor.iteration_starts))
+        self.assertLessEqual(monitor.iteration_starts[0], monitor.iteration_starts[1])
+
+    def test_failure_raises_immediately(self):
+        monitor = bm_script.HarnessOutputMonitor()
+        monitor("===== DaCapo 23.11 jacop starting warmup 1 =====")
+        with self.assertRaises(ValueError):
+            monitor("===== DaCapo 23.11 jacop FAILED warmup =====")
+        self.assertIsNone(monitor.execution_time)
+
+    def test_failed_in_other_output_is_ignored(self):
+        monitor = bm_script.HarnessOutputMonitor()
+        monitor("Constraint FAILED in search")
+        monitor("    112   12       3       org.example.FAILED::check (60 bytes)")
+        monitor("===== DaCapo 23.11 jacop PASSED in 2727 msec =====")
+        self.assertEqual('2727', monitor.execution_time)
+
+    def test_iterations_are_written_incrementally(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            iterations = Path(tmp) / 'iterations.txt'
+            monitor    = bm_script.HarnessOutputMonitor(iterations)
+            monitor("===== DaCapo 23.11 jacop completed warmup 1 in 3117 msec =====")
+            with open(iterations, 'r') as f:
+                self.assertEqual(['1=3117'], [ line.strip() for line in f ])
+            monitor("===== DaCapo 23.11 jacop completed warmup 2 in 3001 msec =====")
+            with open(iterations, 'r') as f:
+                self.assertEqual(['1=3117', '2=3001'], [ line.strip() for line in f ])
+
+class TestHarnessOptions(unittest.TestCase):
+
+    def test_workload_override(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        self.assertEqual(['-size', 'mzc18_1'], bm_script.get_harness_options(config))
+        self.assertEqual(['-size', 'small'], bm_script.get_harness_options(config, 'small'))
+
+    def _command(self, config, workload = None, runtime_options = None):
+        commands = []
+        def run_in_new_session(command, **kwargs):
+            commands.append(command)
+            raise InterruptedError()
+        with patch.object(bm_script.tools, 'sdk_run', lambda sdk, command: command), \
+             patch.object(bm_script.tools, 'ensure_no_stray_jvms', lambda: None), \
+             patch.object(bm_script.tools, 'run_in_new_session', run_in_new_session), \
+             patch.object(bm_script, 'get_runtime_options', lambda configuration: runtime_options or []):
+            with self.assertRaises(InterruptedError):
+                bm_script.run_benchmark(config, Path('deployment'), False, None, iterations = 1, workload = workload)
+        self.assertEqual(1, len(commands))
+        return commands[0]
+
+    def test_workload_of_command(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        command = self._command(config, 'mzc18_2')
+        self.assertIn('-size mzc18_2', command)
+        self.assertNotIn('mzc18_1', command)
+
+    def test_options_are_quoted(self):
+        config = Configuration()
+        config.bm('jacop')
+        config.bm_workload('mzc18_1')
+        command = self._command(config, runtime_options = [ '-XX:CompileCommand=dontinline,*Foo.bar', '-Xlog:gc*', '-XX:Foo=$(touch x);' ])
+        self.assertIn("java '-XX:CompileCommand=dontinline,*Foo.bar' '-Xlog:gc*' '-XX:Foo=$(touch x);' -jar deployment/jacop-1.0.jar jacop -n 1 -size mzc18_1", command)
+
+    def test_threads_and_cpus(self):
+        config = Configuration()
+        config.bm('lusearch')
+        config.bm_workload('default')
+        self.assertEqual([], bm_script.get_cpu_affinity(config))
+        config.threads('4')
+        config.cpus('2')
+        self.assertEqual(['-size', 'default', '-t', '4'], bm_script.get_harness_options(config))
+        with patch.object(bm_script.tools, 'get_available_cpus', lambda: [2, 3, 6, 7]):
+            self.assertEqual(['taskset', '-c', '2,3'], bm_script.get_cpu_affinity(config))
+        with patch.object(bm_script.tools, 'get_available_cpus', lambda: [2]):
+            self.assertFalse(bm_script.has_available_cpus(config))
+            with self.assertRaises(ValueError):
+                bm_script.get_cpu_affinity(config)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import screening
+
+class TestScreening(unittest.TestCase):
+
+    def test_touched_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp)
+            with open(data / 'a-1.0-main-src.jar.patch', 'w') as f:
+                f.write("--- /tmp/tmpx/old/p/A.java\t2025-01-01" + os.linesep)
+                f.write("+++ /tmp/tmpx/new/p/A.java\t2025-01-01" + os.linesep)
+            self.assertEqual({ ('a-1.0-main-src.jar.patch', 'p/A.java') }, screening.get_touched_files(data))
+
+    def test_groups_are_disjoint(self):
+        candidates = [
+            (1, { ('a', 'A.java') }),
+            (2, { ('a', 'A.java') }),                       # Conflicts with 1.
+            (3, { ('a', 'B.java') }),
+            (4, { ('b', 'A.java') }),                       # Different archive.
+            (5, { ('a', 'C.java') })
+        ]
+        self.assertEqual([[1, 3, 4], [2, 5]], screening.form_groups(candidates, 3))
+        self.assertEqual([[1, 3, 4, 5], [2]], screening.form_groups(candidates, 8))
+        with self.assertRaises(ValueError):
+            screening.form_groups(candidates, 0)
+
+    def test_split(self):
+        self.assertEqual([[1, 2], [3]], screening.split([1, 2, 3]))
+        self.assertEqual([[1], [2]], screening.split([1, 2]))
+
+    def test_status(self):
+        self.assertEqual(screening.NULL, screening.get_status(1010, 1000, 10, 2))
+        self.assertEqual(screening.EFFECT, screening.get_status(1030, 1000, 10, 2))
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp     = Path(tmp)
+            members = [ Path('b/o/r1/e'), Path('b/o/r2/e') ]
+            gid     = screening.get_group_id(members)
+            self.assertEqual(gid, screening.get_group_id(list(reversed(members))))
+            store   = tmp / 'screening' / gid
+            self.assertIsNone(screening.load_group_status(store))
+            screening.store_group(store, members, screening.NULL, 1000)
+            self.assertEqual(screening.NULL, screening.load_group_status(store))
+            self.assertFalse(screening.is_screened(tmp / 'e', 'p'))
+            screening.mark_null(tmp / 'e', 'p', gid)
+            self.assertTrue(screening.is_screened(tmp / 'e', 'p'))
+
+if __name__ == '__main__':
+    unittest.main()
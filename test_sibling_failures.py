@@ -0,0 +1,76 @@
+#!/bin/env python3
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import sibling_failures
+
+_compile_failure = "('[javac] /root/temp/tmp{}/src/main/java/org/jacop/Foo.java:12: error: cannot find symbol\\n[javac]   _x_();\\n')"
+_runtime_failure = "('Benchmark failed', 'Exception in thread \"main\" java.lang.NullPointerException: tmp{}\\n\\tat org.jacop.Foo.bar(Foo.java:42)\\n')"
+
+def _add_benchmark_failure(opportunity, refactoring, configuration_id, text, hints = ['GENERIC']):
+    store = opportunity / refactoring / 'tmpexec' / 'stats' / configuration_id
+    store.mkdir(parents = True)
+    with open(store / 'FAILURE', 'w') as f:
+        f.write(text)
+    for hint in hints:
+        with open(store / hint, 'w'):
+            pass
+    return store
+
+class TestSiblingFailures(unittest.TestCase):
+
+    def test_compile_signature_ignores_build_location(self):
+        self.assertEqual(
+            sibling_failures.get_compile_signature(_compile_failure.format('a').replace('\\n', '\n')),
+            sibling_failures.get_compile_signature(_compile_failure.format('b').replace('\\n', '\n'))
+        )
+
+    def test_benchmark_failure_requires_threshold(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opportunity = Path(tmp)
+            _add_benchmark_failure(opportunity, 'r1', 'c1', _runtime_failure.format('1'))
+            self.assertIsNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c1'))
+            _add_benchmark_failure(opportunity, 'r2', 'c1', _runtime_failure.format('2'))
+            self.assertIsNotNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c1'))
+            # Other configurations are unaffected.
+            self.assertIsNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c2'))
+
+    def test_different_failures_are_parameter_dependent(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opportunity = Path(tmp)
+            _add_benchmark_failure(opportunity, 'r1', 'c1', _runtime_failure.format('1'))
+            _add_benchmark_failure(opportunity, 'r2', 'c1', _compile_failure.format('2'), ['GENERIC', 'COMPILE'])
+            self.assertIsNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c1'))
+
+    def test_skipped_cases_are_not_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opportunity = Path(tmp)
+            _add_benchmark_failure(opportunity, 'r1', 'c1', _runtime_failure.format('1'))
+            sibling_failures.mark_skipped(opportunity / 'r2' / 'tmpexec' / 'stats' / 'c1', 'exception:x')
+            self.assertIsNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c1'))
+
+    def test_timeouts_are_parameter_dependent(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opportunity = Path(tmp)
+            _add_benchmark_failure(opportunity, 'r1', 'c1', "Command timed out", ['GENERIC', 'TIMEOUT'])
+            _add_benchmark_failure(opportunity, 'r2', 'c1', "Command timed out", ['GENERIC', 'TIMEOUT'])
+            self.assertIsNone(sibling_failures.get_sibling_benchmark_failure(opportunity, 'r3', 'c1'))
+
+    def test_refactoring_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            opportunity = Path(tmp)
+            for refactoring in ['r1', 'r2']:
+                location = opportunity / refactoring
+                location.mkdir()
+                with open(location / 'FAILURE', 'w'):
+                    pass
+                with open(location / 'refactoring-output.txt', 'w') as f:
+                    f.write("Selection does not contain an expression\nERROR: Precondition check failed\n")
+            self.assertIsNotNone(sibling_failures.get_sibling_refactoring_failure(opportunity, 'r3'))
+            self.assertIsNone(sibling_failures.get_sibling_refactoring_failure(opportunity, 'r3', threshold = 3))
+
+if __name__ == '__main__':
+    unittest.main()
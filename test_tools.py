@@ -1,9 +1,13 @@
 #!/bin/env python3
 
 import subprocess
+import tempfile
+import time
 import unittest
 import tools
 
+from pathlib import Path
+
 class TestSDK(unittest.TestCase):
     def test_installed_sdks(self):
         for sdk in tools.get_installed_sdks():
@@ -33,6 +37,66 @@ class TestSDK(unittest.TestCase):
         with self.assertRaises(ValueError):
             tools.sdk_home("something else")
 
+class TestCopy(unittest.TestCase):
+    def test_copy_is_independent_of_source(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / 'src.zip'
+            dst = Path(tmp) / 'dst.zip'
+            src.write_text('original')
+            tools.reflink_or_copy(src, dst)
+            with open(dst, 'r+') as f:
+                f.write('modified')
+            self.assertEqual('original', src.read_text())
+            self.assertEqual('modified', dst.read_text())
+
+class TestProcessGroup(unittest.TestCase):
+    def test_timeout_kills_process_group(self):
+        # The background 'sleep' plays the part of a JVM started by a bash wrapper.
+        with self.assertRaises(subprocess.TimeoutExpired):
+            tools.run_in_new_session('sleep 60 & wait', timeout = 1, grace = 1)
+        time.sleep(0.2)
+        for pgid in tools._spawned_process_groups:
+            self.assertFalse(tools._is_process_group_alive(pgid))
+
+    def test_output_is_captured(self):
+        result = tools.run_in_new_session('echo hello')
+        self.assertEqual(0, result.returncode)
+        self.assertEqual('hello', result.stdout.decode('utf-8').strip())
+
+    def test_stray_process_is_killed(self):
+        tools.run_in_new_session('(sleep 60 > /dev/null 2>&1 &)')
+        pgids = set(tools._spawned_process_groups)
+        self.assertTrue(any(tools._is_process_group_alive(pgid) for pgid in pgids))
+        tools.ensure_no_stray_jvms(grace = 1)
+        for pgid in pgids:
+            self.assertFalse(tools._is_process_group_alive(pgid))
+
+    def test_on_line_exception_kills_process_group(self):
+        lines = []
+        def on_line(line):
+            lines.append(line)
+            if line == 'FAILED':
+                raise ValueError(line)
+        with self.assertRaises(ValueError):
+            tools.run_in_new_session('echo FAILED; sleep 60', timeout = 30, grace = 1, on_line = on_line)
+        self.assertEqual(['FAILED'], lines)
+
+    def test_resource_usage_includes_children(self):
+        # The busy loop runs in a child of the session leader, like the JVM.
+        lines  = []
+        result = tools.run_in_new_session(
+            'python3 -c "sum(range(10**7))"; echo done; exit 3',
+            timeout = 30,
+            on_line = lines.append
+        )
+        self.assertEqual(3, result.returncode)
+        self.assertEqual(['done'], lines)
+        self.assertGreater(result.rusage.ru_utime, 0)
+        self.assertGreater(result.rusage.ru_maxrss, 0)
+
+    def test_no_resource_usage_without_on_line(self):
+        self.assertIsNone(tools.run_in_new_session('true').rusage)
+
 if __name__ == '__main__':
     unittest.main()
 
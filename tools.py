@@ -2,9 +2,13 @@
 
 import os
 from pathlib import Path
+import queue
 import re
 import shutil
+import signal
 import subprocess
+import threading
+import time
 import zipfile
 from zipfile import ZipFile
 
@@ -30,6 +34,34 @@ def _zip(src, dst):
 def zip(src, dst):
     _zip(src, dst) # Call internal.
 
+# Copy archive 'src' to 'dst', one member at a time, replacing members
+# with the files specified in 'replacements' ({ <member name> : <path> }).
+# Replacements without a corresponding member are added to the archive.
+def zip_replace(src, dst, replacements):
+    print('[zip_replace]', src, 'into', dst, 'replacing', len(replacements), 'member(s)')
+    remaining = dict(replacements)
+    with ZipFile(src, 'r') as zin, ZipFile(dst, 'w') as zout:
+        for info in zin.infolist():
+            replacement = remaining.pop(info.filename, None)
+            if replacement is None:
+                with zin.open(info, 'r') as fin, zout.open(info, 'w') as fout:
+                    shutil.copyfileobj(fin, fout)
+            else:
+                with open(replacement, 'rb') as fin, zout.open(info, 'w') as fout:
+                    shutil.copyfileobj(fin, fout)
+        for name, replacement in sorted(remaining.items()):
+            zout.write(replacement, name, compress_type = zipfile.ZIP_DEFLATED)
+    return dst
+
+# Copy 'src' to 'dst' using a copy-on-write reflink where the file system
+# supports it, and a regular copy otherwise. Unlike a hard link, 'dst' can
+# be modified in place (e.g. by the build) without modifying 'src'.
+def reflink_or_copy(src, dst):
+    result = subprocess.run(['cp', '--reflink=auto', str(src), str(dst)])
+    if result.returncode != 0:
+        shutil.copy2(src, dst)
+    return dst
+
 def jar(src, dst):
     print("[jar]", str(src), str(dst))
     _zip(src, dst) # Call internal to avoid collision with builtin 'zip'.
@@ -125,3 +157,177 @@ def sdk_current():
     sdk = result.stdout.decode('utf-8').strip().split(' ')[3].strip()
     return sdk
 
+
+# Process groups started by 'run_in_new_session()'. Used to find
+# processes that survived their group, e.g., a JVM launched by an
+# SDKMAN! bash wrapper that was killed on timeout.
+_spawned_process_groups = set()
+
+def _get_process_group(pid):
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name is enclosed in parentheses and may contain spaces.
+    fields = stat[stat.rfind(')') + 2:].split(' ')
+    return int(fields[2])
+
+def _get_process_command_line(pid, proc = Path('/proc')):
+    try:
+        with open(Path(proc) / str(pid) / 'cmdline', 'rb') as f:
+            return [ arg.decode('utf-8', errors = 'replace') for arg in f.read().split(b'\0') if arg != b'' ]
+    except OSError:
+        return []
+
+# CPUs that this process (and thus the benchmark) may run on, which can be
+# fewer than 'os.cpu_count()' in containers and under 'taskset'.
+def get_available_cpus():
+    return sorted(os.sched_getaffinity(0))
+
+def _is_process_alive(pid):
+    return Path(f"/proc/{pid}").exists()
+
+def get_running_jvms(proc = Path('/proc')):
+    jvms = []
+    for entry in Path(proc).iterdir():
+        if not entry.name.isdigit():
+            continue
+        argv = _get_process_command_line(entry.name, proc)
+        if len(argv) > 0 and Path(argv[0]).name == 'java':
+            jvms.append((int(entry.name), ' '.join(argv)))
+    return jvms
+
+def kill_process_group(pgid, grace = 10):
+    # Terminate gracefully first so that, e.g., JFR can dump on exit,
+    # then kill whatever remains after the grace period.
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        if not _is_process_group_alive(pgid):
+            return
+        time.sleep(0.1)
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _is_process_group_alive(pgid):
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    # Zombies still count as group members until reaped.
+    for entry in Path('/proc').iterdir():
+        if entry.name.isdigit() and _get_process_group(entry.name) == pgid:
+            try:
+                with open(entry / 'stat', 'r') as f:
+                    stat = f.read()
+                if stat[stat.rfind(')') + 2] != 'Z':
+                    return True
+            except OSError:
+                pass
+    return False
+
+# Kill stray processes left in process groups that we started and
+# report other JVMs running on the machine since they interfere with
+# measurements. Raises ValueError if our own processes cannot be killed.
+def ensure_no_stray_jvms(grace = 10):
+    global _spawned_process_groups
+
+    for pgid in sorted(_spawned_process_groups):
+        if _is_process_group_alive(pgid):
+            print("[stray] Killing stray process group", pgid)
+            kill_process_group(pgid, grace)
+            if _is_process_group_alive(pgid):
+                raise ValueError("Could not kill stray process group", pgid)
+    _spawned_process_groups.clear()
+
+    jvms = get_running_jvms()
+    for pid, cmd in jvms:
+        print("[stray] WARNING: Found running JVM", pid, cmd)
+    return jvms
+
+def _enqueue_lines(stream, lines):
+    for line in iter(stream.readline, b''):
+        lines.put(line)
+    lines.put(None) # EOF
+
+def _communicate_lines(process, command, timeout, on_line):
+    # Read output line by line as it arrives and pass each line to
+    # 'on_line()'. The callback may raise to abort the command early.
+    deadline = None if timeout is None else time.monotonic() + timeout
+    lines    = queue.Queue()
+    output   = []
+    reader   = threading.Thread(target = _enqueue_lines, args = (process.stdout, lines), daemon = True)
+    reader.start()
+    while True:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise subprocess.TimeoutExpired(command, timeout, output = b''.join(output))
+        try:
+            line = lines.get(timeout = remaining)
+        except queue.Empty:
+            continue
+        if line is None:
+            break
+        output.append(line)
+        on_line(line.decode('utf-8', errors = 'replace').rstrip(os.linesep))
+    remaining = None if deadline is None else max(0, deadline - time.monotonic())
+    rusage    = _wait4(process, command, timeout, remaining)
+    return b''.join(output), rusage
+
+# Reap the session leader with 'os.wait4()' instead of 'process.wait()' to
+# get the resource usage of the leader and of the children it has waited
+# for (e.g. the JVM started by the SDKMAN! bash wrapper).
+def _wait4(process, command, timeout, remaining):
+    deadline = None if remaining is None else time.monotonic() + remaining
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid != 0:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return rusage
+        if deadline is not None and time.monotonic() >= deadline:
+            raise subprocess.TimeoutExpired(command, timeout)
+        time.sleep(0.01)
+
+# Run a shell command in its own session (and process group) so that
+# all processes started by the command, including JVMs started from
+# SDKMAN! bash wrappers, are killed together on timeout or interruption.
+# If 'on_line' is specified, output is passed to it line by line as it
+# arrives, and any exception raised by 'on_line' kills the process group
+# and is re-raised. The resource usage of the command (see 'os.wait4()')
+# is then available as 'rusage' of the result, otherwise it is None.
+# Raises subprocess.TimeoutExpired like 'subprocess.run()'.
+def run_in_new_session(command, timeout = None, cwd = None, stdout = subprocess.PIPE, grace = 10, on_line = None):
+    global _spawned_process_groups
+
+    process = subprocess.Popen(
+        command,
+        shell             = True,
+        executable        = '/bin/bash',
+        stdout            = stdout,
+        stderr            = subprocess.STDOUT,
+        cwd               = cwd,
+        start_new_session = True
+    )
+    _spawned_process_groups.add(process.pid) # The session leader's pid is the pgid.
+    try:
+        rusage = None
+        if on_line is None:
+            output, _ = process.communicate(timeout = timeout)
+        else:
+            output, rusage = _communicate_lines(process, command, timeout, on_line)
+    except BaseException:
+        # Timeout, KeyboardInterrupt, early termination, etc.
+        kill_process_group(process.pid, grace)
+        process.wait()
+        raise
+    if not _is_process_group_alive(process.pid):
+        _spawned_process_groups.discard(process.pid)
+    result        = subprocess.CompletedProcess(command, process.returncode, output)
+    result.rusage = rusage
+    return result